@@ -1,6 +1,48 @@
 """
 Expose necessary Classes for the Game to be played
+
+    The classes are imported on first access (PEP 562 module __getattr__): `import Connect4`
+    loads nothing else, and `Connect4.Coordinator_Local` loads only the game and the CLI players.
+    Optional backends (SenseHat, Flask / Swagger UI, requests, aiohttp, numpy) are only
+    loaded by the modules which use them, when they are used.
 """
+import importlib
+import os
+import sys
+
+# the modules of the package import each other by their plain names (from game import Connect4)
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+if _PACKAGE_DIR not in sys.path:
+    sys.path.append(_PACKAGE_DIR)
+
+# exported name -> module it is defined in
+_EXPORTS = {
+    "Connect4": "game",
+    "Bitboard": "bitboard",
+    "Coordinator_Local": "coordinator_local",
+    "Coordinator_Remote": "coordinator_remote",
+    "Coordinator_Remote_Async": "coordinator_remote_async",
+    "Connect4Server": "server",
+    "Player_Local": "player_local",
+    "Player_Remote": "player_remote",
+    "Player_Remote_Async": "player_remote_async",
+    "Player_Raspi_Local": "player_raspi_local",
+    "Player_Raspi_Remote": "player_raspi_remote",
+    "Player_Bot": "player_bot",
+    "Player_Random": "player_bot",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name:str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value                 # later accesses do not go through __getattr__ again
+    return value
+
 
-from Connect4.coordinator_local import Coordinator_Local
-# from Connect4.coordinator_remote import Coordinator_Remote
\ No newline at end of file
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
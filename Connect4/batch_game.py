@@ -0,0 +1,272 @@
+import numpy as np
+
+
+class BatchConnect4:
+    """
+    Vectorized Engine for K Connect 4 Games at once (for bot training and evaluation)
+
+        All games are stored as stacked bitboards (same layout as Bitboard):
+            - boards[0] / boards[1]: uint64 array of K bitboards for 'X' / 'O'
+            - bit index of a cell = column * (height + 1) + row   (row 0 is the BOTTOM row)
+            - if the empty sentinel row does not fit (e.g. 9x7: 72 bits), the columns are packed
+              without it (column * height + row) and every win check is masked with the cells
+              a line may start at, so lines cannot wrap into the next column
+            - boards with more than 64 cells (e.g. 10x8) fall back to arrays of
+              Python integers (dtype object): same results, but much slower
+
+        One call applies a whole vector of moves, and legal-move masks and win flags
+        are computed for all K games in one numpy pass (no Python loop over games).
+
+    Attributes:
+        size (int):             Number of games K
+        width (int):            Number of columns
+        height (int):           Number of rows
+        win_length (int):       Number of consecutive coins needed for a win
+        boards (np.ndarray):    (2, K) uint64 bitboards of both players (dtype object for large boards)
+        heights (np.ndarray):   (K, width) bit index of the next free cell of each column
+        n_moves (np.ndarray):   (K,) number of coins of each game (player to move = n_moves % 2)
+        winner (np.ndarray):    (K,) index of the winner (0 / 1), -1 if there is no winner (yet)
+    """
+
+    def __init__(self, size:int, width:int = 8, height:int = 7, win_length:int = 4) -> None:
+        """
+        Create K empty games
+
+        Parameters:
+            size (int):         Number of games K
+            width (int):        Number of columns
+            height (int):       Number of rows
+            win_length (int):   Number of consecutive coins needed for a win
+        """
+        self.size = size
+        self.width = width
+        self.height = height
+        self.win_length = win_length
+
+        stride = height + 1 if width * (height + 1) <= 64 or width * height > 64 else height
+        self._stride = stride
+        self._column_base = np.arange(width, dtype=np.int64) * stride
+        self._column_top = self._column_base + height
+        if width * stride <= 64:
+            self._word = np.uint64
+            self._dtype = np.uint64
+        else:
+            self._word = int                        # too large for a machine word: Python integers
+            self._dtype = object
+
+        directions = ((0, 1), (1, 0), (1, 1), (1, -1))      # vertical, horizontal, diagonal /, diagonal \
+        self._shifts = [self._word(d_col * stride + d_row) for d_col, d_row in directions]
+        self._starts = [None] * len(directions)             # no masks needed with the sentinel row
+        if stride == height:
+            self._starts = [self._word(self._start_mask(d_col, d_row)) for d_col, d_row in directions]
+
+        self.boards = np.zeros((2, size), dtype=self._dtype)
+        self.heights = np.tile(self._column_base, (size, 1))
+        self.n_moves = np.zeros(size, dtype=np.int64)
+        self.winner = np.full(size, -1, dtype=np.int8)
+
+    @classmethod
+    def from_bitboards(cls, bitboards:list, repeat:int = 1) -> "BatchConnect4":
+        """
+        Batch of the positions of Bitboards (all of the same size, nobody may have won yet)
+
+        Parameters:
+            bitboards (list):   Bitboard positions
+            repeat (int):       Copies of every position (stored next to each other)
+
+        Returns:
+            BatchConnect4:  len(bitboards) * repeat games
+        """
+        first = bitboards[0]
+        batch = cls(len(bitboards) * repeat, first.width, first.height, first.win_length)
+        column_mask = (1 << first.height) - 1
+        for index, bitboard in enumerate(bitboards):
+            games = slice(index * repeat, (index + 1) * repeat)
+            for player in (0, 1):
+                bits = bitboard.boards[player]
+                if batch._stride != first.height + 1:       # packed layout: drop the sentinel rows
+                    bits = sum(
+                        ((bits >> (column * (first.height + 1))) & column_mask) << (column * batch._stride)
+                        for column in range(first.width)
+                    )
+                batch.boards[player, games] = batch._word(bits)
+            counts = [height - column * (first.height + 1) for column, height in enumerate(bitboard.heights)]
+            batch.heights[games] = batch._column_base + np.array(counts, dtype=np.int64)
+            batch.n_moves[games] = len(bitboard.moves)
+        return batch
+
+    def repeat(self, times:int) -> "BatchConnect4":
+        """
+        Copy of the batch with every game repeated `times` times (copies next to each other)
+
+        Parameters:
+            times (int):    Copies of every game
+
+        Returns:
+            BatchConnect4:  size * times games
+        """
+        return self.take(np.repeat(np.arange(self.size), times))
+
+    def take(self, games:np.ndarray) -> "BatchConnect4":
+        """
+        Copy of some games of the batch
+
+        Parameters:
+            games (np.ndarray):     Indices of the games (in the order of the new batch, may repeat)
+
+        Returns:
+            BatchConnect4:  len(games) games
+        """
+        batch = BatchConnect4(0, self.width, self.height, self.win_length)
+        batch.size = len(games)
+        batch.boards = self.boards[:, games]
+        batch.heights = self.heights[games]
+        batch.n_moves = self.n_moves[games]
+        batch.winner = self.winner[games]
+        return batch
+
+    @property
+    def finished(self) -> np.ndarray:
+        """ (K,) True for games with a winner or a full board """
+        return (self.winner >= 0) | (self.n_moves == self.width * self.height)
+
+    def legal_moves(self) -> np.ndarray:
+        """
+        Legal-move mask of all games
+
+        Returns:
+            np.ndarray:     (K, width) bool, True if a coin can be dropped into the column
+        """
+        return (self.heights < self._column_top) & ~self.finished[:, None]
+
+    def play(self, columns:np.ndarray) -> np.ndarray:
+        """
+        Drop one coin in every game (for the player to move of that game)
+            Illegal moves (full column, finished game, column < 0) are ignored.
+
+        Parameters:
+            columns (np.ndarray):   (K,) column per game, -1 to skip a game
+
+        Returns:
+            np.ndarray:     (K,) bool, True where the move was made
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        games = np.arange(self.size)
+        valid = (columns >= 0) & (columns < self.width)
+        safe_columns = np.where(valid, columns, 0)
+        accepted = valid & ~self.finished & (self.heights[games, safe_columns] < self._column_top[safe_columns])
+
+        idx = games[accepted]
+        cols = safe_columns[accepted]
+        player = (self.n_moves[idx] & 1).astype(np.int64)
+        bits = np.left_shift(self._word(1), self.heights[idx, cols].astype(self._dtype))
+        self.boards[player, idx] |= bits
+        self.heights[idx, cols] += 1
+        self.n_moves[idx] += 1
+
+        won = self.has_won(self.boards[player, idx])
+        self.winner[idx[won]] = player[won]
+        return accepted
+
+    def has_won(self, boards:np.ndarray) -> np.ndarray:
+        """
+        `win_length` in a row check for a vector of bitboards (same shifts as Bitboard.has_won)
+
+        Parameters:
+            boards (np.ndarray):    Bitboards (uint64, or Python integers for large boards)
+
+        Returns:
+            np.ndarray:     bool, True where the bitboard contains `win_length` in a row
+        """
+        won = np.zeros(boards.shape, dtype=bool)
+        length = self.win_length
+        for shift, starts in zip(self._shifts, self._starts):
+            if length == 4:
+                pairs = boards & (boards >> shift)
+                runs = pairs & (pairs >> (shift + shift))
+            else:
+                runs, run = boards, 1
+                while run * 2 <= length:
+                    runs = runs & (runs >> (shift * self._word(run)))
+                    run *= 2
+                if run < length:
+                    runs = runs & (runs >> (shift * self._word(length - run)))
+            if starts is not None:
+                runs = runs & starts
+            won |= runs != 0
+        return won
+
+    def random_moves(self, rng:np.random.Generator) -> np.ndarray:
+        """
+        Pick a random legal column for every game (-1 for finished games)
+
+        Parameters:
+            rng (np.random.Generator):  Random generator
+
+        Returns:
+            np.ndarray:     (K,) columns
+        """
+        legal = self.legal_moves()
+        columns = rng.integers(0, self.width, self.size)
+        # redraw only where the drawn column is full (uniform among the legal columns of that game)
+        redraw = ~legal[np.arange(self.size), columns]
+        if redraw.any():
+            scores = np.where(legal[redraw], rng.random((int(redraw.sum()), self.width)), -1.0)
+            columns[redraw] = np.where(legal[redraw].any(axis=1), scores.argmax(axis=1), -1)
+        return columns
+
+    def play_out(self, rng:np.random.Generator) -> None:
+        """
+        Play random moves in all games until every game is finished (random playouts)
+            Only the running games are carried along: games drop out of the arrays as soon as
+            they are finished, so the long games do not make every step pay for all K games.
+
+        Parameters:
+            rng (np.random.Generator):  Random generator
+        """
+        running = np.flatnonzero(~self.finished)
+        games = self.take(running)
+        while games.size:
+            games.play(games.random_moves(rng))
+            done = games.finished
+            if done.any():
+                finished = running[done]
+                self.boards[:, finished] = games.boards[:, done]
+                self.heights[finished] = games.heights[done]
+                self.n_moves[finished] = games.n_moves[done]
+                self.winner[finished] = games.winner[done]
+                running = running[~done]
+                games = games.take(np.flatnonzero(~done))
+
+    def get_board(self, game:int, icons:tuple = ("X", "O")) -> np.ndarray:
+        """
+        Board of one game in the format of Connect4.get_board
+
+        Parameters:
+            game (int):     Index of the game
+
+        Returns:
+            np.ndarray:     (height x width) board, row 0 is the TOP row, '' for empty
+        """
+        board = np.full((self.height, self.width), "", dtype="<U1")
+        stride = self._stride
+        for player, icon in enumerate(icons):
+            bits = int(self.boards[player, game])
+            for index in range(self.width * stride):
+                if bits >> index & 1:
+                    column, row = divmod(index, stride)
+                    board[self.height - 1 - row, column] = icon
+        return board
+
+    """
+    Internal Methods
+    """
+    def _start_mask(self, d_col:int, d_row:int) -> int:
+        """ Bits of the cells a line of `win_length` in direction (d_col, d_row) can start at (packed layout) """
+        end = self.win_length - 1
+        mask = 0
+        for column in range(self.width):
+            for row in range(self.height):
+                if 0 <= column + end * d_col < self.width and 0 <= row + end * d_row < self.height:
+                    mask |= 1 << (column * self._stride + row)
+        return mask
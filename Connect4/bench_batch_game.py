@@ -0,0 +1,73 @@
+"""
+Benchmark: BatchConnect4 vs. a Python loop over Connect4 instances
+
+    Plays K random games to the end, one vectorized step per ply, and compares
+    moves/sec with making the same kind of random moves in K Connect4 instances.
+
+Run with:  python bench_batch_game.py --games 10000
+"""
+import argparse
+import random
+import time
+import uuid
+
+import numpy as np
+
+from batch_game import BatchConnect4
+from game import Connect4
+
+
+def bench_batch(k:int) -> tuple[float, float, int]:
+    """ Returns (moves/sec incl. choosing random moves, moves/sec of play() alone, number of moves) """
+    rng = np.random.default_rng(0)
+    batch = BatchConnect4(k)
+    moves, in_play = 0, 0.0
+    start = time.perf_counter()
+    while not batch.finished.all():
+        columns = batch.random_moves(rng)
+        play_start = time.perf_counter()
+        moves += int(batch.play(columns).sum())
+        in_play += time.perf_counter() - play_start
+    return moves / (time.perf_counter() - start), moves / in_play, moves
+
+
+def bench_loop(k:int) -> tuple[float, int]:
+    """ Returns (moves/sec, number of moves) """
+    rng = random.Random(0)
+    games = []
+    for _ in range(k):
+        game = Connect4()
+        players = [uuid.uuid4(), uuid.uuid4()]
+        for player in players:
+            game.register_player(player)
+        games.append((game, players, list(range(game.board_width))))
+
+    moves = 0
+    start = time.perf_counter()
+    running = games
+    while running:
+        still_running = []
+        for game, players, columns in running:
+            while True:
+                column = rng.choice(columns)
+                if game.check_move(column, players[game.turn_number % 2]):
+                    break
+                columns.remove(column)          # column is full
+            moves += 1
+            if game.winner is None and game.turn_number < 56:
+                still_running.append((game, players, columns))
+        running = still_running
+    return moves / (time.perf_counter() - start), moves
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=10_000)
+    args = parser.parse_args()
+
+    batch_rate, play_rate, batch_moves = bench_batch(args.games)
+    loop_rate, loop_moves = bench_loop(args.games)
+    print(f"K = {args.games} random games played to the end")
+    print(f"loop over Connect4:       {loop_rate:>14,.0f} moves/sec ({loop_moves} moves)")
+    print(f"BatchConnect4:            {batch_rate:>14,.0f} moves/sec ({batch_moves} moves)   {batch_rate / loop_rate:.1f}x")
+    print(f"BatchConnect4.play only:  {play_rate:>14,.0f} moves/sec   {play_rate / loop_rate:.1f}x")
@@ -0,0 +1,97 @@
+"""
+Benchmark: Bitboard engine vs. scanning the numpy string board
+
+    Measures
+        - moves/sec:        drop a coin (and take it back again)
+        - win-checks/sec:   detect 4 in a row on a mid-game position
+
+Run with:  python bench_bitboard.py
+"""
+import random
+import time
+
+import numpy as np
+
+from bitboard import Bitboard
+
+
+WIDTH, HEIGHT = 8, 7
+
+
+def array_play(board:np.ndarray, column:int, icon:str) -> int:
+    """ Drop a coin into the numpy board, returns the row (or -1 if full) """
+    for row in range(HEIGHT - 1, -1, -1):
+        if board[row, column] == "":
+            board[row, column] = icon
+            return row
+    return -1
+
+
+def array_has_won(board:np.ndarray, icon:str) -> bool:
+    """ Full scan of the numpy board for 4 consecutive icons """
+    for row in range(HEIGHT):
+        for col in range(WIDTH):
+            if board[row, col] != icon:
+                continue
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + 3 * d_row, col + 3 * d_col
+                if not (0 <= end_row < HEIGHT and 0 <= end_col < WIDTH):
+                    continue
+                if all(board[row + i * d_row, col + i * d_col] == icon for i in range(1, 4)):
+                    return True
+    return False
+
+
+def random_columns(n:int, seed:int = 0) -> list:
+    rng = random.Random(seed)
+    return [rng.randrange(WIDTH) for _ in range(n)]
+
+
+def bench_moves(columns:list) -> tuple[float, float]:
+    """ Returns (bitboard moves/sec, array moves/sec) """
+    bb = Bitboard(WIDTH, HEIGHT)
+    start = time.perf_counter()
+    for column in columns:
+        if bb.can_play(column):
+            bb.play(column)
+            bb.undo()
+    bb_rate = len(columns) / (time.perf_counter() - start)
+
+    board = np.full((HEIGHT, WIDTH), "", dtype="<U1")
+    start = time.perf_counter()
+    for column in columns:
+        row = array_play(board, column, "X")
+        if row >= 0:
+            board[row, column] = ""
+    array_rate = len(columns) / (time.perf_counter() - start)
+    return bb_rate, array_rate
+
+
+def bench_win_checks(n:int) -> tuple[float, float]:
+    """ Returns (bitboard checks/sec, array checks/sec) on a mid-game position without a winner """
+    bb = Bitboard(WIDTH, HEIGHT)
+    for column in (3, 4, 3, 4, 2, 2, 5, 1, 0, 6, 7, 6, 1, 0, 7, 5):
+        bb.play(column)
+    assert not bb.has_won(0) and not bb.has_won(1)
+    board = bb.to_array()
+
+    start = time.perf_counter()
+    for _ in range(n):
+        bb.has_won(0)
+    bb_rate = n / (time.perf_counter() - start)
+
+    m = max(1, n // 100)
+    start = time.perf_counter()
+    for _ in range(m):
+        array_has_won(board, "X")
+    array_rate = m / (time.perf_counter() - start)
+    return bb_rate, array_rate
+
+
+if __name__ == "__main__":
+    bb_moves, array_moves = bench_moves(random_columns(200_000))
+    bb_wins, array_wins = bench_win_checks(200_000)
+
+    print(f"{'':<16}{'bitboard':>14}{'numpy scan':>14}{'speedup':>10}")
+    print(f"{'moves/sec':<16}{bb_moves:>14,.0f}{array_moves:>14,.0f}{bb_moves / array_moves:>9.1f}x")
+    print(f"{'win-checks/sec':<16}{bb_wins:>14,.0f}{array_wins:>14,.0f}{bb_wins / array_wins:>9.1f}x")
@@ -0,0 +1,53 @@
+"""
+Benchmark: memory of live games (what a server holding many games pays per game)
+
+    Creates N games, registers two new players in every game and plays the same
+    number of random moves in each (a game in the middle of play). The memory is
+    measured with tracemalloc: everything the games allocate, including the player IDs.
+
+Run with:  python bench_game_memory.py --games 100000 --moves 12
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+import uuid
+
+from game import Connect4
+
+
+def build_games(n_games:int, n_moves:int, seed:int = 0) -> list:
+    """ N games with two registered players and `n_moves` random moves each """
+    rng = random.Random(seed)
+    games = []
+    for _ in range(n_games):
+        game = Connect4()
+        players = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(2)]
+        for player in players:
+            game.register_player(player)
+        while game.turn_number < n_moves and game.winner is None:
+            game.check_move(rng.randrange(game.board_width), players[game.turn_number % 2])
+        games.append(game)
+    return games
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--moves", type=int, default=12, help="moves played in every game")
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    games = build_games(args.games, args.moves)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    games[0].get_status()                       # the views still work
+    print(f"{args.games:,} live games ({args.moves} moves each) built in {elapsed:.1f}s")
+    print(f"memory: {used / 2**20:,.1f} MiB   ({used / args.games:,.0f} bytes per game incl. players)")
@@ -0,0 +1,63 @@
+"""
+Benchmark: cold start (import + setup) of the entry points of the package
+
+    Every scenario runs in a fresh interpreter (like a freshly spawned worker process),
+    repeated --runs times. The interpreter measures its own time for the scenario's code
+    (imports + setup, without the start of the interpreter itself); the fastest run is
+    reported, together with the optional backends the scenario loaded.
+
+Run with:  python bench_import_time.py --runs 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKENDS = ("numpy", "flask", "flask_swagger_ui", "requests", "aiohttp", "sense_hat", "multiprocessing", "sqlite3")
+
+SCENARIOS = {
+    "package": (os.path.dirname(HERE), "import Connect4"),
+    "cli game": (HERE, "from coordinator_local import Coordinator_Local; Coordinator_Local()"),
+    "simulation worker": (HERE, "import simulator; from player_bot import Player_Random; "
+                                "simulator.play_game((0, (Player_Random, {}), (Player_Random, {}), (8, 7, 4)))"),
+    "remote client": (HERE, "from coordinator_remote import Coordinator_Remote"),
+    "server": (HERE, "from server import Connect4Server; Connect4Server(metrics=False)"),
+}
+
+
+def cold_start(cwd:str, code:str, runs:int) -> tuple[float, list]:
+    """
+    Run `code` in `runs` new interpreters
+
+    Returns:
+        tuple:  (fastest time of the code in seconds, optional backends it loaded), (None, None) if it failed
+    """
+    script = (
+        f"import time\nstart = time.perf_counter()\n{code}\nseconds = time.perf_counter() - start\n"
+        f"import sys, json\nprint(json.dumps([seconds, [m for m in {BACKENDS!r} if m in sys.modules]]))"
+    )
+    best, loaded = float("inf"), []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None, None
+        seconds, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        best = min(best, seconds)
+    return best, loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per scenario (fastest counts)")
+    args = parser.parse_args()
+
+    print(f"fastest of {args.runs} fresh interpreters, imports + setup of each scenario")
+    for name, (cwd, code) in SCENARIOS.items():
+        seconds, loaded = cold_start(cwd, code, args.runs)
+        if seconds is None:
+            print(f"{name:<20}{'failed':>10}")
+            continue
+        print(f"{name:<20}{seconds * 1000:>8.1f} ms   loads: {', '.join(loaded) or '-'}")
@@ -0,0 +1,58 @@
+"""
+Benchmark: parallel root search vs. number of worker processes
+
+    Searches a few fixed mid-game positions with the same time budget and reports
+    the average depth reached and nodes/sec for 1, 2, 4, ... workers (up to the CPU count).
+    "1 worker (in process)" is the plain AlphaBetaSearch without a process pool.
+
+Run with:  python bench_parallel_search.py --seconds 2
+"""
+import argparse
+import os
+
+from bitboard import Bitboard
+from parallel_search import ParallelSearch
+from search import AlphaBetaSearch
+
+
+POSITIONS = [        # mid-game positions without a forced result (columns played from the empty board)
+    [6, 5, 4, 4, 1, 4, 6, 3, 1, 5],
+    [1, 6, 1, 4, 3, 3, 3, 3, 3, 7],
+    [3, 1, 3, 4, 0, 4, 5, 7, 3, 0, 4, 3, 4, 1, 1, 4, 4, 4],
+    [4, 2, 0, 5, 3, 5, 4, 0, 0, 0, 5, 4, 7, 4, 4, 1, 4, 4],
+]
+
+def run(searcher, seconds:float) -> tuple[float, float]:
+    """ Returns (average depth, nodes/sec) over all positions """
+    depths, nodes, elapsed = [], 0, 0.0
+    for moves in POSITIONS:
+        board = Bitboard()
+        for column in moves:
+            board.play(column)
+        result = searcher.search(board, seconds)
+        depths.append(result.depth)
+        nodes += result.nodes
+        elapsed += result.seconds
+    return sum(depths) / len(depths), nodes / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0, help="time budget per position")
+    args = parser.parse_args()
+
+    print(f"{'workers':<24}{'avg depth':>10}{'nodes/sec':>14}")
+    depth, rate = run(AlphaBetaSearch(), args.seconds)
+    print(f"{'1 (in process)':<24}{depth:>10.1f}{rate:>14,.0f}")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ParallelSearch(workers=workers) as searcher:
+            searcher.search(Bitboard(), 0.1)             # start the worker processes before measuring
+            depth, rate = run(searcher, args.seconds)
+        print(f"{workers:<24}{depth:>10.1f}{rate:>14,.0f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: SenseHat writes of Player_Raspi_Local (dirty-region rendering) vs. full redraws
+
+    Plays random games on a MockSenseHat. Before every move the joystick is "moved"
+    from the middle to the chosen column (one visualize_choice per tick), after the
+    move the board is visualized. The naive renderer pushes the whole frame with
+    set_pixels on every tick / visualize.
+
+Run with:  python bench_raspi_render.py --games 100
+"""
+import argparse
+import contextlib
+import io
+import random
+
+from game import Connect4
+from led_matrix import BLACK
+from player_raspi_local import Player_Raspi_Local, PLAYER_COLOURS
+from sense_hat_mock import MockSenseHat
+
+
+def full_frame(game:Connect4, selected:int = None, colour:tuple = None) -> list:
+    """ Naive rendering: build all 64 pixels from a full board fetch """
+    frame = [BLACK] * 64
+    if selected is not None:
+        frame[selected] = colour
+    for y, row in enumerate(game.get_board(), start=1):
+        for x, cell in enumerate(row):
+            if cell:
+                frame[y * 8 + x] = PLAYER_COLOURS[cell]
+    return frame
+
+
+def joystick_path(column:int, start:int = 3) -> list:
+    """ Columns the selection passes through when the joystick moves from `start` to `column` """
+    step = 1 if column >= start else -1
+    return list(range(start, column + step, step))
+
+
+def play(n_games:int, naive:bool) -> MockSenseHat:
+    sense = MockSenseHat()
+    rng = random.Random(0)
+    for _ in range(n_games):
+        game = Connect4()
+        players = [Player_Raspi_Local(game, sense=sense)]
+        players.append(Player_Raspi_Local(game, matrix=players[0].matrix))
+        for player in players:
+            player.register_in_game()
+
+        while game.winner is None and game.turn_number < game.board_width * game.board_height:
+            player = players[game.turn_number % 2]
+            column = rng.choice([col for col in range(game.board_width) if game.get_board()[0, col] == ""])
+            for selected in joystick_path(column):
+                if naive:
+                    sense.set_pixels(full_frame(game, selected, player.colour))
+                else:
+                    player.visualize_choice(selected)
+            game.check_move(column, player.id)
+            if naive:
+                sense.set_pixels(full_frame(game))
+            else:
+                player.visualize()
+    return sense
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):        # visualize also prints the board on the CLI
+        naive = play(args.games, naive=True)
+        dirty = play(args.games, naive=False)
+
+    print(f"{args.games} random games, one frame per joystick tick / move")
+    print(f"full redraw:      {naive.calls:>8} SenseHat calls, {naive.writes:>10} LEDs written")
+    print(f"dirty regions:    {dirty.calls:>8} SenseHat calls, {dirty.writes:>10} LEDs written"
+          f"   ({naive.writes / dirty.writes:.0f}x fewer LEDs)")
+    print("same final image:", naive.get_pixels() == dirty.get_pixels())
@@ -0,0 +1,304 @@
+"""
+Load test: throughput and latency of the Connect4Server REST API (status, register, board, check_move, games)
+
+    Starts a local server (production or development mode) and simulates `games` concurrent
+    games. Every game is played by two client threads which behave like Player_Remote: register,
+    poll the status, fetch the board on their turn and send a (legal) random move. When a game
+    is over the pair starts a new one. Optional `watchers` only poll status and board of a game.
+
+    The result is written as a JSON report (per endpoint: throughput, latency percentiles,
+    error rate). Pass an older report with --compare to see the change between versions.
+
+Run with:  python bench_server_load.py --games 16 --seconds 10 --out report.json [--compare old_report.json]
+"""
+import argparse
+import json
+import platform
+import queue
+import random
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+from werkzeug.serving import make_server
+
+from server import Connect4Server
+
+
+ENDPOINTS = ("games", "register", "status", "board", "check_move")
+
+
+class EndpointStats:
+    """
+    Measurements of ONE client (merged after the run, so clients never share a lock)
+
+    Attributes:
+        latencies (dict):   endpoint -> list of request durations (seconds)
+        errors (dict):      endpoint -> number of failed requests (5xx or no response)
+        rejected (dict):    endpoint -> number of 4xx answers (e.g. illegal move)
+    """
+
+    def __init__(self) -> None:
+        self.latencies:dict = defaultdict(list)
+        self.errors:dict = defaultdict(int)
+        self.rejected:dict = defaultdict(int)
+
+    def request(self, session:requests.Session, endpoint:str, method:str, url:str, **kwargs) -> requests.Response:
+        """ Send one request and record its latency / outcome (returns None if there was no response) """
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=30, **kwargs)
+        except requests.RequestException:
+            self.latencies[endpoint].append(time.perf_counter() - start)
+            self.errors[endpoint] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 500:
+            self.errors[endpoint] += 1
+        elif response.status_code >= 400:
+            self.rejected[endpoint] += 1
+        return response
+
+    def merge(self, other:"EndpointStats") -> None:
+        for endpoint, latencies in other.latencies.items():
+            self.latencies[endpoint].extend(latencies)
+        for endpoint, count in other.errors.items():
+            self.errors[endpoint] += count
+        for endpoint, count in other.rejected.items():
+            self.rejected[endpoint] += count
+
+
+def play_client(api_url:str, games:queue.Queue, creator:bool, stop:threading.Event, stats:EndpointStats,
+                finished:list, poll_interval:float) -> None:
+    """
+    One player: plays games until `stop` is set
+        The creator of a pair creates every game and hands its ID to the partner through `games`.
+    """
+    session = requests.Session()
+    rng = random.Random()
+    while not stop.is_set():
+        if creator:
+            response = stats.request(session, "games", "POST", f"{api_url}/connect4/games")
+            if response is None or response.status_code != 200:
+                time.sleep(poll_interval)
+                continue
+            game_id = response.json()["game_id"]
+            games.put(game_id)
+        else:
+            try:
+                game_id = games.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+        game_url = f"{api_url}/connect4/{game_id}"
+        player_id = str(uuid.uuid4())
+        response = stats.request(session, "register", "POST", f"{game_url}/register", json={"player_id": player_id})
+        if response is None or response.status_code != 200:
+            continue
+        registration = response.json()
+        width = registration.get("board_width", 8)
+        n_cells = width * registration.get("board_height", 7)
+
+        while not stop.is_set():
+            response = stats.request(session, "status", "GET", f"{game_url}/status")
+            if response is None or response.status_code != 200:
+                break
+            status = response.json()
+            if status["winner"] is not None or status["turn_number"] >= n_cells:
+                if creator:
+                    finished.append(game_id)
+                break
+            if status["active_id"] != player_id:
+                time.sleep(poll_interval)
+                continue
+
+            response = stats.request(session, "board", "GET", f"{game_url}/board")
+            if response is None or response.status_code != 200:
+                break
+            top_row = response.json()["board"][:width]
+            column = rng.choice([col for col, cell in enumerate(top_row) if not cell])
+            stats.request(session, "check_move", "POST", f"{game_url}/check_move",
+                          json={"column": column, "player_id": player_id})
+
+
+def watch_client(api_url:str, stop:threading.Event, stats:EndpointStats, poll_interval:float) -> None:
+    """ Spectator: polls status and board of the default game until `stop` is set """
+    session = requests.Session()
+    while not stop.is_set():
+        stats.request(session, "status", "GET", f"{api_url}/connect4/status")
+        stats.request(session, "board", "GET", f"{api_url}/connect4/board")
+        time.sleep(poll_interval)
+
+
+def summarize(stats:EndpointStats, elapsed:float) -> dict:
+    """ Per endpoint (and total): requests, throughput, error rate and latency percentiles (ms) """
+    def describe(latencies:list, errors:int, rejected:int) -> dict:
+        if not latencies:
+            return {"requests": 0, "throughput": 0.0, "errors": 0, "error_rate": 0.0, "rejected": 0, "latency_ms": None}
+        milliseconds = sorted(latency * 1000 for latency in latencies)
+        if len(milliseconds) > 1:
+            quantiles = statistics.quantiles(milliseconds, n=100, method="inclusive")
+        else:
+            quantiles = milliseconds * 99
+        return {
+            "requests": len(latencies),
+            "throughput": len(latencies) / elapsed,
+            "errors": errors,
+            "error_rate": errors / len(latencies),
+            "rejected": rejected,
+            "latency_ms": {
+                "mean": statistics.fmean(milliseconds),
+                "p50": quantiles[49],
+                "p90": quantiles[89],
+                "p99": quantiles[98],
+                "max": milliseconds[-1],
+            },
+        }
+
+    endpoints = {
+        endpoint: describe(stats.latencies[endpoint], stats.errors[endpoint], stats.rejected[endpoint])
+        for endpoint in ENDPOINTS
+    }
+    endpoints["total"] = describe(
+        [latency for endpoint in ENDPOINTS for latency in stats.latencies[endpoint]],
+        sum(stats.errors.values()), sum(stats.rejected.values()),
+    )
+    return endpoints
+
+
+def git_commit() -> str:
+    """ Commit of the tested code (None outside of a git checkout) """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_load_test(games:int = 16, watchers:int = 0, seconds:float = 10.0, production:bool = True,
+                  workers:int = 64, port:int = 5077, poll_interval:float = 0.005) -> dict:
+    """
+    Start a local server, put load on it and return the report
+
+    Parameters:
+        games (int):            Concurrent games (two client threads each)
+        watchers (int):         Additional clients which only poll status and board
+        seconds (float):        Duration of the measurement
+        production (bool):      Serve with the production server (else Flask's development server)
+        workers (int):          Worker threads of the production server
+        port (int):             Local port of the server
+        poll_interval (float):  Seconds a client waits before polling the status again
+
+    Returns:
+        dict:   Report ("meta", "config", "seconds", "games_finished", "endpoints")
+    """
+    app_server = Connect4Server(max_games=max(1000, games * 100))
+    if production:
+        server = app_server.create_production_server(host="127.0.0.1", port=port, workers=workers)
+        threading.Thread(target=server.run, daemon=True).start()
+    else:
+        server = make_server("127.0.0.1", port, app_server.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{port}"
+
+    stop = threading.Event()
+    finished = []
+    client_stats, threads = [], []
+    for _ in range(games):
+        pair = queue.Queue()
+        for creator in (True, False):
+            stats = EndpointStats()
+            client_stats.append(stats)
+            threads.append(threading.Thread(
+                target=play_client, args=(api_url, pair, creator, stop, stats, finished, poll_interval), daemon=True
+            ))
+    for _ in range(watchers):
+        stats = EndpointStats()
+        client_stats.append(stats)
+        threads.append(threading.Thread(target=watch_client, args=(api_url, stop, stats, poll_interval), daemon=True))
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if production:
+        server.close()
+    else:
+        server.shutdown()
+
+    total = EndpointStats()
+    for stats in client_stats:
+        total.merge(stats)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "games": games, "clients": 2 * games + watchers, "watchers": watchers, "seconds": seconds,
+            "server": f"production ({workers} workers)" if production else "development",
+            "poll_interval": poll_interval,
+        },
+        "seconds": elapsed,
+        "games_finished": len(finished),
+        "endpoints": summarize(total, elapsed),
+    }
+
+
+def print_report(report:dict, baseline:dict = None) -> None:
+    """ Print the report as a table (with the relative change against a baseline report) """
+    config = report["config"]
+    print(f"{config['clients']} clients, {config['games']} concurrent games, {config['server']}, "
+          f"{report['seconds']:.1f}s, {report['games_finished']} games finished")
+    print(f"{'endpoint':<12}{'req/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'errors':>9}")
+    for endpoint, result in report["endpoints"].items():
+        if not result["requests"]:
+            continue
+        latency = result["latency_ms"]
+        line = (f"{endpoint:<12}{result['throughput']:>10,.0f}{latency['p50']:>9.2f}{latency['p90']:>9.2f}"
+                f"{latency['p99']:>9.2f}{result['error_rate']:>8.1%}")
+        old = (baseline or {}).get("endpoints", {}).get(endpoint)
+        if old and old["requests"]:
+            line += (f"   throughput {result['throughput'] / old['throughput'] - 1:+.0%}, "
+                     f"p99 {latency['p99'] / old['latency_ms']['p99'] - 1:+.0%}")
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=16, help="concurrent games (two clients each)")
+    parser.add_argument("--watchers", type=int, default=0, help="additional clients polling status and board")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--development", action="store_true", help="use Flask's development server")
+    parser.add_argument("--workers", type=int, default=64, help="worker threads of the production server")
+    parser.add_argument("--port", type=int, default=5077)
+    parser.add_argument("--poll-interval", type=float, default=0.005)
+    parser.add_argument("--out", default="bench_server_load.json", help="JSON report")
+    parser.add_argument("--compare", default=None, help="earlier JSON report to compare with")
+    args = parser.parse_args()
+
+    report = run_load_test(
+        games=args.games, watchers=args.watchers, seconds=args.seconds, production=not args.development,
+        workers=args.workers, port=args.port, poll_interval=args.poll_interval,
+    )
+    with open(args.out, "w") as file:
+        json.dump(report, file, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_report(report, baseline)
+    print(f"report written to {args.out}")
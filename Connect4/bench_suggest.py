@@ -0,0 +1,95 @@
+"""
+Benchmark: batched move suggestions (SuggestionBatcher) vs. one evaluation per request
+
+    N client threads ask for suggestions of different positions (no cache hits) at the
+    same time, once with every request evaluated on its own and once batched.
+    Reports throughput and the p50 / p99 latency of a request for each number of clients.
+
+Run with:  python bench_suggest.py --clients 1 8 32 64 --requests 20
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from bitboard import Bitboard
+from suggest import SuggestionBatcher
+
+
+def benchmark(clients:int, requests:int, batcher:SuggestionBatcher, positions:list) -> dict:
+    """
+    `clients` threads each ask for `requests` suggestions (different positions, no cache hits)
+
+    Returns:
+        dict:   "clients", "requests_per_sec", "p50_ms", "p99_ms", "avg_batch"
+    """
+    latencies, lock = [], threading.Lock()
+    batches_before = batcher.batches
+
+    def client(offset:int) -> None:
+        own = []
+        for index in range(requests):
+            board = positions[(offset * requests + index) % len(positions)]
+            start = time.perf_counter()
+            batcher.suggest(board)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "avg_batch": len(latencies) / max(1, batcher.batches - batches_before),
+    }
+
+
+def random_positions(count:int, seed:int = 0, width:int = 8, height:int = 7) -> list:
+    """ Distinct mid-game positions without a winner (random play) """
+    rng = np.random.default_rng(seed)
+    positions, seen = [], set()
+    while len(positions) < count:
+        board = Bitboard(width, height)
+        for _ in range(int(rng.integers(4, 20))):
+            column = int(rng.integers(width))
+            if not board.can_play(column):
+                continue
+            player = board.player
+            board.play(column)
+            if board.has_won(player):
+                board.undo()
+                break
+        if tuple(board.boards) not in seen:
+            seen.add(tuple(board.boards))
+            positions.append(board)
+    return positions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32], help="concurrent clients per run")
+    parser.add_argument("--requests", type=int, default=20, help="suggestions each client asks for")
+    parser.add_argument("--playouts", type=int, default=32, help="random playouts per column")
+    parser.add_argument("--window", type=float, default=0.005, help="seconds a batch collects requests")
+    args = parser.parse_args()
+
+    print(f"{'clients':>8}{'requests/sec':>14}{'p50':>10}{'p99':>10}{'avg batch':>11}")
+    for n_clients in args.clients:
+        positions = random_positions(n_clients * args.requests, seed=n_clients)
+        for window in (None, args.window):
+            stats = benchmark(n_clients, args.requests, SuggestionBatcher(window=window, playouts=args.playouts),
+                              positions)
+            label = "unbatched" if window is None else "batched"
+            print(f"{n_clients:>8}{stats['requests_per_sec']:>14,.1f}{stats['p50_ms']:>8.1f}ms{stats['p99_ms']:>8.1f}ms"
+                  f"{stats['avg_batch']:>11.1f}  {label}")
@@ -0,0 +1,246 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:                   # numpy is only imported when a board array is built (to_array)
+    import numpy as np
+
+
+class Bitboard:
+    """
+    Bitboard Engine for a Connect 4 Position
+
+        Stores the stones of each player as one integer
+            - every column uses (height + 1) bits, the top bit is an empty sentinel
+            - bit index of a cell = column * (height + 1) + row   (row 0 is the BOTTOM row)
+            - for the 8x7 board this is exactly 64 bits per player
+            - any board size and win length works (Python integers have no fixed width)
+
+        Moves, undo and win detection are only a few shift-and-mask operations.
+        The numpy board of Connect4 is only built from it on demand (to_array).
+
+    Attributes:
+        width (int):        Number of Horizontal Elements
+        height (int):       Number of Vertical Elements
+        win_length (int):   Number of consecutive coins needed for a win
+        boards (list):      Two integers, the stones of player 0 ('X') and player 1 ('O')
+        heights (list):     Bit index of the next free cell of each column
+        moves (list):       Played columns in order (used for undo)
+    """
+
+    __slots__ = ("width", "height", "win_length", "boards", "heights", "moves")
+
+    def __init__(self, width:int = 8, height:int = 7, win_length:int = 4) -> None:
+        """
+        Create an empty Bitboard
+
+        Parameters:
+            width (int):        Number of columns (default 8)
+            height (int):       Number of rows (default 7)
+            win_length (int):   Number of consecutive coins needed for a win (default 4)
+        """
+        self.width = width
+        self.height = height
+        self.win_length = win_length
+        self.boards = [0, 0]
+        self.heights = [col * (height + 1) for col in range(width)]
+        self.moves = []
+
+    def copy(self) -> "Bitboard":
+        """
+        Returns:
+            Bitboard:   Independent copy of this position
+        """
+        other = Bitboard.__new__(Bitboard)
+        other.width = self.width
+        other.height = self.height
+        other.win_length = self.win_length
+        other.boards = self.boards[:]
+        other.heights = self.heights[:]
+        other.moves = self.moves[:]
+        return other
+
+    @classmethod
+    def from_array(cls, board:"np.ndarray", icons:tuple = ("X", "O"), win_length:int = 4) -> "Bitboard":
+        """
+        Build a Bitboard from a numpy board (as returned by Connect4.get_board)
+            The order of the moves is unknown: moves made before cannot be undone,
+            `moves` only holds placeholders (-1) to keep track of the player to move.
+
+        Parameters:
+            board (np.ndarray): (height x width) board, row 0 is the TOP row, '' for empty
+            icons (tuple):      Icons of player 0 and player 1
+            win_length (int):   Number of consecutive coins needed for a win
+
+        Returns:
+            Bitboard:   Position of the board
+        """
+        height, width = len(board), len(board[0])
+        bitboard = cls(width, height, win_length)
+        for row in range(height):
+            for column in range(width):
+                cell = board[row][column]
+                if cell in icons:
+                    bit = column * (height + 1) + height - 1 - row
+                    bitboard.boards[icons.index(cell)] |= 1 << bit
+                    bitboard.heights[column] = max(bitboard.heights[column], bit + 1)
+                    bitboard.moves.append(-1)
+        return bitboard
+
+    @property
+    def player(self) -> int:
+        """
+        Index of the player to move (0 or 1)
+        """
+        return len(self.moves) & 1
+
+    def can_play(self, column:int) -> bool:
+        """
+        Check if a coin can be dropped into a column
+
+        Parameters:
+            column (int):   Selected Column
+
+        Returns:
+            bool:   True if the column exists and is not full
+        """
+        return 0 <= column < self.width and self.heights[column] < column * (self.height + 1) + self.height
+
+    def play(self, column:int) -> None:
+        """
+        Drop a coin of the player to move (no legality check, see can_play)
+
+        Parameters:
+            column (int):   Selected Column
+        """
+        self.boards[len(self.moves) & 1] |= 1 << self.heights[column]
+        self.heights[column] += 1
+        self.moves.append(column)
+
+    def undo(self) -> int:
+        """
+        Take back the last move
+
+        Returns:
+            int:    Column of the removed coin
+        """
+        column = self.moves.pop()
+        self.heights[column] -= 1
+        self.boards[len(self.moves) & 1] ^= 1 << self.heights[column]
+        return column
+
+    def has_won(self, player:int) -> bool:
+        """
+        Detect `win_length` consecutive coins of a player (vertical, horizontal or diagonal)
+
+        Parameters:
+            player (int):   Player index (0 or 1)
+
+        Returns:
+            bool:   True if the player has `win_length` in a row
+        """
+        board = self.boards[player]
+        if self.win_length != 4:
+            return has_run(board, self.height, self.win_length)
+        h = self.height
+        for shift in (1, h + 1, h + 2, h):      # same as has_run, inlined: the search calls it for every node
+            pairs = board & (board >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    def is_full(self) -> bool:
+        """
+        Returns:
+            bool:   True if no more coins can be placed
+        """
+        return len(self.moves) == self.width * self.height
+
+    def to_array(self, icons:tuple = ("X", "O")) -> "np.ndarray":
+        """
+        Build the (height x width) numpy board
+            - row 0 is the TOP row of the board
+            - empty cells are ''
+
+        Parameters:
+            icons (tuple):  Icons of player 0 and player 1
+
+        Returns:
+            np.ndarray:     Board of strings
+        """
+        import numpy as np
+
+        board = np.full((self.height, self.width), "", dtype="<U1")
+        stride = self.height + 1
+        for player, icon in enumerate(icons):
+            bits = self.boards[player]
+            while bits:
+                low = bits & -bits
+                index = low.bit_length() - 1
+                column, row = divmod(index, stride)
+                board[self.height - 1 - row, column] = icon
+                bits ^= low
+        return board
+
+
+def has_run(bits:int, height:int, length:int = 4) -> bool:
+    """
+    Detect `length` consecutive coins in the stones of one player (layout of Bitboard)
+        The sentinel bit on top of every column keeps runs from wrapping into the next column.
+
+    Parameters:
+        bits (int):     Stones of the player
+        height (int):   Number of rows of the board
+        length (int):   Number of consecutive coins needed for a win
+
+    Returns:
+        bool:   True if the stones contain `length` in a row
+    """
+    h = height
+    if length == 4:
+        # directions: vertical (1), horizontal (h+1), diagonal / (h+2), diagonal \ (h)
+        for shift in (1, h + 1, h + 2, h):
+            pairs = bits & (bits >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    # any length: double the run covered by each bit (1, 2, 4, ...), then top up to `length`
+    for shift in (1, h + 1, h + 2, h):
+        runs, run = bits, 1
+        while run * 2 <= length:
+            runs &= runs >> (run * shift)
+            run *= 2
+        if run < length:
+            runs &= runs >> ((length - run) * shift)
+        if runs:
+            return True
+    return False
+
+
+def has_run_through(bits:int, coin:int, height:int, length:int = 4) -> bool:
+    """
+    Detect `length` consecutive coins on the lines through one coin (the last move)
+        Counts the neighbours of `coin` in both directions of every line, at most
+        2 * (length - 1) cells per line: the cost does not grow with the board.
+
+    Parameters:
+        bits (int):     Stones of the player (including `coin`)
+        coin (int):     Bit of the coin
+        height (int):   Number of rows of the board
+        length (int):   Number of consecutive coins needed for a win
+
+    Returns:
+        bool:   True if a run of `length` coins goes through `coin`
+    """
+    h = height
+    for shift in (1, h + 1, h + 2, h):
+        count, cell = 1, coin >> shift
+        while count < length and bits & cell:
+            count += 1
+            cell >>= shift
+        cell = coin << shift
+        while count < length and bits & cell:
+            count += 1
+            cell <<= shift
+        if count >= length:
+            return True
+    return False
@@ -1,6 +1,45 @@
+import threading
+import time
+
 from game import Connect4
+from player import Player
 from player_local import Player_Local
-from player_raspi_local import Player_Raspi_Local
+
+
+def make_move_within(player:Player, time_limit:float = None) -> tuple:
+    """
+    Let a player choose a move within a time limit
+        With a limit the move is chosen in a worker thread which is given up when the
+        limit has passed (it ends on its own, its move is ignored).
+
+    Parameters:
+        player (Player):        Player to move
+        time_limit (float):     Seconds the player may take (None = no limit)
+
+    Returns:
+        tuple:  (column or None if the time limit has passed, seconds taken, True if in time)
+    """
+    start = time.perf_counter()
+    if time_limit is None:
+        column = player.make_move()
+        return column, time.perf_counter() - start, True
+
+    result = {}
+    def choose() -> None:
+        try:
+            result["column"] = player.make_move()
+        except Exception as error:                  # raised in the caller (if still in time)
+            result["error"] = error
+
+    worker = threading.Thread(target=choose, name="make_move", daemon=True)
+    worker.start()
+    worker.join(time_limit)
+    seconds = time.perf_counter() - start
+    if worker.is_alive():
+        return None, seconds, False
+    if "error" in result:
+        raise result["error"]
+    return result["column"], seconds, True
 
 
 
@@ -18,20 +57,40 @@ class Coordinator_Local:
         player2 (Player_Local or Player_Raspi_Local):   Local Instance of a Player
     """
 
-    def __init__(self, on_raspi:bool = False) -> None:
+    def __init__(self, on_raspi:bool = False, players:tuple = None, board_width:int = 8, board_height:int = 7,
+                 win_length:int = 4) -> None:
         """
         Initialize the Coordinator_Local with a Game and 2 Players
 
         Parameters:
             on_raspi (bool):            If game is played on raspi (default False)
+            players (tuple):            Optional: two (Player class, kwargs) pairs to play instead of
+                                        the CLI / SenseHat players, Bsp: ((Player_Bot, {"time_budget": 0.1}), ...)
+                                        Every class is created with the game as first argument.
+            board_width (int):          Number of columns (default 8)
+            board_height (int):         Number of rows (default 7)
+            win_length (int):           Coins in a row needed for a win (default 4)
         """
-        # TODO init correct player
-        if on_raspi:
-            # Potentially share SenseHat instance between two players
+        self.game = Connect4(board_width, board_height, win_length)
+
+        if players is not None:
+            (cls1, kwargs1), (cls2, kwargs2) = players
+            self.player1: Player = cls1(self.game, **kwargs1)
+            self.player2: Player = cls2(self.game, **kwargs2)
+        elif on_raspi:
+            # Share one SenseHat instance (its shadow framebuffer and joystick input) between the two players
             from sense_hat import SenseHat
+            from joystick import JoystickInput
+            from led_matrix import LedMatrix
+            from player_raspi_local import Player_Raspi_Local
+
+            sense = SenseHat()
+            matrix, joystick = LedMatrix(sense), JoystickInput(sense.stick)
+            self.player1 = Player_Raspi_Local(game=self.game, matrix=matrix, joystick=joystick)
+            self.player2 = Player_Raspi_Local(game=self.game, matrix=matrix, joystick=joystick)
         else:
-            pass
-        raise NotImplementedError(f"You need to write this code first")
+            self.player1 = Player_Local(self.game)
+            self.player2 = Player_Local(self.game)
     
 
     def play(self):
@@ -41,13 +100,91 @@ class Coordinator_Local:
             This method handles player registration, turn management, 
             and checking for a winner until the game concludes.
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        for player in (self.player1, self.player2):
+            player.register_in_game()
+
+        n_cells = self.game.board_width * self.game.board_height
+        status = self.game.get_status()
+        while status["winner"] is None and status["turn_number"] < n_cells:
+            active = self.player1 if self.player1.is_my_turn() else self.player2
+            active.visualize()
+            while not self.game.check_move(active.make_move(), active.id):
+                print("Illegal move, try again.")
+            status = self.game.get_status()
+
+        self.player1.visualize()
+        if status["winner"] is None:
+            print("Draw! The board is full.")
+        else:
+            winner = self.player1 if self.player1.icon == status["winner"] else self.player2
+            winner.celebrate_win()
+        self.close()
+
+    def play_headless(self, time_limit:float = None) -> dict:
+        """
+        Run one game without any visualization or input (both players must choose moves on their own).
+
+        Parameters:
+            time_limit (float):     Seconds a player may take for one move, a slower move loses the game
+                                    as soon as the time is up (None = no limit)
+
+        Returns:
+            dict:   "winner" (icon or None for a draw), "moves" (played columns),
+                    "move_times" (seconds each make_move took), "illegal" (icon of a player
+                    who chose an illegal move and lost the game by it, else None),
+                    "timeout" (icon of a player who lost the game by exceeding the time limit, else None)
+        """
+        try:
+            return self._play_headless(time_limit)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Release what the players hold once the game is over (e.g. the worker processes of a parallel bot)
+        """
+        for player in (self.player1, self.player2):
+            if hasattr(player, "close"):
+                player.close()
+
+    """
+    Internal Methods
+    """
+    def _play_headless(self, time_limit:float = None) -> dict:
+        """ Game loop of play_headless """
+        for player in (self.player1, self.player2):
+            player.register_in_game()
+
+        moves, move_times = [], []
+        n_cells = self.game.board_width * self.game.board_height
+        players = (self.player1, self.player2)
+        winner, illegal, timeout = None, None, None
+        while len(moves) < n_cells:
+            active = players[len(moves) % 2]
+            column, seconds, in_time = make_move_within(active, time_limit)
+            move_times.append(seconds)
+
+            if not in_time:
+                timeout = active.icon
+                winner = players[(len(moves) + 1) % 2].icon
+                break
+            if not self.game.check_move(column, active.id):
+                illegal = active.icon
+                winner = players[(len(moves) + 1) % 2].icon
+                break
+            moves.append(column)
+            winner = self.game.winner
+            if winner is not None:
+                break
+
+        return {"winner": winner, "moves": moves, "move_times": move_times, "illegal": illegal, "timeout": timeout}
 
 
 
 if __name__ == "__main__":
     # Create a coordinator
     # play a game
-    # TODO
-    raise NotImplementedError(f"You need to write this code first")
+    import sys
+
+    coordinator = Coordinator_Local(on_raspi="--raspi" in sys.argv)
+    coordinator.play()
@@ -1,15 +1,18 @@
-from time import sleep
+from player_remote import Player_Remote
 
 
 class Coordinator_Remote:
-    """ 
+    """
     Coordinator for two Remote players
         - either playing over CLI or
         - playing over SenseHat
 
-    This class manages the game flow, player registration, turn management, 
+    This class manages the game flow, player registration, turn management,
     and game status updates for Remote players using the Server.
 
+    Instead of polling the status in a loop, the coordinator long polls the server:
+    every request returns as soon as the turn number changes (one round trip per turn).
+
 
     Attributes:
         api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
@@ -17,46 +20,83 @@ class Coordinator_Remote:
         sense (SenseHat):   Optional Local Instance of a SenseHat (if on Raspi)
     """
 
-    def __init__(self, api_url: str) -> None:
+    def __init__(self, api_url: str, game_id: str = None, on_raspi: bool = False) -> None:
         """
         Initialize the Coordinator_Remote.
 
         Parameters:
             api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+            game_id (str):      ID of the game on the server (None for the default game)
+            on_raspi (bool):    Play with the SenseHat (LED matrix + joystick) instead of the CLI
         """
         self.api_url = api_url
+        self.sense = None
+        if on_raspi:
+            from sense_hat import SenseHat
+            from player_raspi_remote import Player_Raspi_Remote
 
-        # TODO initialize correct player
+            self.sense = SenseHat()
+            self.player = Player_Raspi_Remote(api_url, game_id=game_id, sense=self.sense)
+        else:
+            self.player = Player_Remote(api_url, game_id=game_id)
 
-    def wait_for_second_player(self):
+    def wait_for_second_player(self) -> dict:
         """
         Waits for the second player to connect.
 
-        This method checks the game status until the second player is detected,
+        This method long polls the game status until the second player is detected,
         indicating that the game can start.
+
+        Returns:
+            dict:   Game status at the start of the game
         """
-        # TODO
-        raise NotImplementedError("Not yet implemented")
+        status = self.player.get_game_status()
+        if status["turn_number"] < 0:
+            print("Waiting for the second player ...")
+        while status["turn_number"] < 0:
+            status = self.player.wait_for_change(status["turn_number"])
+        return status
 
     def play(self):
-        """ 
+        """
         Main function to play the game with two remote players.
 
         This method manages the game loop, where players take turns making moves,
         checks for a winner, and visualizes the game board.
         """
-        # TODO
-        raise NotImplementedError("Not yet implemented")
+        icon = self.player.register_in_game()
+        print(f"Registered as player {icon}")
+
+        status = self.wait_for_second_player()
+        n_cells = self.player.board_width * self.player.board_height
+
+        while status["winner"] is None and status["turn_number"] < n_cells:
+            if status["active_id"] == str(self.player.id):
+                self.player.visualize()
+                while not self.player.send_move(self.player.make_move()):
+                    print("Illegal move, try again.")
+                status = self.player.get_state()       # status + board in one request
+            else:
+                status = self.player.wait_for_change(status["turn_number"])
+
+        self.player.visualize()
+        if status["winner"] == self.player.icon:
+            self.player.celebrate_win()
+        elif status["winner"] is None:
+            print("Draw! The board is full.")
+        else:
+            print(f"Player {status['winner']} wins.")
 
 # To start a game
 if __name__ == "__main__":
     api_url = "http://localhost:5000"  # Connect 4 API server URL
-    
+
     # Uncomment the following lines to specify different URLs
     # pc_url = "http://172.19.176.1:5000"
     # pc_url = "http://10.147.97.97:5000"
     # pc_url = "http://127.0.1.1:5000"
 
     # Initialize the Coordinator
-    c_remote = Coordinator_Remote(api_url=api_url)
+    import sys
+    c_remote = Coordinator_Remote(api_url=api_url, on_raspi="--raspi" in sys.argv)
     c_remote.play()
@@ -0,0 +1,163 @@
+"""
+Asyncio Coordinator for Remote players
+
+    Same game flow as Coordinator_Remote, but as a coroutine: one process plays many
+    games at once, all players share one pool of keep-alive connections.
+
+Simulate many clients (e.g. to load test a server) with:
+    python coordinator_remote_async.py --url http://localhost:5000 --players 200
+"""
+import argparse
+import asyncio
+import random
+import time
+
+try:
+    import aiohttp
+except ImportError:                 # optional: pip install Connect4[async]
+    aiohttp = None
+
+from player_remote_async import Player_Remote_Async
+
+
+def random_strategy(board:list) -> int:
+    """ Random column which is not full """
+    return random.choice([col for col, cell in enumerate(board[0]) if not cell])
+
+
+class Coordinator_Remote_Async:
+    """
+    Coordinator for ONE remote player (asyncio)
+
+        Long polls the server while the opponent is thinking (one request per turn),
+        and fetches status and board of its own turns concurrently.
+
+    Attributes:
+        player (Player_Remote_Async):   Local Instance of ONE remote Player
+        verbose (bool):                 Print the board and the result (off for simulated players)
+    """
+
+    def __init__(self, api_url:str, game_id:str = None, session:"aiohttp.ClientSession" = None,
+                 strategy = None, verbose:bool = True) -> None:
+        """
+        Initialize the Coordinator_Remote_Async.
+
+        Parameters:
+            api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+            game_id (str):      ID of the game on the server (None for the default game)
+            session (aiohttp.ClientSession):    Shared connection pool (None: the player opens its own)
+            strategy (callable):    strategy(board) -> column (None: the player is asked on the CLI)
+            verbose (bool):     Print the board and the result
+        """
+        self.player = Player_Remote_Async(api_url, game_id=game_id, session=session, strategy=strategy)
+        self.verbose = verbose
+
+    async def wait_for_second_player(self) -> dict:
+        """
+        Long poll the game status until the second player has registered
+
+        Returns:
+            dict:   Game status at the start of the game
+        """
+        status = await self.player.get_game_status()
+        while status["turn_number"] < 0:
+            status = await self.player.wait_for_change(status["turn_number"])
+        return status
+
+    async def play(self) -> str:
+        """
+        Play one game to the end
+
+        Returns:
+            str:    Icon of the winner (None for a draw)
+        """
+        await self.player.register_in_game()
+        status = await self.wait_for_second_player()
+        n_cells = self.player.board_width * self.player.board_height
+
+        while status["winner"] is None and status["turn_number"] < n_cells:
+            if status["active_id"] == str(self.player.id):
+                status, board = await self.player.get_status_and_board()
+                if self.verbose:
+                    self.player.visualize(board)
+                while not await self.player.send_move(await self.player.make_move(board)):
+                    if self.verbose:
+                        print("Illegal move, try again.")
+                    board = await self.player.get_board()
+                status = await self.player.get_game_status()
+            else:
+                status = await self.player.wait_for_change(status["turn_number"])
+
+        if self.verbose:
+            self.player.visualize(await self.player.get_board())
+            if status["winner"] == self.player.icon:
+                self.player.celebrate_win()
+            elif status["winner"] is None:
+                print("Draw! The board is full.")
+            else:
+                print(f"Player {status['winner']} wins.")
+        return status["winner"]
+
+
+async def play_many(api_url:str, n_players:int, strategy = random_strategy, connections:int = None) -> dict:
+    """
+    Simulate many remote players at once (pairs of players, one new game per pair)
+
+    Parameters:
+        api_url (str):          Address of Server
+        n_players (int):        Number of simulated players (rounded down to an even number)
+        strategy (callable):    Strategy of all players
+        connections (int):      Size of the shared keep-alive connection pool (default: one per player)
+                                A long poll holds its connection until the opponent moved: with fewer
+                                connections than waiting players the moving players starve.
+
+    Returns:
+        dict:   "games", "wins" (per icon), "draws", "seconds"
+    """
+    if aiohttp is None:
+        raise ImportError("play_many requires 'aiohttp' (pip install Connect4[async])")
+
+    connector = aiohttp.TCPConnector(limit=connections or n_players)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        coordinators = []
+        for _ in range(n_players // 2):
+            async with session.post(f"{api_url.rstrip('/')}/connect4/games") as response:
+                response.raise_for_status()
+                game_id = (await response.json())["game_id"]
+            coordinators += [
+                Coordinator_Remote_Async(api_url, game_id, session=session, strategy=strategy, verbose=False)
+                for _ in range(2)
+            ]
+        winners = await asyncio.gather(*(coordinator.play() for coordinator in coordinators))
+
+    # both players of a game report the same winner
+    results = winners[::2]
+    return {
+        "games": len(results),
+        "wins": {icon: results.count(icon) for icon in ("X", "O")},
+        "draws": results.count(None),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--players", type=int, default=0, help="simulate this many players (0: play yourself)")
+    parser.add_argument("--connections", type=int, default=None, help="size of the shared connection pool (default: one per player)")
+    parser.add_argument("--game-id", default=None)
+    args = parser.parse_args()
+
+    if args.players:
+        summary = asyncio.run(play_many(args.url, args.players, connections=args.connections))
+        print(f"{summary['games']} games in {summary['seconds']:.1f}s: "
+              f"X won {summary['wins']['X']}, O won {summary['wins']['O']}, {summary['draws']} draws")
+    else:
+        async def main():
+            coordinator = Coordinator_Remote_Async(args.url, game_id=args.game_id)
+            try:
+                await coordinator.play()
+            finally:
+                await coordinator.player.close()
+        asyncio.run(main())
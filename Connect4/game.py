@@ -1,7 +1,98 @@
 import uuid
+import time
 import random
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-import numpy as np
+from bitboard import Bitboard, has_run_through
+from metrics import FAST_BUCKETS
+
+if TYPE_CHECKING:                   # numpy is only imported by get_board (see Bitboard.to_array)
+    import numpy as np
+    from metrics import Metrics
+
+
+SLOT_BITS = 32                      # bits of one player slot in Connect4._players
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+@lru_cache(maxsize=None)
+def board_shape(width:int, height:int, win_length:int = 4) -> tuple:
+    """
+    Precompute the masks of a board size (layout of Bitboard)
+        Shared by all games of the same board size.
+
+    Parameters:
+        width (int):        Number of columns
+        height (int):       Number of rows
+        win_length (int):   Number of consecutive coins needed for a win
+
+    Returns:
+        tuple:  (width, height, win_length, bottom bit of each column, top bit of each column)
+    """
+    stride = height + 1
+    bottoms = tuple(1 << (column * stride) for column in range(width))
+    tops = tuple(bottom << (height - 1) for bottom in bottoms)
+    return width, height, win_length, bottoms, tops
+
+
+class PlayerTable:
+    """
+    Shared Table of the player IDs of all games (UUID <-> small slot number)
+
+        A game stores two slot numbers instead of two UUID objects, the table keeps every
+        ID only once (as a 128 bit integer). Slots are reference counted: a slot is reused
+        as soon as no game refers to it any more.
+
+        Slot 0 means "no player".
+    """
+
+    __slots__ = ("_ids", "_refs", "_slots", "_free", "_lock")
+
+    def __init__(self) -> None:
+        self._ids:list = [None]         # slot -> player ID (int)
+        self._refs:list = [0]           # slot -> number of games referring to it
+        self._slots:dict = {}           # player ID (int) -> slot
+        self._free:list = []            # released slots
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def acquire(self, player_id:int) -> int:
+        """ Slot of a player ID (created if needed), the caller holds one reference to it """
+        with self._lock:
+            slot = self._slots.get(player_id)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                    self._ids[slot] = player_id
+                else:
+                    slot = len(self._ids)
+                    self._ids.append(player_id)
+                    self._refs.append(0)
+                self._slots[player_id] = slot
+            self._refs[slot] += 1
+            return slot
+
+    def release(self, slot:int) -> None:
+        """ Drop one reference to a slot (the slot is freed with its last reference) """
+        with self._lock:
+            self._refs[slot] -= 1
+            if not self._refs[slot]:
+                del self._slots[self._ids[slot]]
+                self._ids[slot] = None
+                self._free.append(slot)
+
+    def id_of(self, slot:int) -> int:
+        """ Player ID (int) of a slot (None for slot 0) """
+        return self._ids[slot]
+
+    def uuid_of(self, slot:int) -> uuid.UUID:
+        """ Player ID of a slot as UUID (None for slot 0) """
+        player_id = self._ids[slot]
+        return uuid.UUID(int=player_id) if player_id is not None else None
 
 
 class Connect4:
@@ -13,99 +104,423 @@ class Connect4:
             - where can you set / not set a coin
             - how big is the playing field
 
-        Also keeps track of the current game  
+        Also keeps track of the current game
             - what is its state
             - who is the active player?
 
         Is used by the Coordinator
             -> executes the methods of a Game object
+
+        A game is kept small (a server holds many thousands of them):
+            - the stones are two integers (layout of Bitboard), the move history one byte per move
+            - the players are two slot numbers of the shared PlayerTable, packed into one integer
+            - winner and version are packed into one status integer, the turn number follows from the moves
+            - every game has its own lock (independent games never block each other),
+              the Condition for long polling is only created when somebody waits
+        The numpy board of get_board() and the status dict are only built when they are requested.
+        A win is only looked for on the lines through the last coin (any board size and win length).
+
+    Attributes:
+        board_width (int):      Number of Horizontal Elements
+        board_height (int):     Number of Vertical Elements
+        win_length (int):       Number of consecutive coins needed for a win
+        icons (tuple):          Icons of the first and second player
+        players (list):         UUIDs of the registered players (None if not yet registered)
+        turn_number (int):      Current Turn (-1 if game has not started yet)
+        winner (str):           Icon of the winner (None if there is no winner)
+        version (int):          Increases with every change of the game (registration or move)
+        metrics (Metrics):      If set, the duration of every win detection is recorded there (e.g. the server's)
+
+    Class Attributes:
+        player_table (PlayerTable): Player IDs of all games
     """
-    
-    def __init__(self) -> None:
-        """ 
+    __slots__ = ("_shape", "_x", "_o", "_moves", "_players", "_status", "_lock", "_changed", "_board_cache",
+                 "metrics")
+
+    icons:tuple = ("X", "O")
+    player_table = PlayerTable()
+
+    def __init__(self, width:int = 8, height:int = 7, win_length:int = 4, metrics:"Metrics" = None) -> None:
+        """
         Init a Connect 4 Game
             - Create an empty Board
             - Create to (non - registered and empty) players.
-            - Set the Turn Counter to 0
-            - Set the Winner to False
-            - etc.
+            - Set the Turn Counter to -1 (not started)
+            - Set the Winner to None
+
+        Parameters:
+            width (int):        Number of columns (default 8, at most 255)
+            height (int):       Number of rows (default 7)
+            win_length (int):   Number of consecutive coins needed for a win (default 4)
+            metrics (Metrics):  Records the duration of every win detection (None: not timed)
+
+        Raises:
+            ValueError:     If the board size or win length is not positive
         """
-       # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        if not (1 <= width <= 255) or height < 1 or win_length < 1:
+            raise ValueError(f"Invalid board: {width}x{height}, {win_length} in a row")
+        self._shape:tuple = board_shape(width, height, win_length)
+        self._x:int = 0                             # stones of 'X'
+        self._o:int = 0                             # stones of 'O'
+        self._moves:bytes = b""                     # played columns in order
+        self._players:int = 0                       # slot of 'X' | slot of 'O' << SLOT_BITS
+        self._status:int = 0                        # winner (0: none, 1: 'X', 2: 'O') | version << 2
+        self._lock = threading.Lock()
+        self._changed:threading.Condition = None    # notified whenever turn_number changes (created on first wait)
+        self._board_cache:"np.ndarray" = None
+        self.metrics = metrics
+
+    def __del__(self) -> None:
+        players = getattr(self, "_players", 0)      # not set if __init__ raised
+        for slot in (players & SLOT_MASK, players >> SLOT_BITS):
+            if slot:
+                Connect4.player_table.release(slot)
+
+    """
+    State (built from the compact representation)
+    """
+    @property
+    def board_width(self) -> int:
+        return self._shape[0]
+
+    @property
+    def board_height(self) -> int:
+        return self._shape[1]
+
+    @property
+    def win_length(self) -> int:
+        return self._shape[2]
+
+    @property
+    def players(self) -> list:
+        players = self._players
+        return [Connect4.player_table.uuid_of(slot) for slot in (players & SLOT_MASK, players >> SLOT_BITS)]
+
+    @property
+    def turn_number(self) -> int:
+        return len(self._moves) if self._players >> SLOT_BITS else -1
+
+    @property
+    def winner(self) -> str:
+        code = self._status & 3
+        return self.icons[code - 1] if code else None
+
+    @property
+    def version(self) -> int:
+        return self._status >> 2
+
+    @version.setter
+    def version(self, value:int) -> None:
+        self._status = (self._status & 3) | value << 2
 
     """
     Methods to be exposed to the API later on
     """
-    def get_status(self):
+    def get_status(self) -> dict:
         """
         Get the game's status.
             - active player (id or icon)
             - is there a winner? if so who?
             - what turn is it?
+
+        Returns:
+            dict:   "active_player", "active_id", "winner", "turn_number"
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        with self._lock:
+            turn_number, winner = self.turn_number, self.winner
+            active_slot = (self._players >> (SLOT_BITS * (turn_number % 2))) & SLOT_MASK if turn_number >= 0 else 0
+
+        active_id = Connect4.player_table.uuid_of(active_slot)
+        return {
+            "active_player": self.icons[turn_number % 2] if turn_number >= 0 else None,
+            "active_id": str(active_id) if active_id is not None else None,
+            "winner": winner,
+            "turn_number": turn_number,
+        }
 
     def register_player(self, player_id:uuid.UUID)->str:
-        """ 
+        """
         Register a player with a unique ID
             Save his ID as one of the local players
-        
+
         Parameters:
             player_id (UUID)    Unique ID
 
         Returns:
             icon:       Player Icon (or None if failed)
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        player_id = self.__as_uuid(player_id)
+        if player_id is None:
+            return None
+
+        table = Connect4.player_table
+        with self._lock:
+            for index in range(2):
+                slot = (self._players >> (SLOT_BITS * index)) & SLOT_MASK
+                if slot and table.id_of(slot) == player_id.int:
+                    return self.icons[index]
+                if not slot:
+                    self._players |= table.acquire(player_id.int) << (SLOT_BITS * index)
+                    self.version += 1
+                    if index == 1:                  # both players are there: the game starts (turn 0)
+                        self.__notify()
+                    return self.icons[index]
+
+        return None
+
+    def wait_for_change(self, turn_number:int, timeout:float = None) -> bool:
+        """
+        Block until the turn number differs from the given one or the game is over (long polling)
+            Returns immediately if it already differs.
 
+        Parameters:
+            turn_number (int):  Turn number the caller has already seen
+            timeout (float):    Maximum seconds to wait (None = forever)
 
-    def get_board(self)-> np.ndarray:
-        """ 
+        Returns:
+            bool:   True if the turn number changed (or a player resigned), False on timeout
+        """
+        with self._lock:
+            if self._changed is None:
+                self._changed = threading.Condition(self._lock)
+            return self._changed.wait_for(lambda: self.turn_number != turn_number or self.winner is not None, timeout)
+
+
+    def get_board(self)-> "np.ndarray":
+        """
         Return the current board state (For Example an Array of all Elements)
+            - (board_height x board_width) numpy array (row 0 is the top row)
+            - 'X' / 'O' for the players, '' for empty spots
 
         Returns:
             board
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        with self._lock:
+            if self._board_cache is None:
+                self._board_cache = self.__bitboard().to_array(self.icons)
+            return self._board_cache.copy()
+
+    def get_bitboards(self) -> tuple[int, int]:
+        """
+        Return the current board state as two integer bitmasks (compact encoding)
+            - one mask per player ('X' first)
+            - bit index of a cell = column * (board_height + 1) + row   (row 0 is the BOTTOM row)
+
+        Returns:
+            tuple:  (mask of 'X', mask of 'O')
+        """
+        with self._lock:
+            return self._x, self._o
+
+    def get_bitboard(self) -> Bitboard:
+        """
+        Return a copy of the current position as a Bitboard (with the move history)
+            Cheaper than get_board for bots: no numpy board is built.
+
+        Returns:
+            Bitboard:   Independent copy of the position
+        """
+        with self._lock:
+            return self.__bitboard()
+
+    def get_moves(self) -> list:
+        """
+        Return the columns of all moves made so far (in the order they were played)
+
+        Returns:
+            list:   Columns (index = turn number of the move)
+        """
+        with self._lock:
+            return list(self._moves)
+
+    def to_snapshot(self) -> dict:
+        """
+        Return the complete state of the game as plain (JSON serializable) data
+            players + move history are enough to rebuild the game (see from_snapshot)
+
+        Returns:
+            dict:   "width", "height", "win_length", "players", "moves", "version", "winner"
+        """
+        with self._lock:
+            return {
+                "width": self.board_width,
+                "height": self.board_height,
+                "win_length": self.win_length,
+                "players": [str(player) if player is not None else None for player in self.players],
+                "moves": list(self._moves),
+                "version": self.version,
+                "winner": self.winner,              # differs from the moves only if a player resigned
+            }
+
+    @classmethod
+    def from_snapshot(cls, snapshot:dict) -> "Connect4":
+        """
+        Rebuild a game from a snapshot (see to_snapshot)
+            The players are registered and the moves are replayed with the normal game rules.
+
+        Parameters:
+            snapshot (dict):    "players", "moves" and optionally "version", "winner" and the board geometry
+                                ("width", "height", "win_length", default 8x7 / 4)
+
+        Returns:
+            Connect4:   The rebuilt game
+        """
+        game = cls(snapshot.get("width", 8), snapshot.get("height", 7), snapshot.get("win_length", 4))
+        for player in snapshot["players"]:
+            if player is not None:
+                game.register_player(player)
+        for column in snapshot["moves"]:
+            if not game.check_move(column, game.players[game.turn_number % 2]):
+                break
+        winner = snapshot.get("winner")
+        if winner is not None and game.winner is None:
+            game.resign(game.players[1 - cls.icons.index(winner)])
+        game.version = max(game.version, snapshot.get("version", 0))
+        return game
 
 
     def check_move(self, column:int, player_Id:uuid.UUID) -> bool:
-        """ 
+        """
         Check move of a certain player is legal
             If a certain player can make the requested move
+            The check and the move are atomic (per game lock)
 
         Parameters:
             col (int):      Selected Column of Coin Drop
-            player (str):   Player ID 
+            player (str):   Player ID
+
+        Returns:
+            bool:   True if the move was legal (and has been made)
+        """
+        player_Id = self.__as_uuid(player_Id)
+        if not isinstance(column, int) or isinstance(column, bool) or player_Id is None:
+            return False
+
+        width, height, _, bottoms, tops = self._shape
+        with self._lock:
+            turn_number = self.turn_number
+            if turn_number < 0 or self._status & 3 or turn_number == width * height:
+                return False
+
+            player = turn_number % 2
+            slot = (self._players >> (SLOT_BITS * player)) & SLOT_MASK
+            if Connect4.player_table.id_of(slot) != player_Id.int:
+                return False
+
+            mask = self._x | self._o
+            if not 0 <= column < width or mask & tops[column]:
+                return False
+
+            coin = ((mask + bottoms[column]) | mask) ^ mask     # lowest empty cell of the column
+            if player == 0:
+                self._x |= coin
+            else:
+                self._o |= coin
+            self._moves += bytes((column,))
+            self.__update_status(player, coin)
+        return True
+
+    def resign(self, player_Id:uuid.UUID) -> bool:
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
-        
-    """ 
+        Give up a running game: the opponent wins (e.g. a forfeit of a player who was too slow)
+
+        Parameters:
+            player_Id (UUID):   ID of the player who gives up
+
+        Returns:
+            bool:   True if the player plays in this running game (and has resigned)
+        """
+        player_Id = self.__as_uuid(player_Id)
+        if player_Id is None:
+            return False
+
+        width, height, _, _, _ = self._shape
+        with self._lock:
+            turn_number = self.turn_number
+            if turn_number < 0 or self._status & 3 or turn_number == width * height:
+                return False
+            for player in (0, 1):
+                slot = (self._players >> (SLOT_BITS * player)) & SLOT_MASK
+                if Connect4.player_table.id_of(slot) == player_Id.int:
+                    self._status += 4 + (2 - player)    # version + 1, the other player is the winner
+                    self.__notify()
+                    return True
+        return False
+
+    """
     Internal Method (for Game Logic)
     """
-    def __update_status(self):
-        """ 
+    def __update_status(self, player:int, coin:int):
+        """
         Update all values for the status (after each successful move)
             - active player
             - active ID
             - winner
             - turn_number
+
+        Caller holds the game lock.
+
+        Parameters:
+            player (int):   Index of the player who just moved
+            coin (int):     Bit of the coin just dropped
+        """
+        self._board_cache = None
+
+        metrics = self.metrics
+        if metrics is None:
+            won = self.__detect_win(player, coin)
+        else:
+            start = time.perf_counter()
+            won = self.__detect_win(player, coin)
+            metrics.observe("connect4_win_detection_seconds", time.perf_counter() - start, buckets=FAST_BUCKETS)
+
+        self._status += 4 + (player + 1 if won else 0)     # version + 1, winner
+        self.__notify()
+
+
+    def __detect_win(self, player:int, coin:int)->bool:
         """
+        Detect if someone has won the game (win_length consecutive same pieces).
+            Only the player who made the last move can have won, on a line through the new coin.
 
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
-    
+        Parameters:
+            player (int):   Index of the player who made the last move
+            coin (int):     Bit of the last coin
 
-    def __detect_win(self)->bool:
-        """ 
-        Detect if someone has won the game (4 consecutive same pieces).
-        
         Returns:
             True if there's a winner, False otherwise
-        """    
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
\ No newline at end of file
+        """
+        return has_run_through(self._o if player else self._x, coin, self._shape[1], self._shape[2])
+
+    def __notify(self) -> None:
+        """ Wake up the long polls of this game (caller holds the game lock) """
+        if self._changed is not None:
+            self._changed.notify_all()
+
+    def __bitboard(self) -> Bitboard:
+        """ Bitboard of the current position (caller holds the game lock) """
+        width, height, win_length, bottoms, _ = self._shape
+        board = Bitboard(width, height, win_length)
+        board.boards = [self._x, self._o]
+        board.moves = list(self._moves)
+        mask = self._x | self._o
+        board.heights = [
+            bottom.bit_length() - 1 + ((mask >> (bottom.bit_length() - 1)) & ((1 << height) - 1)).bit_length()
+            for bottom in bottoms
+        ]
+        return board
+
+    @staticmethod
+    def __as_uuid(player_id) -> uuid.UUID:
+        """
+        Convert a player ID (UUID or string) to a UUID
+
+        Returns:
+            UUID:   Player ID (None if invalid)
+        """
+        if isinstance(player_id, uuid.UUID):
+            return player_id
+        try:
+            return uuid.UUID(str(player_id))
+        except ValueError:
+            return None
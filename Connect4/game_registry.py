@@ -0,0 +1,240 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from game import Connect4
+from game_store import GameJournal
+from metrics import Metrics
+
+
+class GameRegistry:
+    """
+    Registry of all Connect4 games hosted by one Server (keyed by game ID)
+
+        - creates games on demand or by pairing waiting players in the lobby
+        - keeps the games in least-recently-used order
+        - evicts games that were idle for too long
+        - never holds more than `max_games` games: only finished or idle games make room,
+          a running game is never evicted for a new one (the registry is full instead)
+
+    Attributes:
+        max_games (int):        Upper bound of games held in memory
+        idle_timeout (float):   Seconds without any access after which a game is evicted
+        games (OrderedDict):    game_id -> [Connect4, last access time]  (least recently used first)
+        pinned (set):           IDs of games which are never evicted
+        journal (GameJournal):  Journal the games are persisted to (None: games live in memory only)
+        geometry (tuple):       (width, height, win_length) of new games unless given otherwise
+        metrics (Metrics):      Handed to every game (times its win detection), None: not timed
+        lobby_timeout (float):  Seconds a waiting player stays pairable without asking again
+    """
+
+    def __init__(self, max_games:int = 1000, idle_timeout:float = 1800.0, journal:GameJournal = None,
+                 geometry:tuple = (8, 7, 4), lobby_timeout:float = 10.0, metrics:Metrics = None) -> None:
+        """
+        Create an empty Registry
+
+        Parameters:
+            max_games (int):        Upper bound of games held in memory (default 1000)
+            idle_timeout (float):   Seconds after which an idle game is evicted (default 30 min)
+            journal (GameJournal):  Journal for creations, registrations and removals of games (optional)
+            geometry (tuple):       (width, height, win_length) of new games and lobby games (default 8x7, 4 in a row)
+            lobby_timeout (float):  Seconds after which a waiting player who stopped polling the lobby is dropped
+            metrics (Metrics):      Metrics of the server the games belong to (optional)
+        """
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self.journal = journal
+        self.geometry = tuple(geometry)
+        self.lobby_timeout = lobby_timeout
+        self.metrics = metrics
+        self.games:OrderedDict = OrderedDict()
+        self.pinned:set = set()
+
+        self._lock = threading.Lock()
+        self._waiting:OrderedDict = OrderedDict()   # player_id -> time of the last lobby poll (in joining order)
+        self._assigned:dict = {}                    # player_id -> game_id (paired by the lobby)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def __contains__(self, game_id:str) -> bool:
+        return game_id in self.games
+
+    def create_game(self, game_id:str = None, pinned:bool = False, geometry:tuple = None) -> str:
+        """
+        Create a new game
+
+        Parameters:
+            game_id (str):      ID of the new game (a random ID is generated if None)
+            pinned (bool):      If True the game is never evicted
+            geometry (tuple):   (width, height, win_length) of the board (None: the registry's default)
+
+        Returns:
+            str:    ID of the created game (None if the registry is full)
+        """
+        with self._lock:
+            return self._create_game(game_id, pinned, geometry or self.geometry)
+
+    def get_game(self, game_id:str) -> Connect4:
+        """
+        Get a game by its ID (and mark it as recently used)
+
+        Parameters:
+            game_id (str):  ID of the game
+
+        Returns:
+            Connect4:   The game (None if there is no such game)
+        """
+        with self._lock:
+            entry = self.games.get(game_id)
+            if entry is None:
+                return None
+            entry[1] = time.monotonic()
+            self.games.move_to_end(game_id)
+            return entry[0]
+
+    def join_lobby(self, player_id:str) -> str:
+        """
+        Matchmaking: pair waiting players
+            - if another player is waiting, a new game is created and both are registered
+            - otherwise the player waits until a second player joins
+
+        Calling it again while waiting returns the game as soon as the player was paired.
+        Once that game is over, the next call queues the player for a new partner.
+        A waiting player has to call it at least every `lobby_timeout` seconds (else the player is dropped).
+
+        Parameters:
+            player_id (str):    Unique ID of the player
+
+        Returns:
+            str:    ID of the game of the player (None if still waiting)
+        """
+        player_id = str(player_id)
+        with self._lock:
+            game_id = self._assigned.get(player_id)
+            if game_id is not None:
+                entry = self.games.get(game_id)
+                if entry is not None and not self._is_finished(entry[0]):
+                    return game_id
+                del self._assigned[player_id]       # game is over or was evicted -> queue again
+
+            now = time.monotonic()
+            if player_id in self._waiting:
+                self._waiting[player_id] = now      # renewed, keeps its place in the queue
+            # drop players who stopped asking for a partner (e.g. disconnected clients)
+            stale = [waiting_id for waiting_id, seen in self._waiting.items() if now - seen >= self.lobby_timeout]
+            for waiting_id in stale:
+                del self._waiting[waiting_id]
+
+            opponent = next((other for other in self._waiting if other != player_id), None)
+            if opponent is None:
+                self._waiting[player_id] = now
+                return None
+
+            game_id = self._create_game(None, False, self.geometry)
+            if game_id is None:
+                self._waiting[player_id] = now
+                return None
+
+            del self._waiting[opponent]
+            self._waiting.pop(player_id, None)
+            game = self.games[game_id][0]
+            game.register_player(opponent)
+            game.register_player(player_id)
+            if self.journal is not None:
+                self.journal.record_players(game_id, game)
+            self._assigned[opponent] = game_id
+            self._assigned[player_id] = game_id
+            return game_id
+
+    def restore(self, games:dict) -> None:
+        """
+        Add games which were recovered from the journal (they are not journaled again)
+
+        Parameters:
+            games (dict):   game_id -> Connect4
+        """
+        now = time.monotonic()
+        with self._lock:
+            for game_id, game in games.items():
+                game.metrics = self.metrics
+                self.games[game_id] = [game, now]
+
+    def evict_idle(self) -> int:
+        """
+        Remove all (not pinned) games which were not accessed within idle_timeout
+
+        Returns:
+            int:    Number of evicted games
+        """
+        with self._lock:
+            return self._evict_idle(time.monotonic())
+
+    def remove_game(self, game_id:str) -> bool:
+        """
+        Remove a game from the registry
+
+        Returns:
+            bool:   True if the game existed
+        """
+        with self._lock:
+            return self._remove(game_id)
+
+    """
+    Internal Methods (caller holds the lock)
+    """
+    def _create_game(self, game_id:str, pinned:bool, geometry:tuple) -> str:
+        now = time.monotonic()
+        self._evict_idle(now)
+        if len(self.games) >= self.max_games and not self._evict_one():
+            return None
+
+        if game_id is None:
+            game_id = uuid.uuid4().hex
+        elif game_id in self.games:
+            if pinned:
+                self.pinned.add(game_id)
+            return game_id
+
+        game = Connect4(*geometry, metrics=self.metrics)
+        self.games[game_id] = [game, now]
+        if pinned:
+            self.pinned.add(game_id)
+        if self.journal is not None:
+            self.journal.record_create(game_id, game)
+        return game_id
+
+    def _evict_idle(self, now:float) -> int:
+        expired = []
+        for game_id, (_, last_access) in self.games.items():
+            if now - last_access < self.idle_timeout:
+                break                               # LRU order: all following games are newer
+            if game_id not in self.pinned:
+                expired.append(game_id)
+        for game_id in expired:
+            self._remove(game_id)
+        return len(expired)
+
+    def _evict_one(self) -> bool:
+        """ Make room for one game: evict the least recently used finished game (idle games are gone already) """
+        for game_id, (game, _) in self.games.items():
+            if game_id not in self.pinned and self._is_finished(game):
+                return self._remove(game_id)
+        return False
+
+    @staticmethod
+    def _is_finished(game:Connect4) -> bool:
+        return game.winner is not None or game.turn_number >= game.board_width * game.board_height
+
+    def _remove(self, game_id:str) -> bool:
+        entry = self.games.pop(game_id, None)
+        if entry is None:
+            return False
+        self.pinned.discard(game_id)
+        if self.journal is not None:
+            self.journal.record_remove(game_id)
+        for player_id in entry[0].players:
+            if player_id is not None and self._assigned.get(str(player_id)) == game_id:
+                del self._assigned[str(player_id)]
+        return True
@@ -0,0 +1,345 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from game import Connect4
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id     TEXT NOT NULL,
+    kind        TEXT NOT NULL,          -- 'create' | 'register' | 'move'
+    number      INTEGER,                -- player index (register) / turn number (move)
+    value       TEXT                    -- board geometry JSON (create) / player ID (register) / column (move)
+);
+CREATE INDEX IF NOT EXISTS events_by_game ON events (game_id, seq);
+CREATE TABLE IF NOT EXISTS snapshots (
+    game_id     TEXT PRIMARY KEY,
+    state       TEXT NOT NULL           -- JSON of Connect4.to_snapshot()
+);
+CREATE TABLE IF NOT EXISTS archive (
+    game_id     TEXT PRIMARY KEY,
+    player_x    TEXT,
+    player_o    TEXT,
+    result      TEXT NOT NULL,          -- 'X' | 'O' | 'draw'
+    finished    INTEGER NOT NULL,       -- unix time (seconds)
+    width       INTEGER NOT NULL,
+    height      INTEGER NOT NULL,
+    moves       BLOB NOT NULL,          -- one byte (column) per move
+    win_length  INTEGER NOT NULL DEFAULT 4
+);
+CREATE INDEX IF NOT EXISTS archive_by_x ON archive (player_x, finished);
+CREATE INDEX IF NOT EXISTS archive_by_o ON archive (player_o, finished);
+CREATE INDEX IF NOT EXISTS archive_by_result ON archive (result, finished);
+CREATE INDEX IF NOT EXISTS archive_by_date ON archive (finished);
+"""
+ARCHIVE_COLUMNS = "game_id, player_x, player_o, result, finished, width, height, moves, win_length"
+
+
+def archive_row(row:tuple) -> dict:
+    """ Convert a row of the archive table (ARCHIVE_COLUMNS) to a dict """
+    game_id, player_x, player_o, result, finished, width, height, moves, win_length = row
+    return {
+        "game_id": game_id,
+        "players": [player_x, player_o],
+        "result": result,
+        "finished": finished,
+        "width": width,
+        "height": height,
+        "win_length": win_length,
+        "moves": list(moves),
+    }
+
+
+class GameJournal:
+    """
+    Append-only Journal of all games of a Server (SQLite)
+
+        Every registration and accepted move is appended as one event. On startup the
+        games are rebuilt by replaying the journal (see recover).
+
+        - the request threads only put events into a queue (no disk access on the move path)
+        - one writer thread appends everything that is queued in ONE transaction:
+          many moves share one fsync instead of paying one fsync each
+        - every `snapshot_every` moves the full game is stored as a snapshot and the older
+          events of that game are deleted, so recovery never replays more than a few moves per game
+        - finished games are copied to the archive (one byte per move), which stays
+          queryable after the game itself was evicted (see find_games / get_archived)
+
+        Events carry their turn number (moves) / player index (registrations), so events of
+        the same game may be queued in any order by concurrent requests.
+
+    Attributes:
+        path (str):             SQLite database file
+        snapshot_every (int):   Moves between two snapshots of a game
+    """
+
+    def __init__(self, path:str, snapshot_every:int = 16, batch_size:int = 512) -> None:
+        """
+        Open (or create) a journal
+
+        Parameters:
+            path (str):             SQLite database file
+            snapshot_every (int):   Moves between two snapshots of a game
+            batch_size (int):       Maximum number of queued items written per transaction
+        """
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._journaled:dict = {}               # game_id -> [players journaled, moves journaled]
+        self._queue:queue.Queue = queue.Queue()
+        self._readers = threading.local()       # one read connection per request thread
+
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(archive)")]
+        if "win_length" not in columns:         # archive of an older version (only 4 in a row games)
+            connection.execute("ALTER TABLE archive ADD COLUMN win_length INTEGER NOT NULL DEFAULT 4")
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="GameJournal-writer", daemon=True)
+        self._writer.start()
+
+    def record_create(self, game_id:str, game:Connect4) -> None:
+        """ Journal the creation of an (empty) game and its board geometry """
+        geometry = json.dumps({"width": game.board_width, "height": game.board_height, "win_length": game.win_length})
+        with self._lock:
+            self._journaled.setdefault(game_id, [0, 0])
+            self._queue.put(("event", (game_id, "create", None, geometry)))
+
+    def record_players(self, game_id:str, game:Connect4) -> None:
+        """ Journal all registrations of a game which are not journaled yet """
+        with self._lock:
+            journaled = self._journaled.setdefault(game_id, [0, 0])
+            players = game.players
+            for index in range(journaled[0], len(players)):
+                if players[index] is None:
+                    break
+                self._queue.put(("event", (game_id, "register", index, str(players[index]))))
+                journaled[0] = index + 1
+
+    def record_moves(self, game_id:str, game:Connect4) -> None:
+        """
+        Journal all moves of a game which are not journaled yet
+            (call it after every accepted check_move)
+
+        Parameters:
+            game_id (str):      ID of the game
+            game (Connect4):    The game
+        """
+        moves = game.get_moves()
+        with self._lock:
+            journaled = self._journaled.setdefault(game_id, [0, 0])
+            if len(moves) <= journaled[1]:
+                return                          # a concurrent call journaled them already
+            for turn in range(journaled[1], len(moves)):
+                self._queue.put(("event", (game_id, "move", turn, str(moves[turn]))))
+            if len(moves) // self.snapshot_every > journaled[1] // self.snapshot_every:
+                self._queue.put(("snapshot", (game_id, game.to_snapshot())))
+            journaled[1] = len(moves)
+
+            # a finished game gets no further moves: this is the only call that sees it finished
+            if game.winner is not None or len(moves) == game.board_width * game.board_height:
+                self._archive(game_id, game, moves)
+
+    def record_resign(self, game_id:str, game:Connect4) -> None:
+        """
+        Journal a resigned game (call it after an accepted resign)
+            The snapshot keeps the winner for the recovery, the game goes to the archive.
+
+        Parameters:
+            game_id (str):      ID of the game
+            game (Connect4):    The game
+        """
+        snapshot = game.to_snapshot()
+        with self._lock:
+            self._journaled.setdefault(game_id, [0, 0])
+            self._queue.put(("snapshot", (game_id, snapshot)))
+            self._archive(game_id, game, snapshot["moves"])
+
+    def record_remove(self, game_id:str) -> None:
+        """ Delete all events and the snapshot of a game (the game will not be recovered) """
+        with self._lock:
+            self._journaled.pop(game_id, None)
+            self._queue.put(("remove", game_id))
+
+    def get_archived(self, game_id:str) -> dict:
+        """
+        Get a finished game from the archive
+
+        Parameters:
+            game_id (str):  ID of the game
+
+        Returns:
+            dict:   "game_id", "players", "result", "finished", "width", "height", "moves" (None if not archived)
+        """
+        row = self._reader().execute(f"SELECT {ARCHIVE_COLUMNS} FROM archive WHERE game_id = ?", (game_id,)).fetchone()
+        return archive_row(row) if row is not None else None
+
+    def find_games(self, player_id:str = None, result:str = None, since:int = None, until:int = None,
+                   limit:int = 100) -> list:
+        """
+        Query the archive (newest games first), every filter is optional
+
+        Parameters:
+            player_id (str):    Games this player took part in
+            result (str):       'X', 'O' or 'draw'
+            since (int):        Games finished at or after this unix time
+            until (int):        Games finished before this unix time
+            limit (int):        Maximum number of games
+
+        Returns:
+            list:   Archived games (see get_archived)
+        """
+        conditions, parameters = [], []
+        if player_id is not None:
+            conditions.append("(player_x = ? OR player_o = ?)")
+            parameters += [player_id, player_id]
+        if result is not None:
+            # with a player the (much more selective) player indexes must be used: '+' hides the result index
+            conditions.append("+result = ?" if player_id is not None else "result = ?")
+            parameters.append(result)
+        if since is not None:
+            conditions.append("finished >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("finished < ?")
+            parameters.append(until)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._reader().execute(
+            f"SELECT {ARCHIVE_COLUMNS} FROM archive {where} ORDER BY finished DESC LIMIT ?", parameters + [limit]
+        )
+        return [archive_row(row) for row in rows]
+
+    def flush(self) -> None:
+        """ Block until everything queued so far is written to disk """
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+
+    def close(self) -> None:
+        """ Write all queued events and stop the writer thread """
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def recover(self) -> dict:
+        """
+        Rebuild all journaled games
+            snapshot of a game + replay of its newer events
+
+        Returns:
+            dict:   game_id -> Connect4
+        """
+        connection = self._connect()
+        try:
+            snapshots = connection.execute("SELECT game_id, state FROM snapshots").fetchall()
+            events = connection.execute("SELECT game_id, kind, number, value FROM events ORDER BY seq").fetchall()
+        finally:
+            connection.close()
+
+        games = {game_id: Connect4.from_snapshot(json.loads(state)) for game_id, state in snapshots}
+        registrations, moves, geometries = {}, {}, {}
+        for game_id, kind, number, value in events:
+            games.setdefault(game_id, None)
+            if kind == "create" and value is not None:
+                geometries[game_id] = json.loads(value)
+            elif kind == "register":
+                registrations.setdefault(game_id, []).append((number, value))
+            elif kind == "move":
+                moves.setdefault(game_id, []).append((number, int(value)))
+
+        for game_id, game in games.items():
+            if game is None:
+                geometry = geometries.get(game_id, {})
+                game = games[game_id] = Connect4(geometry.get("width", 8), geometry.get("height", 7),
+                                                 geometry.get("win_length", 4))
+            for index, player_id in sorted(registrations.get(game_id, ())):
+                if game.players[index] is None:
+                    game.register_player(player_id)
+            for turn, column in sorted(moves.get(game_id, ())):
+                if turn == game.turn_number:    # older moves are already part of the snapshot
+                    game.check_move(column, game.players[turn % 2])
+
+        with self._lock:
+            for game_id, game in games.items():
+                self._journaled[game_id] = [sum(player is not None for player in game.players), len(game.get_moves())]
+        return games
+
+    """
+    Internal Methods
+    """
+    def _archive(self, game_id:str, game:Connect4, moves:list) -> None:
+        """ Queue the archive row of a finished game (caller holds the lock) """
+        players = [str(player) for player in game.players]
+        self._queue.put(("archive", (
+            game_id, players[0], players[1], game.winner or "draw", int(time.time()),
+            game.board_width, game.board_height, bytes(moves), game.win_length,
+        )))
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")       # a committed batch survives a power loss
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """ Read connection of the calling thread (WAL: readers never block the writer) """
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._readers.connection = self._connect()
+        return connection
+
+    def _write_loop(self) -> None:
+        """ Writer thread: wait for queued items and write them in batches (one commit per batch) """
+        connection = self._connect()
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            flushed = []
+            with connection:                    # one transaction -> one fsync for the whole batch
+                for item in batch:
+                    if item is None:
+                        running = False
+                        continue
+                    kind, payload = item
+                    if kind == "event":
+                        connection.execute(
+                            "INSERT INTO events (game_id, kind, number, value) VALUES (?, ?, ?, ?)", payload
+                        )
+                    elif kind == "snapshot":
+                        game_id, snapshot = payload
+                        connection.execute(
+                            "INSERT OR REPLACE INTO snapshots (game_id, state) VALUES (?, ?)",
+                            (game_id, json.dumps(snapshot)),
+                        )
+                        # events up to the snapshot are no longer needed (registrations are part of it)
+                        connection.execute(
+                            "DELETE FROM events WHERE game_id = ? AND (kind != 'move' OR number < ?)",
+                            (game_id, len(snapshot["moves"])),
+                        )
+                    elif kind == "archive":
+                        connection.execute(
+                            f"INSERT OR REPLACE INTO archive ({ARCHIVE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            payload,
+                        )
+                    elif kind == "remove":
+                        connection.execute("DELETE FROM events WHERE game_id = ?", (payload,))
+                        connection.execute("DELETE FROM snapshots WHERE game_id = ?", (payload,))
+                    elif kind == "flush":
+                        flushed.append(payload)
+            for done in flushed:
+                done.set()
+        connection.close()
@@ -0,0 +1,154 @@
+import queue
+import threading
+
+
+DIRECTIONS = ("up", "down", "left", "right", "middle")
+REPEATING = ("left", "right")       # directions which repeat while the stick is held
+
+
+class JoystickInput:
+    """
+    Event-driven Input of the SenseHat Joystick
+
+        A daemon thread blocks in stick.wait_for_event() (no polling: the process sleeps
+        until the stick is moved) and puts the cleaned up key presses into a queue.
+        Players take them from the queue with get(), which also just sleeps until a key arrives.
+
+            - debounce:     a second "pressed" of the same direction within `debounce`
+                            seconds is contact bounce and ignored
+            - key repeat:   holding left / right repeats the key after `repeat_delay`
+                            seconds, then every `repeat_interval` seconds
+                            (the stick reports "held" much faster than that)
+
+        Share one JoystickInput between all players using the same SenseHat:
+        two reader threads would steal each other's events.
+
+    Attributes:
+        stick (SenseStick):         Joystick of the SenseHat (sense.stick)
+        debounce (float):           Seconds in which a repeated press is ignored
+        repeat_delay (float):       Seconds a key is held before it repeats
+        repeat_interval (float):    Seconds between two repeats
+    """
+
+    def __init__(self, stick, debounce:float = 0.05, repeat_delay:float = 0.4, repeat_interval:float = 0.15) -> None:
+        """
+        Start reading the joystick
+
+        Parameters:
+            stick (SenseStick):         Joystick of the SenseHat (sense.stick)
+            debounce (float):           Seconds in which a repeated press is ignored
+            repeat_delay (float):       Seconds a key is held before it repeats
+            repeat_interval (float):    Seconds between two repeats
+        """
+        self.stick = stick
+        self.debounce = debounce
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+
+        self._keys:queue.Queue = queue.Queue()
+        self._pressed:dict = {}             # direction -> (time of the press, time of the last key sent)
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="JoystickInput", daemon=True)
+        self._reader.start()
+
+    def get(self, timeout:float = None) -> str:
+        """
+        Wait for the next key (sleeps, no CPU is used while waiting)
+
+        Parameters:
+            timeout (float):    Maximum seconds to wait (None = forever)
+
+        Returns:
+            str:    "up", "down", "left", "right" or "middle" (None on timeout)
+        """
+        try:
+            return self._keys.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def clear(self) -> None:
+        """ Drop all keys which were not read yet (e.g. pressed while the opponent was thinking) """
+        while True:
+            try:
+                self._keys.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self) -> None:
+        """ Stop reading (the reader thread ends with the next joystick event or with the program) """
+        self._closed = True
+
+    def handle(self, direction:str, action:str, timestamp:float) -> str:
+        """
+        Turn one raw joystick event into a key (debounce + key repeat)
+
+        Parameters:
+            direction (str):    Direction of the event
+            action (str):       "pressed", "held" or "released"
+            timestamp (float):  Time of the event (seconds)
+
+        Returns:
+            str:    Direction of the key to send (None if the event is dropped)
+        """
+        if direction not in DIRECTIONS:
+            return None
+
+        if action == "pressed":
+            pressed = self._pressed.get(direction)
+            if pressed is not None and timestamp - pressed[0] < self.debounce:
+                return None
+            self._pressed[direction] = (timestamp, timestamp)
+            return direction
+
+        if action == "held" and direction in REPEATING:
+            pressed = self._pressed.get(direction)
+            if pressed is None:
+                return None
+            first, last = pressed
+            if timestamp - first < self.repeat_delay or timestamp - last < self.repeat_interval:
+                return None
+            self._pressed[direction] = (first, timestamp)
+            return direction
+        return None
+
+    """
+    Internal Methods
+    """
+    def _read_loop(self) -> None:
+        while not self._closed:
+            event = self.stick.wait_for_event()
+            if self._closed:
+                return
+            key = self.handle(event.direction, event.action, event.timestamp)
+            if key is not None:
+                self._keys.put(key)
+
+
+def select_column(joystick:JoystickInput, show_choice, width:int, column:int = None) -> int:
+    """
+    Let the player choose a column with the joystick
+        left / right move the selection, middle (or down) drops the coin
+
+    Parameters:
+        joystick (JoystickInput):   Input of the SenseHat
+        show_choice (callable):     Called with the selected column after every change
+        width (int):                Number of columns
+        column (int):               Column selected at the start (default: middle of the board)
+
+    Returns:
+        int:    Selected column
+    """
+    column = width // 2 if column is None else column
+    joystick.clear()                # keys pressed before it was the player's turn are not meant for this move
+    show_choice(column)
+    while True:
+        key = joystick.get()
+        if key == "left":
+            column = max(0, column - 1)
+        elif key == "right":
+            column = min(width - 1, column + 1)
+        elif key in ("middle", "down"):
+            return column
+        else:
+            continue
+        show_choice(column)
@@ -0,0 +1,73 @@
+BLACK = (0, 0, 0)
+
+
+class LedMatrix:
+    """
+    Shadow Framebuffer of the 8x8 SenseHat LED matrix
+
+        Every write to the SenseHat is slow (on the Pi every call opens the framebuffer
+        device, set_pixels then seeks and writes all 64 pixels one by one) and a full
+        redraw makes the matrix flicker. The matrix therefore remembers what is currently
+        shown and only pushes the difference:
+            - nothing changed     -> no write at all
+            - few changed pixels  -> one set_pixel per changed pixel
+            - many changed pixels -> one batched set_pixels with the whole frame
+
+        Share one LedMatrix between all players using the same SenseHat,
+        otherwise the shadow frame no longer matches what is shown.
+
+    Attributes:
+        sense (SenseHat):           SenseHat (or MockSenseHat) to draw on
+        batch_threshold (int):      From this many changed pixels on, the whole frame is pushed at once
+    """
+
+    def __init__(self, sense, batch_threshold:int = 16) -> None:
+        """
+        Parameters:
+            sense (SenseHat):           SenseHat (or MockSenseHat) to draw on
+            batch_threshold (int):      From this many changed pixels on, the whole frame is pushed at once
+        """
+        self.sense = sense
+        self.batch_threshold = batch_threshold
+        self._shown:list = None                 # what the LEDs show (None: unknown -> next push is a full frame)
+        self._frame:list = [BLACK] * 64         # what they should show
+
+    def __getitem__(self, position:tuple) -> tuple:
+        x, y = position
+        return self._frame[y * 8 + x]
+
+    def __setitem__(self, position:tuple, colour:tuple) -> None:
+        """ Change one pixel of the frame (shown on the next push) """
+        x, y = position
+        self._frame[y * 8 + x] = tuple(colour)
+
+    def fill(self, colour:tuple = BLACK) -> None:
+        """ Change all pixels of the frame (shown on the next push) """
+        self._frame = [tuple(colour)] * 64
+
+    def push(self) -> int:
+        """
+        Show the frame on the LEDs (only the changed pixels are written)
+
+        Returns:
+            int:    Number of changed pixels
+        """
+        if self._shown is None:
+            changed = list(range(64))
+        else:
+            changed = [index for index in range(64) if self._frame[index] != self._shown[index]]
+
+        if not changed:
+            return 0
+        if len(changed) >= self.batch_threshold:
+            self.sense.set_pixels(self._frame)
+        else:
+            for index in changed:
+                y, x = divmod(index, 8)
+                self.sense.set_pixel(x, y, self._frame[index])
+        self._shown = list(self._frame)
+        return len(changed)
+
+    def invalidate(self) -> None:
+        """ The LEDs were changed without this matrix (e.g. show_message): redraw everything on the next push """
+        self._shown = None
@@ -0,0 +1,234 @@
+"""
+Metrics of the Connect4Server (Prometheus text format) and a sampling profiler
+
+    Metrics are plain counters / histograms in memory, every update is a short
+    locked increment: cheap enough to stay enabled in production.
+"""
+import bisect
+import collections
+import sys
+import threading
+import time
+
+
+# Buckets (upper bounds, seconds)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FAST_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+
+class Histogram:
+    """
+    Cumulative Histogram (Prometheus style)
+
+    Attributes:
+        buckets (tuple):    Upper bounds of the buckets (without +Inf)
+        counts (list):      Observations per bucket (last entry: above the largest bound)
+        sum (float):        Sum of all observed values
+        count (int):        Number of observations
+    """
+
+    def __init__(self, buckets:tuple) -> None:
+        self.buckets = tuple(buckets)
+        self.counts:list = [0] * (len(self.buckets) + 1)
+        self.sum:float = 0.0
+        self.count:int = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value:float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> tuple:
+        """ Consistent copy: (cumulative counts per bucket incl. +Inf, sum, count) """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class Metrics:
+    """
+    Registry of all Metrics of one Server
+
+        - counters:     only increase (e.g. moves processed)
+        - gauges:       current value, either set directly or read from a function at scrape time
+        - histograms:   distribution of durations
+
+        Every metric can have labels, given as a tuple of (name, value) pairs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._help:dict = {}                                # name -> (type, help text)
+        self._counters:dict = {}                            # (name, labels) -> value
+        self._gauges:dict = {}                              # (name, labels) -> value or function
+        self._histograms:dict = {}                          # (name, labels) -> Histogram
+
+    def describe(self, name:str, kind:str, help_text:str) -> None:
+        """ Register the type ('counter', 'gauge', 'histogram') and help text of a metric """
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name:str, labels:tuple = (), amount:float = 1) -> None:
+        """ Increase a counter (or a gauge set with set_gauge) """
+        key = (name, labels)
+        with self._lock:
+            if name in self._help and self._help[name][0] == "gauge":
+                self._gauges[key] = self._gauges.get(key, 0) + amount
+            else:
+                self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name:str, value, labels:tuple = ()) -> None:
+        """ Set a gauge to a value or to a function which is called at scrape time """
+        with self._lock:
+            self._gauges[(name, labels)] = value
+
+    def observe(self, name:str, value:float, labels:tuple = (), buckets:tuple = REQUEST_BUCKETS) -> None:
+        """ Add an observation to a histogram (created with `buckets` on first use) """
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(buckets))
+        histogram.observe(value)
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format
+
+        Returns:
+            str:    One line per sample, grouped by metric name
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = dict(self._histograms)
+
+        samples = collections.defaultdict(list)
+        for (name, labels), value in sorted(counters.items()):
+            samples[name].append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), value in sorted(gauges.items(), key=lambda item: item[0]):
+            samples[name].append(f"{name}{_labels(labels)} {_number(value() if callable(value) else value)}")
+        for (name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+            cumulative, total, count = histogram.snapshot()
+            bounds = [_number(bound) for bound in histogram.buckets] + ["+Inf"]
+            for bound, value in zip(bounds, cumulative):
+                samples[name].append(f"{name}_bucket{_labels(labels + (('le', bound),))} {value}")
+            samples[name].append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            samples[name].append(f"{name}_count{_labels(labels)} {count}")
+
+        lines = []
+        for name in sorted(samples):
+            if name in self._help:
+                kind, help_text = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    """
+    Statistical Profiler which can be switched on and off while the server is running
+
+        A daemon thread takes the stacks of all other threads every `interval` seconds
+        (sys._current_frames) and counts them. The code being profiled is not touched:
+        when the profiler is off it costs nothing, when it is on only the sampling thread works.
+
+        The result is in "collapsed stack" format (one line per stack: frames separated by ';'
+        followed by the number of samples), the input format of flame graph tools.
+
+    Attributes:
+        interval (float):   Seconds between two samples
+        samples (int):      Number of samples taken since the last reset
+    """
+
+    def __init__(self, interval:float = 0.005) -> None:
+        self.interval = interval
+        self.samples:int = 0
+        self._stacks:collections.Counter = collections.Counter()
+        self._lock = threading.Lock()
+        self._thread:threading.Thread = None
+        self._running = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self._running.is_set()
+
+    def start(self, interval:float = None) -> None:
+        """ Start sampling (does nothing if already running) """
+        if interval is not None:
+            self.interval = interval
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._sample_loop, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """ Stop sampling (the samples taken so far are kept) """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+    def collapsed(self, limit:int = None) -> str:
+        """
+        Sampled stacks, most frequent first
+
+        Parameters:
+            limit (int):    Only the `limit` most frequent stacks (None: all)
+
+        Returns:
+            str:    "frame;frame;frame count" lines (root frame first)
+        """
+        with self._lock:
+            stacks = self._stacks.most_common(limit)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    """
+    Internal Methods
+    """
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while self._running.is_set():
+            frames = sys._current_frames()
+            stacks = []
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                stacks.append(";".join(reversed(names)))
+            del frames
+            with self._lock:
+                self._stacks.update(stacks)
+                self.samples += 1
+            time.sleep(self.interval)
+
+
+def _labels(labels:tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value:float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
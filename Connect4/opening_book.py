@@ -0,0 +1,212 @@
+"""
+Opening Book: precomputed best moves for the first plies of a game
+
+    File layout (little endian):
+        header:     magic b"C4BK", version, width, height, win length (0 in older books: 4), number of slots (uint32)
+        slots:      hash table of (key uint64, column uint8) records, empty slots have key 0
+                    slot of a key = key % number of slots, collisions go to the next slot
+
+    Positions are stored under a canonical key: a position and its left-right mirror
+    share one record (the stored column belongs to the orientation with the smaller key).
+
+Generate a book with:  python opening_book.py --depth 4 --seconds 0.05 --out opening_book.bin
+"""
+import argparse
+import mmap
+import struct
+import time
+
+from bitboard import Bitboard
+from search import AlphaBetaSearch
+
+
+MAGIC = b"C4BK"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBI")
+RECORD = struct.Struct("<QB")
+
+
+def position_key(boards:tuple, width:int, height:int) -> int:
+    """
+    Unique key of a position: coins of 'X' + all coins + bottom row
+        (adding the bottom row makes every column's filled height part of the key)
+
+    Parameters:
+        boards (tuple):     Bitboards of 'X' and 'O'
+        width (int):        Number of columns
+        height (int):       Number of rows
+
+    Returns:
+        int:    Key (never 0)
+    """
+    stride = height + 1
+    bottom = sum(1 << (col * stride) for col in range(width))
+    return boards[0] + (boards[0] | boards[1]) + bottom
+
+
+def mirror_bits(bits:int, width:int, height:int) -> int:
+    """ Mirror a bitboard left-right (column c becomes column width - 1 - c) """
+    stride = height + 1
+    column_mask = (1 << stride) - 1
+    mirrored = 0
+    for col in range(width):
+        mirrored |= ((bits >> (col * stride)) & column_mask) << ((width - 1 - col) * stride)
+    return mirrored
+
+
+def canonical_key(board:Bitboard) -> tuple[int, bool]:
+    """
+    Key shared by a position and its mirror image
+
+    Returns:
+        tuple:  (key, mirrored) - mirrored is True if the key belongs to the mirror image
+    """
+    width, height = board.width, board.height
+    key = position_key(board.boards, width, height)
+    mirrored = position_key(
+        (mirror_bits(board.boards[0], width, height), mirror_bits(board.boards[1], width, height)), width, height
+    )
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+class OpeningBook:
+    """
+    Read-only Opening Book (memory mapped)
+
+        The file is mapped into memory instead of being read: opening it is instant
+        and all processes using the same book share the pages of the OS file cache.
+        A lookup hashes into the table and reads a few bytes (O(1)).
+
+    Attributes:
+        path (str):     Path of the book file
+        width (int):    Number of columns of the book's board
+        height (int):   Number of rows of the book's board
+        win_length (int):   Number of consecutive coins needed for a win in the book's games
+        slots (int):    Number of slots of the hash table
+    """
+
+    def __init__(self, path:str) -> None:
+        """
+        Open a book file
+
+        Parameters:
+            path (str):     Path of the book file (written by generate_book)
+
+        Raises:
+            ValueError:     If the file is not an opening book
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.width, self.height, self.win_length, self.slots = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not an opening book (version {VERSION})")
+        self.win_length = self.win_length or 4
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return sum(
+            1 for slot in range(self.slots) if RECORD.unpack_from(self._map, HEADER.size + slot * RECORD.size)[0]
+        )
+
+    def lookup(self, board:Bitboard) -> int:
+        """
+        Look up the best move of a position
+
+        Parameters:
+            board (Bitboard):   Position
+
+        Returns:
+            int:    Best column (None if the position is not in the book)
+        """
+        if board.width != self.width or board.height != self.height or board.win_length != self.win_length:
+            return None
+
+        key, mirrored = canonical_key(board)
+        slot = key % self.slots
+        for _ in range(self.slots):
+            stored, column = RECORD.unpack_from(self._map, HEADER.size + slot * RECORD.size)
+            if stored == key:
+                return self.width - 1 - column if mirrored else column
+            if stored == 0:
+                return None
+            slot = (slot + 1) % self.slots
+        return None
+
+
+def generate_book(path:str, depth:int = 4, seconds:float = 0.05, width:int = 8, height:int = 7,
+                  win_length:int = 4) -> int:
+    """
+    Search the best move of every position up to `depth` plies and write the book
+
+    Parameters:
+        path (str):         Output file
+        depth (int):        Positions with up to `depth` coins are stored
+        seconds (float):    Search time per position
+        width (int):        Number of columns
+        height (int):       Number of rows
+        win_length (int):   Number of consecutive coins needed for a win
+
+    Returns:
+        int:    Number of stored positions
+
+    Raises:
+        ValueError:     If the keys of this board size do not fit into the 64 bit records
+    """
+    if width * (height + 1) > 64:
+        raise ValueError(f"A {width}x{height} board does not fit into the 64 bit keys of an opening book")
+    searcher = AlphaBetaSearch(width, height)
+    entries = {}                                    # canonical key -> column (in canonical orientation)
+
+    frontier = [Bitboard(width, height, win_length)]
+    for ply in range(depth + 1):
+        next_frontier = []
+        for board in frontier:
+            key, mirrored = canonical_key(board)
+            if key in entries:
+                continue
+            column = searcher.search(board, seconds).column
+            entries[key] = width - 1 - column if mirrored else column
+
+            if ply < depth:
+                for col in range(width):
+                    if board.can_play(col):
+                        child = board.copy()
+                        player = child.player
+                        child.play(col)
+                        if not child.has_won(player):
+                            next_frontier.append(child)
+        frontier = next_frontier
+
+    slots = max(1, 2 * len(entries))                # load factor 0.5: short probe sequences
+    table = bytearray(HEADER.size + slots * RECORD.size)
+    HEADER.pack_into(table, 0, MAGIC, VERSION, width, height, win_length, slots)
+    for key, column in entries.items():
+        slot = key % slots
+        while RECORD.unpack_from(table, HEADER.size + slot * RECORD.size)[0]:
+            slot = (slot + 1) % slots
+        RECORD.pack_into(table, HEADER.size + slot * RECORD.size, key, column)
+
+    with open(path, "wb") as file:
+        file.write(table)
+    return len(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=4, help="store all positions with up to DEPTH coins")
+    parser.add_argument("--seconds", type=float, default=0.05, help="search time per position")
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--win-length", type=int, default=4)
+    parser.add_argument("--out", default="opening_book.bin")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = generate_book(args.out, depth=args.depth, seconds=args.seconds, width=args.width, height=args.height,
+                          win_length=args.win_length)
+    print(f"Wrote {count} positions to {args.out} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from bitboard import Bitboard
+from search import AlphaBetaSearch, SearchResult, SearchTimeout, WIN_SCORE, INFINITY
+
+
+# State of a worker process (set once by _init_worker)
+_worker_searcher:AlphaBetaSearch = None
+_worker_alpha = None
+
+
+def _init_worker(shared_alpha, width:int, height:int, table_size:int) -> None:
+    """ Create the search engine of a worker process (its transposition table lives as long as the process) """
+    global _worker_searcher, _worker_alpha
+    _worker_searcher = AlphaBetaSearch(width, height, table_size=table_size)
+    _worker_alpha = shared_alpha
+
+
+def _raise_alpha(score:int) -> bool:
+    """ Publish a better root score to all workers, returns True if it was the best so far """
+    with _worker_alpha.get_lock():
+        if score > _worker_alpha.value:
+            _worker_alpha.value = score
+            return True
+    return False
+
+
+def _search_root_move(board:Bitboard, column:int, depth:int, deadline:float) -> tuple:
+    """
+    Search one root move in a worker process
+
+        The opponent's replies are searched one after another. Before every reply the
+        shared alpha (best root score of all workers) is read again, so a good move
+        found by another worker narrows the window here as well.
+
+    Returns:
+        tuple:  (score, nodes, best) -  score is None if the deadline was reached,
+                best is True if the move raised the shared alpha (its score is exact)
+    """
+    searcher = _worker_searcher
+    searcher.nodes = 0
+    searcher.deadline = deadline
+    searcher.table.new_search()
+
+    player = board.player
+    key = searcher.hash(board)
+    bit = board.heights[column]
+    board.play(column)
+    try:
+        if board.has_won(player):
+            score = WIN_SCORE - len(board.moves)
+        elif board.is_full():
+            score = 0
+        elif depth == 1:
+            score = -searcher.evaluate(board)
+        else:
+            key ^= searcher.zobrist[player][bit]
+            opponent = player ^ 1
+            best_reply = -INFINITY
+            for reply in searcher.order:
+                if not board.can_play(reply):
+                    continue
+                reply_beta = -_worker_alpha.value
+                if best_reply >= reply_beta:
+                    break                       # this root move cannot beat the best root move any more
+                reply_score = searcher.score_move(board, reply, depth - 1, best_reply, reply_beta, key, opponent)
+                best_reply = max(best_reply, reply_score)
+            score = -best_reply
+    except SearchTimeout:
+        return None, searcher.nodes, False
+    finally:
+        board.undo()
+
+    return score, searcher.nodes, _raise_alpha(score)
+
+
+class ParallelSearch:
+    """
+    Iterative deepening search with the root moves spread over a process pool
+
+        - every root column (at most one per board column) is searched by one worker
+        - the workers share the alpha bound (best root score so far) through shared memory:
+          a good score found by one worker prunes the searches of the others
+        - the best move of the previous iteration is searched first (alone) to get a good bound early
+
+    Attributes:
+        workers (int):  Number of worker processes
+        nodes (int):    Positions visited in the last search (sum over all workers)
+    """
+
+    def __init__(self, width:int = 8, height:int = 7, workers:int = None, table_size:int = 1 << 18) -> None:
+        """
+        Parameters:
+            width (int):        Number of columns
+            height (int):       Number of rows
+            workers (int):      Number of worker processes (default: number of CPU cores)
+            table_size (int):   Slots of the transposition table of EACH worker
+        """
+        self.width = width
+        self.height = height
+        self.workers = workers or os.cpu_count() or 1
+        self.nodes = 0
+
+        center = (width - 1) / 2
+        self.order = sorted(range(width), key=lambda col: abs(col - center))
+
+        self._alpha = multiprocessing.Value("q", -INFINITY)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._alpha, width, height, table_size),
+        )
+
+    def close(self) -> None:
+        """ Stop the worker processes """
+        self._pool.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "ParallelSearch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def search(self, board:Bitboard, time_budget:float = 1.0, max_depth:int = None) -> SearchResult:
+        """
+        Find the best column for the player to move
+
+        Parameters:
+            board (Bitboard):       Position (not changed)
+            time_budget (float):    Seconds for this move
+            max_depth (int):        Stop after this depth (default: until the board is full)
+
+        Returns:
+            SearchResult:   Best column of the deepest completed iteration
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget
+        self.nodes = 0
+
+        empty = board.width * board.height - len(board.moves)
+        max_depth = empty if max_depth is None else min(max_depth, empty)
+        columns = [col for col in self.order if board.can_play(col)]
+
+        best = SearchResult(columns[0], 0, 0, 0, 0.0)
+        for depth in range(1, max_depth + 1):
+            result = self._search_depth(board, depth, columns, deadline)
+            if result is None:
+                break                               # time is up: keep the last completed iteration
+            column, score = result
+            best = SearchResult(column, score, depth, self.nodes, time.perf_counter() - start)
+            if abs(best.score) >= WIN_SCORE - board.width * board.height:
+                break
+            columns = [column] + [col for col in columns if col != column]
+        best.nodes = self.nodes
+        best.seconds = time.perf_counter() - start
+        return best
+
+    """
+    Internal Methods
+    """
+    def _search_depth(self, board:Bitboard, depth:int, columns:list, deadline:float) -> tuple:
+        """
+        Search all root columns to `depth`
+
+        Returns:
+            tuple:  (best column, score) or None on timeout
+        """
+        with self._alpha.get_lock():
+            self._alpha.value = -INFINITY
+
+        first = self._pool.submit(_search_root_move, board, columns[0], depth, deadline)
+        score, nodes, _ = first.result()
+        self.nodes += nodes
+        if score is None:
+            return None
+        best_column, best_score = columns[0], score
+
+        # scores of the other moves are only exact if they raised the shared alpha, otherwise upper bounds
+        pending = {self._pool.submit(_search_root_move, board, col, depth, deadline): col for col in columns[1:]}
+        timed_out = False
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                column = pending.pop(future)
+                score, nodes, raised = future.result()
+                self.nodes += nodes
+                if score is None:
+                    timed_out = True
+                elif raised and score > best_score:
+                    best_column, best_score = column, score
+        return None if timed_out else (best_column, best_score)
@@ -10,14 +10,16 @@ class Player(ABC):
         icon: The player's icon used in the game. (set during registration)
         board_width (int):  Number of Horizontal Elements 
         board_height (int): Number of Vertical Elements
+        win_length (int):   Number of consecutive coins needed for a win
     """
 
-    def __init__(self) -> None:
+    def __init__(self, board_width:int = 8, board_height:int = 7, win_length:int = 4) -> None:
         self.id = uuid.uuid4()          # Assign a unique ID to the player
         self.icon:str = None            # Icon will be set later during player registration
 
-        self.board_width:int = 8        # Set the width of the board
-        self.board_height:int = 7       # Set the height of the board
+        self.board_width:int = board_width      # Set the width of the board
+        self.board_height:int = board_height    # Set the height of the board
+        self.win_length:int = win_length        # Coins in a row needed for a win
         
     @abstractmethod
     def register_in_game(self) -> str:
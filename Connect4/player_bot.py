@@ -0,0 +1,136 @@
+import random
+import time
+
+from game import Connect4
+from opening_book import OpeningBook
+from player_local import Player_Local
+from search import AlphaBetaSearch, SearchResult, SearchTimeout, WIN_SCORE
+from solver import EndgameSolver
+
+
+SOLVER_SHARE = 0.5          # part of the time budget the endgame solver may use (the search gets the rest)
+
+
+class Player_Bot(Player_Local):
+    """
+    Local Bot Player (autonomous, for the bot competition)
+        Same as Local Player -> but chooses its moves with an alpha-beta search
+        instead of asking for console input
+
+    Attributes:
+        time_budget (float):        Seconds the bot may think per move
+        searcher:                   Search engine (AlphaBetaSearch, or ParallelSearch if workers > 1)
+        book (OpeningBook):         Optional opening book (looked up before searching)
+        solver (EndgameSolver):     Exact solver of the endgame (None if disabled)
+        last_result (SearchResult): Result of the last search (column, score, depth, nodes)
+    """
+
+    def __init__(self, game:Connect4, time_budget:float = 1.0, table_size:int = 1 << 18, workers:int = 1,
+                 book_path:str = None, endgame_threshold:int = 16, solver_path:str = None) -> None:
+        """
+        Initialize a local bot player.
+
+        Parameters:
+            game (Connect4):        Instance of Connect4 game
+            time_budget (float):    Seconds the bot may think per move (keep it below the turn limit)
+            table_size (int):       Number of slots of the transposition table (bounds its memory)
+            workers (int):          Processes searching the root moves in parallel (1 = search in this process)
+            book_path (str):        Opening book file (see opening_book.py), None for no book
+            endgame_threshold (int):    Positions with at most this many empty cells are solved exactly
+                                        instead of searched (0 = no endgame solver)
+            solver_path (str):      File of solved positions (see solver.py): loaded now, saved by close()
+        """
+        super().__init__(game)
+
+        self.time_budget = time_budget
+        if workers > 1:
+            from parallel_search import ParallelSearch      # multiprocessing is only loaded when it is used
+            self.searcher = ParallelSearch(self.board_width, self.board_height, workers=workers, table_size=table_size)
+        else:
+            self.searcher = AlphaBetaSearch(self.board_width, self.board_height, table_size=table_size)
+        self.book = OpeningBook(book_path) if book_path else None
+        self.solver = None
+        if endgame_threshold > 0:
+            self.solver = EndgameSolver(self.board_width, self.board_height, self.win_length,
+                                        threshold=endgame_threshold, path=solver_path)
+        self.last_result:SearchResult = None
+        self._closed = False
+
+    def make_move(self) -> int:
+        """
+        Choose a move by iterative deepening negamax search within the time budget.
+            Positions of the opening book are answered without a search.
+            Endgame positions are solved exactly within SOLVER_SHARE of the time budget
+            (searched as usual in the rest of the budget if the solve takes too long).
+
+        Returns:
+            int: The column chosen by the bot.
+        """
+        start = time.perf_counter()
+        board = self.game.get_bitboard()
+        if self.book is not None:
+            column = self.book.lookup(board)
+            if column is not None and board.can_play(column):
+                self.last_result = SearchResult(column, 0, 0, 0, 0.0)
+                return column
+
+        time_budget = self.time_budget
+        if self.solver is not None and self.solver.can_solve(board):
+            try:
+                solved = self.solver.solve(board, time_budget * SOLVER_SHARE)
+            except SearchTimeout:
+                time_budget = max(0.0, time_budget - (time.perf_counter() - start))
+            else:
+                empty = board.width * board.height - len(board.moves)
+                self.last_result = SearchResult(solved.column, solved.value * WIN_SCORE, empty, solved.nodes,
+                                                solved.seconds)
+                return solved.column
+
+        self.last_result = self.searcher.search(board, time_budget)
+        return self.last_result.column
+
+    def close(self) -> None:
+        """
+        Stop the worker processes of a parallel search and save the solved positions to the solver's file
+            (called by the coordinator when the game is over, only the first call does anything)
+        """
+        if getattr(self, "_closed", True):
+            return
+        self._closed = True
+        if hasattr(self.searcher, "close"):
+            self.searcher.close()
+        if self.solver is not None and self.solver.path:
+            self.solver.save()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def celebrate_win(self) -> None:
+        """
+        Celebration of the Bot
+        """
+        print(f"Bot {self.icon} wins (searched {self.last_result.depth} plies deep).")
+
+
+class Player_Random(Player_Local):
+    """
+    Local Random Player
+        Plays a random legal column (baseline opponent for bots and simulations)
+    """
+
+    def __init__(self, game:Connect4, seed:int = None) -> None:
+        """
+        Parameters:
+            game (Connect4):    Instance of Connect4 game
+            seed (int):         Seed of the random generator (None for a random seed)
+        """
+        super().__init__(game)
+        self.rng = random.Random(seed)
+
+    def make_move(self) -> int:
+        """
+        Returns:
+            int: A random column which is not full.
+        """
+        board = self.game.get_bitboard()
+        return self.rng.choice([col for col in range(self.board_width) if board.can_play(col)])
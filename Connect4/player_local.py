@@ -1,12 +1,18 @@
-
+from typing import TYPE_CHECKING
 
 from game import Connect4
 from player import Player
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class Player_Local(Player):
     """ 
     Local Player (uses Methods of the Game directly).
+
+    Attributes:
+        game (Connect4):    Instance of Connect4 game (shared with the other local player)
     """
 
     def __init__(self, game:Connect4) -> None:
@@ -19,10 +25,9 @@ class Player_Local(Player):
         
        
         """
-        super().__init__()  # Initialize id and icon from the abstract Player class
+        super().__init__(game.board_width, game.board_height, game.win_length)  # board size of the game
 
-       # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        self.game = game
 
     def register_in_game(self) -> str:
         """
@@ -31,8 +36,8 @@ class Player_Local(Player):
         Returns:
             str: The player's icon.
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        self.icon = self.game.register_player(self.id)
+        return self.icon
 
     def is_my_turn(self) -> bool:
         """ 
@@ -41,8 +46,7 @@ class Player_Local(Player):
         Returns:
             bool: True if it's the player's turn, False otherwise.
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        return self.get_game_status()["active_id"] == str(self.id)
 
     def get_game_status(self):
         """
@@ -50,10 +54,20 @@ class Player_Local(Player):
             - who is the active player?
             - is there a winner? if so who?
             - what turn is it?
-      
+
+        Returns:
+            dict:   "active_player", "active_id", "winner", "turn_number"
+        """
+        return self.game.get_status()
+
+    def get_board(self) -> "np.ndarray":
+        """
+        Get the current board of the game.
+
+        Returns:
+            np.ndarray: Rows of the board (top row first), '' for empty spots
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        return self.game.get_board()
 
     def make_move(self) -> int:
         """ 
@@ -62,20 +76,24 @@ class Player_Local(Player):
         Returns:
             int: The column chosen by the player for the move.
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        while True:
+            choice = input(f"Player {self.icon}, choose a column (0-{self.board_width - 1}): ")
+            if choice.strip().isdigit() and 0 <= int(choice) < self.board_width:
+                return int(choice)
+            print("Invalid column, try again.")
 
     def visualize(self) -> None:
         """
         Visualize the current state of the Connect 4 board by printing it to the console.
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
+        print()
+        for row in self.get_board():
+            print("|" + "|".join(cell or " " for cell in row) + "|")
+        print(" " + " ".join(str(col) for col in range(self.board_width)))
 
 
     def celebrate_win(self) -> None:
         """
         Celebration of Local CLI Player
         """
-        # TODO
-        raise NotImplementedError(f"You need to write this code first")
\ No newline at end of file
+        print(f"Player {self.icon} wins! Congratulations!")
\ No newline at end of file
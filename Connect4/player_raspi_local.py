@@ -1,40 +1,72 @@
 import time
-
-from sense_hat import SenseHat
+from typing import TYPE_CHECKING
 
 from game import Connect4
+from joystick import JoystickInput, select_column
+from led_matrix import LedMatrix, BLACK
 from player_local import Player_Local
 
+if TYPE_CHECKING:                   # the SenseHat (or sense_hat_mock.MockSenseHat) is created by the caller
+    from sense_hat import SenseHat
+
+
+PLAYER_COLOURS = {"X": (255, 0, 0), "O": (255, 255, 0)}
+
 
 class Player_Raspi_Local(Player_Local):
     """ 
     Local Raspi Player 
         Same as Local Player -> with some changed methods
             (uses Methods of Game and SenseHat)
+
+        LED layout: the top row shows the column selection, the rows below show the board.
+        Only the cells which changed since the last visualize are drawn (diff of the bitboards),
+        and the LedMatrix only writes the LEDs whose colour actually changed.
+
+    Attributes:
+        sense (SenseHat):       Shared SenseHat instance
+        matrix (LedMatrix):     Shadow framebuffer of the SenseHat (shared by all players of the SenseHat)
+        joystick (JoystickInput):   Joystick input (shared by all players of the SenseHat, started on first use)
+        colour (tuple):         LED colour of the player (set during registration)
     """
 
-    def __init__(self, game:Connect4, **kwargs) -> None:
+    def __init__(self, game:Connect4, sense:"SenseHat" = None, matrix:LedMatrix = None,
+                 joystick:JoystickInput = None) -> None:
         """ 
         Initialize a local Raspi player with a shared SenseHat instance.
 
         Parameters:
-            game (Connect4): Game instance.
-            sense (SenseHat): Shared SenseHat instance for all players. (if SHARED option is used)
+            game (Connect4):        Game instance.
+            sense (SenseHat):       Shared SenseHat instance for all players
+            matrix (LedMatrix):     Shared shadow framebuffer (created for `sense` if not given)
+            joystick (JoystickInput):   Shared joystick input (created for `sense` when it is first needed)
         
         Raises:
-            ValueError: If 'sense' is not provided in kwargs.
+            ValueError: If neither 'sense' nor 'matrix' is provided.
         """
         # Initialize the parent class (Player_Local)
-        super().__init__(**kwargs)
-
-        # Extract the SenseHat instance from kwargs  (only if SHARED instance)
-        # Remove Otherwise
-        try:
-            self.sense: SenseHat = kwargs["sense"]
-        except KeyError:
-            raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseHat instance) attribute")
-
-        # TODO: setup other Raspi stuff here
+        super().__init__(game)
+
+        if matrix is None:
+            if sense is None:
+                raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseHat instance) attribute")
+            matrix = LedMatrix(sense)
+        if self.board_width > 8 or self.board_height > 7:
+            raise ValueError(f"A {self.board_width}x{self.board_height} board does not fit on the 8x8 LED matrix")
+
+        self.sense = matrix.sense
+        self.matrix = matrix
+        self.colour:tuple = None
+        self._joystick = joystick
+        self._column:int = None             # last selected column (the next selection starts there)
+        self._boards:tuple = (0, 0)         # bitboards of the last visualize
+
+    @property
+    def joystick(self) -> JoystickInput:
+        """ Joystick input of the SenseHat (started on first use) """
+        if self._joystick is None:
+            self._joystick = JoystickInput(self.sense.stick)
+        return self._joystick
 
     
     def register_in_game(self):
@@ -45,20 +77,22 @@ class Player_Raspi_Local(Player_Local):
         """
         # first do normal register
         self.icon = super().register_in_game()          # call method of Parent Class (Player_Local)
-
-        # TODO: also set color of the player
-
-        raise NotImplementedError(f"Override register_in_game of Player_Raspi_Locap")
+        self.colour = PLAYER_COLOURS.get(self.icon)
+        return self.icon
 
     
     def visualize_choice(self, column:int)->None:
         """ 
         Visualize the SELECTION process of choosing a column
-            Toggles the LED on the top row of the currently selected column
+            Lights the LED on the top row of the currently selected column
+            (at most 2 LEDs change: the old and the new selection)
 
         Parameters:
             column (int):       potentially selected Column during Selection Process
         """
+        for col in range(self.board_width):
+            self.matrix[col, 0] = self.colour if col == column else BLACK
+        self.matrix.push()
         
 
     def visualize(self) -> None:
@@ -66,24 +100,38 @@ class Player_Raspi_Local(Player_Local):
         Override Visualization of Local Player
             Also Visualize on the Raspi 
         """
-
-        # TODO: visualize Board on raspi
+        boards = self.game.get_bitboards()
+        stride = self.board_height + 1
+        changed = (boards[0] ^ self._boards[0]) | (boards[1] ^ self._boards[1])
+        while changed:
+            bit = changed & -changed
+            column, row = divmod(bit.bit_length() - 1, stride)
+            colour = BLACK
+            for icon, board in zip(self.game.icons, boards):
+                if board & bit:
+                    colour = PLAYER_COLOURS[icon]
+            self.matrix[column, self.board_height - row] = colour
+            changed ^= bit
+        self._boards = boards
+
+        for col in range(self.board_width):
+            self.matrix[col, 0] = BLACK                 # no selection while the board is shown
+        self.matrix.push()
 
         # OPTIONAL: also visualize on CLI
         super().visualize()
 
-        raise NotImplementedError(f" visualize on Raspi not yet implemented")
-
     def make_move(self) -> int:
         """
         Override make_move for Raspberry Pi input using the Sense HAT joystick.
         Uses joystick to move left or right and select a column.
+            Waits for joystick events (no polling): the CPU is idle until the stick is moved.
 
         Returns:
             col (int):  Selected column (0...7)
         """
-        
-        raise NotImplementedError(f"make_move not yet implemented on Player_Raspi_Local")
+        self._column = select_column(self.joystick, self.visualize_choice, self.board_width, self._column)
+        return self._column
     
     
     def celebrate_win(self) -> None:
@@ -91,7 +139,16 @@ class Player_Raspi_Local(Player_Local):
         Celebrate CLI Win of Raspi player
             Override Method of Local Player
         """
-        # TODO: Own Celebration Method on SenseHat
+        for _ in range(3):
+            self.matrix.fill(self.colour)
+            self.matrix.push()                          # whole frame changes: one batched write
+            time.sleep(0.3)
+            self.matrix.fill(BLACK)
+            self.matrix.push()
+            time.sleep(0.3)
+
+        self._boards = (0, 0)                           # draw the final board again
+        self.visualize()
 
         # Optional: also do CLI celebration
         super().celebrate_win()
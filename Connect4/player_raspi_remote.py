@@ -0,0 +1,134 @@
+import time
+from typing import TYPE_CHECKING
+
+from joystick import JoystickInput, select_column
+from led_matrix import LedMatrix, BLACK
+from player_raspi_local import PLAYER_COLOURS
+from player_remote import Player_Remote
+
+if TYPE_CHECKING:                   # the SenseHat (or sense_hat_mock.MockSenseHat) is created by the caller
+    from sense_hat import SenseHat
+
+
+class Player_Raspi_Remote(Player_Remote):
+    """
+    Remote Raspi Player
+        Same as Remote Player -> board on the SenseHat LED matrix, moves with the joystick
+
+        LED layout: the top row shows the column selection, the rows below show the board.
+        Only the cells which changed since the last visualize are drawn (diff of the board
+        string of /state, which itself is only re-sent by the server when the game changed).
+
+    Attributes:
+        sense (SenseHat):           SenseHat instance
+        matrix (LedMatrix):         Shadow framebuffer of the SenseHat
+        joystick (JoystickInput):   Joystick input (started on first use)
+        colour (tuple):             LED colour of the player (set during registration)
+    """
+
+    def __init__(self, api_url:str, game_id:str = None, sense:"SenseHat" = None, matrix:LedMatrix = None,
+                 joystick:JoystickInput = None) -> None:
+        """
+        Initialize a remote Raspi player.
+
+        Parameters:
+            api_url (str):              Address of Server, including Port Bsp: http://10.147.17.27:5000
+            game_id (str):              ID of the game on the server (None for the default game)
+            sense (SenseHat):           SenseHat instance
+            matrix (LedMatrix):         Shadow framebuffer (created for `sense` if not given)
+            joystick (JoystickInput):   Joystick input (created for `sense` when it is first needed)
+
+        Raises:
+            ValueError: If neither 'sense' nor 'matrix' is provided.
+        """
+        super().__init__(api_url, game_id=game_id)
+
+        if matrix is None:
+            if sense is None:
+                raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseHat instance) attribute")
+            matrix = LedMatrix(sense)
+
+        self.sense = matrix.sense
+        self.matrix = matrix
+        self.colour:tuple = None
+        self._joystick = joystick
+        self._column:int = None             # last selected column (the next selection starts there)
+        self._cells:str = None              # board string of the last visualize
+
+    @property
+    def joystick(self) -> JoystickInput:
+        """ Joystick input of the SenseHat (started on first use) """
+        if self._joystick is None:
+            self._joystick = JoystickInput(self.sense.stick)
+        return self._joystick
+
+    def register_in_game(self) -> str:
+        """
+        Register in game
+            Set Player Icon
+            Set Player Color
+
+        Raises:
+            ValueError: If the board of the game does not fit on the 8x8 LED matrix
+        """
+        self.icon = super().register_in_game()
+        if self.board_width > 8 or self.board_height > 7:
+            raise ValueError(f"A {self.board_width}x{self.board_height} board does not fit on the 8x8 LED matrix")
+        self.colour = PLAYER_COLOURS.get(self.icon)
+        return self.icon
+
+    def visualize_choice(self, column:int) -> None:
+        """
+        Visualize the SELECTION process of choosing a column
+            Lights the LED on the top row of the currently selected column
+
+        Parameters:
+            column (int):       potentially selected Column during Selection Process
+        """
+        for col in range(self.board_width):
+            self.matrix[col, 0] = self.colour if col == column else BLACK
+        self.matrix.push()
+
+    def visualize(self) -> None:
+        """
+        Visualize the board on the SenseHat (and on the CLI)
+        """
+        cells = self.get_state()["board"]
+        for index, cell in enumerate(cells):
+            if self._cells is None or self._cells[index] != cell:
+                row, column = divmod(index, self.board_width)
+                self.matrix[column, row + 1] = PLAYER_COLOURS.get(cell, BLACK)
+        self._cells = cells
+
+        for col in range(self.board_width):
+            self.matrix[col, 0] = BLACK                 # no selection while the board is shown
+        self.matrix.push()
+
+        super().visualize()
+
+    def make_move(self) -> int:
+        """
+        Select a column with the SenseHat joystick (left / right, middle to drop the coin)
+            Waits for joystick events (no polling): the CPU is idle until the stick is moved.
+
+        Returns:
+            col (int):  Selected column (0...7)
+        """
+        self._column = select_column(self.joystick, self.visualize_choice, self.board_width, self._column)
+        return self._column
+
+    def celebrate_win(self) -> None:
+        """
+        Celebrate the Win on the SenseHat (and on the CLI)
+        """
+        for _ in range(3):
+            self.matrix.fill(self.colour)
+            self.matrix.push()
+            time.sleep(0.3)
+            self.matrix.fill(BLACK)
+            self.matrix.push()
+            time.sleep(0.3)
+
+        self._cells = None                              # draw the final board again
+        self.visualize()
+        super().celebrate_win()
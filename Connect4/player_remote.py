@@ -0,0 +1,188 @@
+import requests
+
+from player import Player
+
+
+class Player_Remote(Player):
+    """
+    Remote Player (uses the REST API of the Connect4Server).
+
+    Attributes:
+        api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+        game_id (str):      ID of the game on the server (None for the default game)
+        session (requests.Session):     Keep-alive connection pool used for all requests
+    """
+
+    def __init__(self, api_url:str, game_id:str = None) -> None:
+        """
+        Initialize a remote player.
+
+        Parameters:
+            api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+            game_id (str):      ID of the game on the server (None for the default game)
+        """
+        super().__init__()  # Initialize id and icon from the abstract Player class
+
+        self.api_url = api_url.rstrip("/")
+        self.game_id = game_id
+        self.session = requests.Session()       # reuses the TCP connection instead of opening one per request
+
+        self._state:dict = None         # last state received from /state
+        self._state_etag:str = None     # ETag of that state
+
+    @property
+    def game_url(self) -> str:
+        """ Base URL of all endpoints of the game """
+        if self.game_id is None:
+            return f"{self.api_url}/connect4"
+        return f"{self.api_url}/connect4/{self.game_id}"
+
+    def register_in_game(self) -> str:
+        """
+        Register the player in the game and assign the player an icon.
+            The server also tells the board size and win length of the game.
+
+        Returns:
+            str: The player's icon.
+        """
+        response = self.session.post(f"{self.game_url}/register", json={"player_id": str(self.id)})
+        response.raise_for_status()
+        data = response.json()
+        self.icon = data["player_icon"]
+        self._set_geometry(data)
+        return self.icon
+
+    def is_my_turn(self) -> bool:
+        """
+        Check if it is the player's turn.
+
+        Returns:
+            bool: True if it's the player's turn, False otherwise.
+        """
+        return self.get_game_status()["active_id"] == str(self.id)
+
+    def get_game_status(self) -> dict:
+        """
+        Get the game's current status.
+            - who is the active player?
+            - is there a winner? if so who?
+            - what turn is it?
+
+        Returns:
+            dict:   "active_player", "active_id", "winner", "turn_number"
+        """
+        response = self.session.get(f"{self.game_url}/status")
+        response.raise_for_status()
+        return response.json()
+
+    def wait_for_change(self, turn_number:int, timeout:float = 25.0) -> dict:
+        """
+        Long poll the server until the turn number differs from the given one.
+            One request per turn instead of polling the status in a loop.
+
+        Parameters:
+            turn_number (int):  Turn number already seen by the player
+            timeout (float):    Maximum seconds the server holds the request
+
+        Returns:
+            dict:   Game status (same as get_game_status)
+        """
+        response = self.session.get(
+            f"{self.game_url}/wait",
+            params={"turn_number": turn_number, "timeout": timeout},
+            timeout=timeout + 10,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_state(self) -> dict:
+        """
+        Get status and board of the game in one request.
+            The board is fetched as a compact string (one character per cell).
+            If nothing changed since the last call the server answers 304 and the cached state is reused.
+
+        Returns:
+            dict:   Game status plus "version" and "board" (string, ' ' for empty spots)
+        """
+        headers = {"If-None-Match": self._state_etag} if self._state_etag else {}
+        response = self.session.get(f"{self.game_url}/state", params={"board": "string"}, headers=headers)
+        if response.status_code == 304:
+            return self._state
+        response.raise_for_status()
+        self._state = response.json()
+        self._state_etag = response.headers.get("ETag")
+        return self._state
+
+    def get_board(self) -> list:
+        """
+        Get the current board from the server.
+
+        Returns:
+            list:   Rows of the board (top row first), '' for empty spots
+        """
+        cells = self.get_state()["board"]
+        return [
+            [cell.strip() for cell in cells[row * self.board_width:(row + 1) * self.board_width]]
+            for row in range(self.board_height)
+        ]
+
+    def send_move(self, column:int) -> bool:
+        """
+        Send a move to the server.
+
+        Parameters:
+            column (int):   Selected Column
+
+        Returns:
+            bool:   True if the move was legal (and has been made)
+        """
+        response = self.session.post(f"{self.game_url}/check_move", json={"column": column, "player_id": str(self.id)})
+        return response.status_code == 200 and response.json().get("success", False)
+
+    def resign(self) -> bool:
+        """
+        Give up the game on the server (the opponent wins)
+
+        Returns:
+            bool:   True if the server accepted it (the game was still running)
+        """
+        response = self.session.post(f"{self.game_url}/resign", json={"player_id": str(self.id)})
+        return response.status_code == 200 and response.json().get("success", False)
+
+    def make_move(self) -> int:
+        """
+        Prompt the physical player to enter a move via the console.
+
+        Returns:
+            int: The column chosen by the player for the move.
+        """
+        while True:
+            choice = input(f"Player {self.icon}, choose a column (0-{self.board_width - 1}): ")
+            if choice.strip().isdigit() and 0 <= int(choice) < self.board_width:
+                return int(choice)
+            print("Invalid column, try again.")
+
+    def visualize(self) -> None:
+        """
+        Visualize the current state of the Connect 4 board by printing it to the console.
+        """
+        print()
+        for row in self.get_board():
+            print("|" + "|".join(cell or " " for cell in row) + "|")
+        print(" " + " ".join(str(col) for col in range(self.board_width)))
+
+    def celebrate_win(self) -> None:
+        """
+        Celebration of Remote CLI Player
+        """
+        print(f"Player {self.icon} wins! Congratulations!")
+
+
+    """
+    Internal Methods
+    """
+    def _set_geometry(self, data:dict) -> None:
+        """ Take board size and win length from a register response (older servers: keep the defaults) """
+        self.board_width = data.get("board_width", self.board_width)
+        self.board_height = data.get("board_height", self.board_height)
+        self.win_length = data.get("win_length", self.win_length)
@@ -0,0 +1,195 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:                 # optional: pip install Connect4[async]
+    aiohttp = None
+
+from player import Player
+
+
+class Player_Remote_Async(Player):
+    """
+    Remote Player for asyncio (uses the REST API of the Connect4Server).
+
+        Same API as Player_Remote, but every request is a coroutine: one process (one thread)
+        can drive hundreds of players at once. All players may share one aiohttp session,
+        i.e. one pool of keep-alive connections to the server.
+
+    Attributes:
+        api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+        game_id (str):      ID of the game on the server (None for the default game)
+        session (aiohttp.ClientSession):    Connection pool used for all requests
+        strategy (callable):    Chooses the moves: strategy(board) -> column (None: ask on the CLI)
+    """
+
+    def __init__(self, api_url:str, game_id:str = None, session:"aiohttp.ClientSession" = None,
+                 strategy = None) -> None:
+        """
+        Initialize an async remote player.
+
+        Parameters:
+            api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
+            game_id (str):      ID of the game on the server (None for the default game)
+            session (aiohttp.ClientSession):    Shared connection pool (None: the player opens its own on first use)
+            strategy (callable):    strategy(board) -> column, board as returned by get_board (None: ask on the CLI)
+
+        Raises:
+            ImportError:    If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ImportError("Player_Remote_Async requires 'aiohttp' (pip install Connect4[async])")
+        super().__init__()
+
+        self.api_url = api_url.rstrip("/")
+        self.game_id = game_id
+        self.session = session
+        self.strategy = strategy
+        self._own_session = session is None
+
+    @property
+    def game_url(self) -> str:
+        """ Base URL of all endpoints of the game """
+        if self.game_id is None:
+            return f"{self.api_url}/connect4"
+        return f"{self.api_url}/connect4/{self.game_id}"
+
+    async def close(self) -> None:
+        """ Close the session (only if the player opened it itself) """
+        if self._own_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def register_in_game(self) -> str:
+        """
+        Register the player in the game and assign the player an icon.
+            The server also tells the board size and win length of the game.
+
+        Returns:
+            str: The player's icon.
+        """
+        data = await self._request("POST", "register", json={"player_id": str(self.id)})
+        self.icon = data["player_icon"]
+        self._set_geometry(data)
+        return self.icon
+
+    async def is_my_turn(self) -> bool:
+        """
+        Check if it is the player's turn.
+
+        Returns:
+            bool: True if it's the player's turn, False otherwise.
+        """
+        return (await self.get_game_status())["active_id"] == str(self.id)
+
+    async def get_game_status(self) -> dict:
+        """
+        Get the game's current status.
+
+        Returns:
+            dict:   "active_player", "active_id", "winner", "turn_number"
+        """
+        return await self._request("GET", "status")
+
+    async def wait_for_change(self, turn_number:int, timeout:float = 25.0) -> dict:
+        """
+        Long poll the server until the turn number differs from the given one.
+
+        Parameters:
+            turn_number (int):  Turn number already seen by the player
+            timeout (float):    Maximum seconds the server holds the request
+
+        Returns:
+            dict:   Game status (same as get_game_status)
+        """
+        return await self._request(
+            "GET", "wait", params={"turn_number": turn_number, "timeout": timeout},
+            timeout=aiohttp.ClientTimeout(total=timeout + 10),
+        )
+
+    async def get_board(self) -> list:
+        """
+        Get the current board from the server.
+
+        Returns:
+            list:   Rows of the board (top row first), '' for empty spots
+        """
+        cells = (await self._request("GET", "board"))["board"]
+        return [cells[row * self.board_width:(row + 1) * self.board_width] for row in range(self.board_height)]
+
+    async def get_status_and_board(self) -> tuple[dict, list]:
+        """
+        Fetch status and board concurrently (two requests in flight on two pooled connections)
+
+        Returns:
+            tuple:  (status, board)
+        """
+        return await asyncio.gather(self.get_game_status(), self.get_board())
+
+    async def send_move(self, column:int) -> bool:
+        """
+        Send a move to the server.
+
+        Parameters:
+            column (int):   Selected Column
+
+        Returns:
+            bool:   True if the move was legal (and has been made)
+        """
+        data = await self._request(
+            "POST", "check_move", json={"column": column, "player_id": str(self.id)}, check=False
+        )
+        return data.get("success", False)
+
+    async def make_move(self, board:list = None) -> int:
+        """
+        Choose a move: by the strategy, else the physical player is asked on the CLI.
+
+        Parameters:
+            board (list):   Current board (fetched if None and a strategy needs it)
+
+        Returns:
+            int: The column chosen by the player for the move.
+        """
+        if self.strategy is not None:
+            return self.strategy(board if board is not None else await self.get_board())
+
+        while True:
+            # input() blocks: run it in a thread so the other players keep running
+            choice = await asyncio.to_thread(input, f"Player {self.icon}, choose a column (0-{self.board_width - 1}): ")
+            if choice.strip().isdigit() and 0 <= int(choice) < self.board_width:
+                return int(choice)
+            print("Invalid column, try again.")
+
+    def visualize(self, board:list = None) -> None:
+        """
+        Print a board to the console (fetch it with get_board first)
+        """
+        print()
+        for row in board or []:
+            print("|" + "|".join(cell or " " for cell in row) + "|")
+        print(" " + " ".join(str(col) for col in range(self.board_width)))
+
+    def celebrate_win(self) -> None:
+        """
+        Celebration of Remote CLI Player
+        """
+        print(f"Player {self.icon} wins! Congratulations!")
+
+    """
+    Internal Methods
+    """
+    async def _request(self, method:str, endpoint:str, check:bool = True, **kwargs) -> dict:
+        """ Send one request to an endpoint of the game, returns the JSON body """
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        async with self.session.request(method, f"{self.game_url}/{endpoint}", **kwargs) as response:
+            if check:
+                response.raise_for_status()
+            return await response.json()
+
+    def _set_geometry(self, data:dict) -> None:
+        """ Take board size and win length from a register response (older servers: keep the defaults) """
+        self.board_width = data.get("board_width", self.board_width)
+        self.board_height = data.get("board_height", self.board_height)
+        self.win_length = data.get("win_length", self.win_length)
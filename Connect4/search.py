@@ -0,0 +1,337 @@
+import random
+import time
+from dataclasses import dataclass
+
+from bitboard import Bitboard
+
+
+WIN_SCORE = 1_000_000       # score of a win, minus the number of coins on the board (faster wins are better)
+INFINITY = 10 * WIN_SCORE
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """ Raised inside the search when the time budget of a move is used up """
+
+
+@dataclass
+class SearchResult:
+    """
+    Result of a search
+
+    Attributes:
+        column (int):   Best column found
+        score (int):    Score for the player to move (> 0 is good, +-WIN_SCORE range means a forced result)
+        depth (int):    Deepest fully searched depth
+        nodes (int):    Number of visited positions
+        seconds (float): Time used
+    """
+    column: int
+    score: int
+    depth: int
+    nodes: int
+    seconds: float
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of already searched positions (keyed by Zobrist hash)
+
+        - memory is bounded: `size` slots, a position is stored at slot (key % size)
+        - eviction policy on collisions: an entry of an older search or a shallower
+          (or equal) depth is replaced, a deeper entry of the current search is kept
+
+    Attributes:
+        size (int):         Number of slots (power of 2)
+        generation (int):   Number of the current search (entries of older searches are evicted first)
+    """
+
+    __slots__ = ("size", "mask", "entries", "generation")
+
+    def __init__(self, size:int = 1 << 18) -> None:
+        """
+        Parameters:
+            size (int):     Number of slots (rounded up to a power of 2)
+        """
+        self.size = 1 << max(0, size - 1).bit_length()
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """ Mark all stored entries as old (they are still used, but replaced first) """
+        self.generation += 1
+
+    def get(self, key:int) -> tuple:
+        """
+        Returns:
+            tuple:  (key, depth, flag, score, column, generation) or None if the position is not stored
+        """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key:int, depth:int, flag:int, score:int, column:int) -> None:
+        index = key & self.mask
+        old = self.entries[index]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.entries[index] = (key, depth, flag, score, column, self.generation)
+
+
+class AlphaBetaSearch:
+    """
+    Iterative deepening Negamax search with alpha-beta pruning
+
+        - center-first move ordering (best move of the transposition table first)
+        - Zobrist-hashed transposition table with bounded size
+        - stops when the time budget of the move is used up and returns
+          the best move of the deepest completed iteration
+
+    Attributes:
+        width (int):                Number of columns
+        height (int):               Number of rows
+        table (TranspositionTable): Positions searched so far (kept between moves)
+        nodes (int):                Positions visited in the current search
+        deadline (float):           time.perf_counter() value at which the current search stops
+    """
+
+    def __init__(self, width:int = 8, height:int = 7, table_size:int = 1 << 18, seed:int = 4) -> None:
+        """
+        Parameters:
+            width (int):        Number of columns
+            height (int):       Number of rows
+            table_size (int):   Number of slots of the transposition table
+            seed (int):         Seed of the Zobrist keys
+        """
+        self.width = width
+        self.height = height
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+
+        stride = height + 1
+        rng = random.Random(seed)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(width * stride)] for _ in range(2)]
+
+        center = (width - 1) / 2
+        self.order = sorted(range(width), key=lambda col: abs(col - center))
+        self.bottom_mask = sum(1 << (col * stride) for col in range(width))
+        self.board_mask = self.bottom_mask * ((1 << height) - 1)
+        self.center_mask = sum(((1 << height) - 1) << (col * stride) for col in self.order[:2])
+
+        self.deadline = 0.0
+
+    def hash(self, board:Bitboard) -> int:
+        """
+        Zobrist hash of a position (XOR of the keys of all coins)
+
+        Returns:
+            int:    64 bit hash
+        """
+        key = 0
+        for player in (0, 1):
+            bits = board.boards[player]
+            while bits:
+                low = bits & -bits
+                key ^= self.zobrist[player][low.bit_length() - 1]
+                bits ^= low
+        return key
+
+    def search(self, board:Bitboard, time_budget:float = 1.0, max_depth:int = None) -> SearchResult:
+        """
+        Find the best column for the player to move
+
+        Parameters:
+            board (Bitboard):       Position (not changed)
+            time_budget (float):    Seconds for this move
+            max_depth (int):        Stop after this depth (default: until the board is full)
+
+        Returns:
+            SearchResult:   Best column of the deepest completed iteration
+        """
+        start = time.perf_counter()
+        self.deadline = start + time_budget
+        self.nodes = 0
+        self.table.new_search()
+
+        board = board.copy()
+        key = self.hash(board)
+        empty = board.width * board.height - len(board.moves)
+        max_depth = empty if max_depth is None else min(max_depth, empty)
+        legal = [col for col in self.order if board.can_play(col)]
+
+        best = SearchResult(legal[0], 0, 0, 0, 0.0)
+        for depth in range(1, max_depth + 1):
+            try:
+                score, column = self.search_root(board, depth, -INFINITY, INFINITY, key, legal)
+            except SearchTimeout:
+                break
+            best = SearchResult(column, score, depth, self.nodes, time.perf_counter() - start)
+            if abs(score) >= WIN_SCORE - board.width * board.height:
+                break                               # forced win / loss found
+        best.nodes = self.nodes
+        best.seconds = time.perf_counter() - start
+        return best
+
+    def search_root(self, board:Bitboard, depth:int, alpha:int, beta:int, key:int, columns:list) -> tuple[int, int]:
+        """
+        Search all given root columns to a fixed depth
+
+        Returns:
+            tuple:  (best score, best column)
+        """
+        entry = self.table.get(key)
+        if entry is not None and entry[4] in columns:
+            columns = [entry[4]] + [col for col in columns if col != entry[4]]
+
+        player = board.player
+        alpha_orig = alpha
+        best_score, best_column = -INFINITY, columns[0]
+        for column in columns:
+            score = self.score_move(board, column, depth, alpha, beta, key, player)
+            if score > best_score:
+                best_score, best_column = score, column
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        flag = UPPER_BOUND if best_score <= alpha_orig else LOWER_BOUND if best_score >= beta else EXACT
+        self.table.store(key, depth, flag, best_score, best_column)
+        return best_score, best_column
+
+    def score_move(self, board:Bitboard, column:int, depth:int, alpha:int, beta:int, key:int, player:int) -> int:
+        """
+        Score of playing `column` for `player` (searched to depth - 1 below it)
+        """
+        bit = board.heights[column]
+        board.play(column)
+        try:
+            if board.has_won(player):
+                return WIN_SCORE - len(board.moves)
+            return -self._negamax(board, depth - 1, -beta, -alpha, key ^ self.zobrist[player][bit])
+        finally:
+            board.undo()
+
+    def evaluate(self, board:Bitboard) -> int:
+        """ Heuristic score for the player to move: open threats and center coins """
+        player = board.player
+        mine, theirs = board.boards[player], board.boards[player ^ 1]
+        mask = mine | theirs
+        length = board.win_length
+        score = 8 * (self._threats(mine, mask, length).bit_count() - self._threats(theirs, mask, length).bit_count())
+        score += (mine & self.center_mask).bit_count() - (theirs & self.center_mask).bit_count()
+        return score
+
+    """
+    Internal Methods
+    """
+    def _negamax(self, board:Bitboard, depth:int, alpha:int, beta:int, key:int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return self.evaluate(board)
+
+        alpha_orig = alpha
+        tt_column = None
+        entry = self.table.get(key)
+        if entry is not None:
+            tt_column = entry[4]
+            if entry[1] >= depth:
+                flag, value = entry[2], entry[3]
+                if flag == EXACT:
+                    return value
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        player = board.player
+        boards, heights, moves = board.boards, board.heights, board.moves
+        zobrist = self.zobrist[player]
+        top = board.height
+
+        # a move that wins at once needs no search
+        for column in self.order:
+            if board.can_play(column):
+                boards[player] |= 1 << heights[column]
+                won = board.has_won(player)
+                boards[player] ^= 1 << heights[column]
+                if won:
+                    return WIN_SCORE - len(moves) - 1
+
+        order = self.order if tt_column is None else [tt_column] + [c for c in self.order if c != tt_column]
+        best_score, best_column = -INFINITY, None
+        for column in order:
+            bit = heights[column]
+            if bit >= column * (top + 1) + top:
+                continue                            # column is full
+            board.play(column)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, key ^ zobrist[bit])
+            board.undo()
+
+            if score > best_score:
+                best_score, best_column = score, column
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(key, depth, flag, best_score, best_column)
+        return best_score
+
+    def _threats(self, position:int, mask:int, length:int = 4) -> int:
+        """ Empty cells that would complete `length` in a row for the coins in `position` """
+        return threat_cells(position, self.board_mask ^ mask, self.height, length)
+
+
+def threat_cells(position:int, free:int, height:int, length:int = 4) -> int:
+    """
+    Cells of `free` that would complete `length` in a row for the coins in `position` (layout of Bitboard)
+
+    Parameters:
+        position (int): Coins of one player
+        free (int):     Empty cells of the board
+        height (int):   Number of rows
+        length (int):   Number of consecutive coins needed for a win
+
+    Returns:
+        int:    Mask of the winning cells (gravity is not checked: a cell may still be unreachable)
+    """
+    h = height
+    if length == 4:
+        threats = (position << 1) & (position << 2) & (position << 3)     # vertical
+        for shift in (h + 1, h, h + 2):
+            pair = (position << shift) & (position << 2 * shift)
+            threats |= pair & (position << 3 * shift)
+            threats |= pair & (position >> shift)
+            pair = (position >> shift) & (position >> 2 * shift)
+            threats |= pair & (position << shift)
+            threats |= pair & (position >> 3 * shift)
+        return threats & free
+
+    # any win length: the empty cell may be at any of the `length` places of a line
+    threats = 0
+    for shift in (1, h + 1, h + 2, h):
+        for gap in range(length):
+            cells = -1
+            for place in range(length):
+                offset = (place - gap) * shift         # coin needed at (empty cell + offset)
+                if offset > 0:
+                    cells &= position >> offset
+                elif offset < 0:
+                    cells &= position << -offset
+            threats |= cells
+    return threats & free
@@ -0,0 +1,114 @@
+"""
+Stand-in for the SenseHat LED matrix and joystick (to run and measure the Raspi players off-device)
+
+    Same pixel methods as sense_hat.SenseHat, the pixels are only kept in memory.
+    Every write to the framebuffer is counted:
+        - calls:    number of framebuffer writes (set_pixel / set_pixels / clear)
+        - writes:   number of LEDs written (1 per set_pixel, 64 per set_pixels / clear)
+
+    The joystick (sense.stick) is fed by push() instead of the hardware.
+"""
+import queue
+import time
+from collections import namedtuple
+
+BLACK = (0, 0, 0)
+
+InputEvent = namedtuple("InputEvent", ("timestamp", "direction", "action"))    # same as sense_hat.stick.InputEvent
+
+
+class MockStick:
+    """ SenseStick Mock: events are queued by push() and read with wait_for_event() / get_events() """
+
+    def __init__(self) -> None:
+        self._events:queue.Queue = queue.Queue()
+
+    def push(self, direction:str, action:str = "pressed", timestamp:float = None) -> None:
+        """ Simulate a joystick event """
+        self._events.put(InputEvent(time.time() if timestamp is None else timestamp, direction, action))
+
+    def press(self, direction:str) -> None:
+        """ Simulate a short press (pressed + released) """
+        self.push(direction, "pressed")
+        self.push(direction, "released")
+
+    def wait_for_event(self, emptybuffer:bool = False) -> InputEvent:
+        """ Block until the next event """
+        if emptybuffer:
+            self.get_events()
+        return self._events.get()
+
+    def get_events(self) -> list:
+        """ All events since the last call (does not block) """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class MockSenseHat:
+    """
+    SenseHat Mock (8x8 LED matrix)
+
+    Attributes:
+        pixels (list):      64 (r, g, b) tuples, index = y * 8 + x
+        calls (int):        Number of framebuffer writes
+        writes (int):       Number of LEDs written
+        low_light (bool):   Dimmed LEDs (no effect)
+        rotation (int):     Rotation of the matrix (no effect)
+        stick (MockStick):  Joystick
+    """
+
+    def __init__(self) -> None:
+        self.stick = MockStick()
+        self.pixels:list = [BLACK] * 64
+        self.calls:int = 0
+        self.writes:int = 0
+        self.low_light:bool = False
+        self.rotation:int = 0
+
+    def reset_counters(self) -> None:
+        self.calls = 0
+        self.writes = 0
+
+    def set_pixel(self, x:int, y:int, *pixel) -> None:
+        """ Set one LED, the colour is given as (r, g, b) or r, g, b """
+        if not (0 <= x < 8 and 0 <= y < 8):
+            raise ValueError("X and Y position must be between 0 and 7")
+        self.pixels[y * 8 + x] = self._colour(pixel)
+        self.calls += 1
+        self.writes += 1
+
+    def get_pixel(self, x:int, y:int) -> tuple:
+        return self.pixels[y * 8 + x]
+
+    def set_pixels(self, pixel_list:list) -> None:
+        """ Set all 64 LEDs at once """
+        if len(pixel_list) != 64:
+            raise ValueError("Pixel lists must have 64 elements")
+        self.pixels = [tuple(pixel) for pixel in pixel_list]
+        self.calls += 1
+        self.writes += 64
+
+    def get_pixels(self) -> list:
+        return list(self.pixels)
+
+    def clear(self, *colour) -> None:
+        self.set_pixels([self._colour(colour) if colour else BLACK] * 64)
+
+    def show_message(self, text_string:str, scroll_speed:float = 0.1, text_colour:tuple = (255, 255, 255),
+                     back_colour:tuple = BLACK) -> None:
+        """ Scrolling text: one full frame per character (the text itself is not rendered) """
+        for _ in text_string:
+            self.set_pixels([tuple(back_colour)] * 64)
+
+    """
+    Internal Methods
+    """
+    @staticmethod
+    def _colour(pixel:tuple) -> tuple:
+        if len(pixel) == 1:
+            pixel = pixel[0]
+        return tuple(pixel)
@@ -1,32 +1,89 @@
 import uuid
+import sys
+import math
+import time
+import signal
+import argparse
+import threading
 
 import socket                                               # to get own IP
-from flask import Flask, request, jsonify                   # for api
+from flask import Flask, request, jsonify, g                # for api
 from flask_swagger_ui import get_swaggerui_blueprint        # for swagger documentation
 
 
 # local includes
-# from game import Connect4
+from game import Connect4
+from bitboard import Bitboard
+from game_registry import GameRegistry
+from game_store import GameJournal
+from metrics import Metrics, SamplingProfiler, FAST_BUCKETS
+from search import SearchTimeout
+from solver import EndgameSolver, SolverBusy, VALUE_NAMES
+
+
+DEFAULT_GAME_ID = "default"     # game used by the endpoints without a game ID
+MAX_WAIT_TIMEOUT = 60.0         # upper bound (seconds) a long-poll request is held open
+BOARD_ENCODINGS = ("list", "string", "bits")
+MAX_BOARD_SIZE = 20             # upper bound of the width / height of a game created through the API
+ANALYZE_TIME_LIMIT = 2.0        # upper bound (seconds) of solving one position for /connect4/analyze
+ANALYZE_WAIT = 0.5              # seconds an analysis waits for a running one of the same board size
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
 
 
 class Connect4Server:
     """
     Game Server
         Runs on Localhost
+        Hosts many games at once (keyed by game ID)
     
     Attributes
-        game (Connect4):    Local Instance of Connect4 Game (with all game rules)
-        app (Flask):        Web Server Instance
+        games (GameRegistry):   All hosted Connect4 Games (with all game rules)
+        game (Connect4):        Default Game (used by the /connect4/<method> endpoints)
+        journal (GameJournal):  Move journal the games are recovered from (None if not persistent)
+        metrics (Metrics):      Request / game metrics served on /metrics (None if disabled)
+        profiler (SamplingProfiler):    Sampling profiler, switched on and off with POST /metrics/profiler
+        solvers (dict):         Endgame solver per board geometry (width, height, win length), used by /connect4/analyze
+        suggester (SuggestionBatcher):  Batched move suggestions of /connect4/suggest (created on first use)
+        app (Flask):            Web Server Instance
 
     """
-    def __init__(self):
+    def __init__(self, max_games:int = 1000, idle_timeout:float = 1800.0, journal_path:str = None,
+                 metrics:bool = True, board_width:int = 8, board_height:int = 7, win_length:int = 4,
+                 solver_threshold:int = 16, solver_path:str = None, suggest_window:float = 0.005):
         """
         Create a Connect4 Server on localhost (127.0.0.1)
+        - Recover the games of the journal (if any)
         - Add SWAGGER UI Documentation
         - Expose API Methods
+
+        Parameters:
+            max_games (int):        Maximum number of games held in memory
+            idle_timeout (float):   Seconds after which an idle game is evicted
+            journal_path (str):     SQLite file all games are journaled to (None: games are lost on restart)
+            metrics (bool):         Collect metrics and serve them on /metrics
+            board_width (int):      Columns of the default game and of new games without a size (default 8)
+            board_height (int):     Rows of the default game and of new games without a size (default 7)
+            win_length (int):       Coins in a row needed for a win in those games (default 4)
+            solver_threshold (int): Positions with at most this many empty cells can be analyzed (default 16)
+            solver_path (str):      File of solved positions of the default board size (loaded now, saved on close)
+            suggest_window (float): Seconds /connect4/suggest collects concurrent requests into one batch
         """
 
-        #self.game = Connect4()  # Connect4 game instance
+        self.metrics = Metrics() if metrics else None
+        self.journal = GameJournal(journal_path) if journal_path else None
+        self.games = GameRegistry(max_games=max_games, idle_timeout=idle_timeout, journal=self.journal,
+                                  geometry=(board_width, board_height, win_length), metrics=self.metrics)
+        if self.journal is not None:
+            self.games.restore(self.journal.recover())
+        self.games.create_game(DEFAULT_GAME_ID, pinned=True)
+        self.solver_threshold = solver_threshold
+        self.solvers = {}               # created on first use (games of other sizes get an in-memory cache)
+        if solver_path is not None:
+            self.solvers[self.games.geometry] = EndgameSolver(*self.games.geometry, threshold=solver_threshold,
+                                                              path=solver_path)
+        self.solvers_lock = threading.Lock()
+        self.suggest_window = suggest_window
+        self._suggester = None
         self.app = Flask(__name__)  # Flask app instance
 
         # Swagger UI Configuration
@@ -49,10 +106,64 @@ class Connect4Server:
         # Define API routes within the constructor
         self.setup_routes()
 
+        self.profiler = SamplingProfiler()
+        if self.metrics is not None:
+            self.setup_metrics()
+
+    @property
+    def game(self) -> Connect4:
+        """ Default Game (used by the endpoints without a game ID) """
+        return self.games.get_game(DEFAULT_GAME_ID)
+
+    def solver(self, geometry:tuple) -> EndgameSolver:
+        """ Endgame solver of a board geometry (width, height, win length), shared by all games of that size """
+        with self.solvers_lock:
+            solver = self.solvers.get(geometry)
+            if solver is None:
+                solver = self.solvers[geometry] = EndgameSolver(*geometry, threshold=self.solver_threshold)
+            return solver
+
+    @property
+    def suggester(self):
+        """ Batched move suggestions (numpy is only loaded once the first suggestion is requested) """
+        with self.solvers_lock:
+            if self._suggester is None:
+                from suggest import SuggestionBatcher
+                self._suggester = SuggestionBatcher(window=self.suggest_window)
+            return self._suggester
+
     def setup_routes(self):
         """
         Expose the following Methods
+            Every game method exists twice:
+                /connect4/<method>              -> default game
+                /connect4/<game_id>/<method>    -> game with the given ID
         """
+        def find_game(game_id:str):
+            game = self.games.get_game(game_id)
+            if game is None:
+                return None, (jsonify({"error": f"Unknown game '{game_id}'"}), 404)
+            return game, None
+
+        def read_player_id(data:dict) -> str:
+            try:
+                return str(uuid.UUID(str(data["player_id"])))
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        def read_geometry(data:dict):
+            width, height, win_length = self.games.geometry
+            width = data.get("width", width)
+            height = data.get("height", height)
+            win_length = data.get("win_length", win_length)
+            if not all(isinstance(value, int) and not isinstance(value, bool) for value in (width, height, win_length)):
+                return None, (jsonify({"error": "'width', 'height' and 'win_length' must be integers"}), 400)
+            if not (1 <= width <= MAX_BOARD_SIZE and 1 <= height <= MAX_BOARD_SIZE):
+                return None, (jsonify({"error": f"'width' and 'height' must be between 1 and {MAX_BOARD_SIZE}"}), 400)
+            if not 2 <= win_length <= max(width, height):
+                return None, (jsonify({"error": "'win_length' must be between 2 and the larger board dimension"}), 400)
+            return (width, height, win_length), None
+
         # Overall Description
         @self.app.route('/')
         def index():
@@ -61,44 +172,443 @@ class Connect4Server:
 
 
         # 1. Expose get_status method
-        @self.app.route('/connect4/status', methods=['GET'])
-        def get_status():
-            # TODO: return a jasonified version of the game status
-            pass
+        @self.app.route('/connect4/status', methods=['GET'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/status', methods=['GET'])
+        def get_status(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            return jsonify(game.get_status())
 
 
         # 2. Expose register_player method
-        @self.app.route('/connect4/register', methods=['POST'])
-        def register_player():
-            # TODO Register the player and return the ICON
-            pass
+        @self.app.route('/connect4/register', methods=['POST'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/register', methods=['POST'])
+        def register_player(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            player_id = read_player_id(request.get_json(silent=True) or {})
+            if player_id is None:
+                return jsonify({"error": "Missing or invalid 'player_id'"}), 400
+
+            icon = game.register_player(player_id)
+            if icon is None:
+                return jsonify({"error": "Game is already full"}), 400
+            if self.journal is not None:
+                self.journal.record_players(game_id, game)
+            return jsonify({
+                "player_icon": icon,
+                "board_width": game.board_width,
+                "board_height": game.board_height,
+                "win_length": game.win_length,
+            })
 
 
         # 3. Expose get_board method
-        @self.app.route('/connect4/board', methods=['GET'])
-        def get_board():
-            # TODO correctly return the Board
-            pass
+        @self.app.route('/connect4/board', methods=['GET'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/board', methods=['GET'])
+        def get_board(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            return jsonify({"board": game.get_board().flatten().tolist()})
 
         # 4. Expose move method
-        @self.app.route('/connect4/check_move', methods=['POST'])
-        def check_move():
-            # TODO: make move and return success if made
-            pass
+        @self.app.route('/connect4/check_move', methods=['POST'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/check_move', methods=['POST'])
+        def check_move(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            data = request.get_json(silent=True) or {}
+            player_id = read_player_id(data)
+            column = data.get("column")
+            if player_id is None or not isinstance(column, int) or isinstance(column, bool):
+                return jsonify({"error": "Missing or invalid 'column' / 'player_id'"}), 400
+
+            start = time.perf_counter()
+            accepted = game.check_move(column, player_id)
+            if self.metrics is not None:
+                self.metrics.observe("connect4_check_move_seconds", time.perf_counter() - start, buckets=FAST_BUCKETS)
+                self.metrics.inc("connect4_moves_total", (("result", "accepted" if accepted else "rejected"),))
+            if not accepted:
+                return jsonify({"success": False}), 400
+            if self.journal is not None:
+                self.journal.record_moves(game_id, game)       # only queued: written by the journal's thread
+            return jsonify({"success": True})
+
+
+        # 4a. Give up a game (forfeit): the opponent wins
+        @self.app.route('/connect4/resign', methods=['POST'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/resign', methods=['POST'])
+        def resign(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            player_id = read_player_id(request.get_json(silent=True) or {})
+            if player_id is None:
+                return jsonify({"error": "Missing or invalid 'player_id'"}), 400
+            if not game.resign(player_id):
+                return jsonify({"success": False}), 400
+            if self.journal is not None:
+                self.journal.record_resign(game_id, game)
+            return jsonify({"success": True, "winner": game.winner})
+
+
+        # Combined status + board (versioned, supports If-None-Match and compact boards)
+        @self.app.route('/connect4/state', methods=['GET'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/state', methods=['GET'])
+        def get_state(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            encoding = request.args.get("board", default="list")
+            if encoding not in BOARD_ENCODINGS:
+                return jsonify({"error": f"'board' must be one of {', '.join(BOARD_ENCODINGS)}"}), 400
+
+            # read the version first: a concurrent move can only make the content newer than its tag
+            version = game.version
+            etag = f"{version}-{encoding}"
+            if request.if_none_match.contains(etag):
+                response = self.app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            state = game.get_status()
+            state["version"] = version
+            if encoding == "bits":
+                x_mask, o_mask = game.get_bitboards()
+                state["board"] = {"X": x_mask, "O": o_mask}
+            elif encoding == "string":
+                state["board"] = "".join(cell or " " for cell in game.get_board().flat)
+            else:
+                state["board"] = game.get_board().flatten().tolist()
+
+            response = jsonify(state)
+            response.set_etag(etag)
+            return response
+
+
+        # Long polling: status is returned as soon as the turn number changes
+        @self.app.route('/connect4/wait', methods=['GET'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/wait', methods=['GET'])
+        def wait_for_change(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            turn_number = request.args.get("turn_number", type=int)
+            if turn_number is None:
+                return jsonify({"error": "Missing or invalid 'turn_number'"}), 400
+            timeout = request.args.get("timeout", default=25.0, type=float)
+            if not math.isfinite(timeout):
+                return jsonify({"error": "'timeout' must be a finite number of seconds"}), 400
+            timeout = max(0.0, min(timeout, MAX_WAIT_TIMEOUT))
+
+            game.wait_for_change(turn_number, timeout)
+            return jsonify(game.get_status())
+
+
+        # Exact value of the current board (endgame solver)
+        @self.app.route('/connect4/analyze', methods=['GET'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/analyze', methods=['GET'])
+        def analyze(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            board = game.get_bitboard()
+            status = game.get_status()
+            empty = board.width * board.height - len(board.moves)
+            analysis = {
+                "turn_number": status["turn_number"],
+                "active_player": game.icons[board.player],
+                "empty_cells": empty,
+            }
+            if status["winner"] is not None or not empty:
+                analysis.update(value="loss" if status["winner"] is not None else "draw", best_column=None)
+                return jsonify(analysis)
+
+            solver = self.solver((board.width, board.height, board.win_length))
+            if not solver.can_solve(board):
+                return jsonify({"error": f"Only boards with at most {solver.threshold} empty cells are solved "
+                                         f"({empty} are empty)"}), 400
+            try:
+                result = solver.solve(board, ANALYZE_TIME_LIMIT, wait=ANALYZE_WAIT)
+            except SearchTimeout:
+                return jsonify({"error": "The position could not be solved in time"}), 503
+            except SolverBusy:
+                return jsonify({"error": "The solver is busy, try again later"}), 503
+            analysis.update(value=VALUE_NAMES[result.value], best_column=result.column, nodes=result.nodes,
+                            seconds=result.seconds)
+            return jsonify(analysis)
+
+
+        # Move suggestion (hint button): concurrent requests are evaluated together in one batch
+        @self.app.route('/connect4/suggest', methods=['GET'], defaults={'game_id': DEFAULT_GAME_ID})
+        @self.app.route('/connect4/<game_id>/suggest', methods=['GET'])
+        def suggest(game_id):
+            game, error = find_game(game_id)
+            if error:
+                return error
+            board = game.get_bitboard()
+            status = game.get_status()
+            if status["winner"] is not None or board.is_full():
+                return jsonify({"error": "The game is over"}), 400
+
+            suggestion = self.suggester.suggest(board)
+            if self.metrics is not None:
+                if suggestion.batch_size:
+                    self.metrics.observe("connect4_suggest_batch_size", suggestion.batch_size, buckets=BATCH_BUCKETS)
+                self.metrics.inc("connect4_suggestions_total", (("source", "batch" if suggestion.batch_size else "cache"),))
+            return jsonify({
+                "turn_number": status["turn_number"],
+                "active_player": game.icons[board.player],
+                "column": suggestion.column,
+                "scores": suggestion.scores,
+                "batch_size": suggestion.batch_size,
+            })
+
+
+        # 5. Create a new game
+        @self.app.route('/connect4/games', methods=['POST'])
+        def create_game():
+            geometry, error = read_geometry(request.get_json(silent=True) or {})
+            if error:
+                return error
+            game_id = self.games.create_game(geometry=geometry)
+            if game_id is None:
+                return jsonify({"error": "Server is full"}), 503
+            return jsonify({"game_id": game_id})
 
 
-    def run(self, debug=True, host='0.0.0.0', port=5000):
+        # 5a. Query finished games (archive of the journal)
+        @self.app.route('/connect4/games', methods=['GET'])
+        def find_games():
+            if self.journal is None:
+                return jsonify({"error": "Server runs without a journal (no archive)"}), 404
+            result = request.args.get("result")
+            if result not in (None, "X", "O", "draw"):
+                return jsonify({"error": "'result' must be one of X, O, draw"}), 400
+            limit = request.args.get("limit", default=100, type=int)
+            if limit < 1:
+                return jsonify({"error": "'limit' must be at least 1"}), 400
+            limit = min(limit, 1000)
+            games = self.journal.find_games(
+                player_id=request.args.get("player_id"),
+                result=result,
+                since=request.args.get("since", type=int),
+                until=request.args.get("until", type=int),
+                limit=limit,
+            )
+            return jsonify({"games": games})
+
+
+        # 5b. Board of a running or finished game at any ply
+        @self.app.route('/connect4/games/<game_id>/replay', methods=['GET'])
+        def replay(game_id):
+            game = self.games.get_game(game_id)
+            if game is not None:
+                history = game.to_snapshot()
+                full = len(history["moves"]) == game.board_width * game.board_height
+                history.update(result=game.winner or ("draw" if full else None))
+            elif self.journal is not None:
+                history = self.journal.get_archived(game_id)
+            else:
+                history = None
+            if history is None:
+                return jsonify({"error": f"Unknown game '{game_id}'"}), 404
+
+            moves = history["moves"]
+            ply = request.args.get("ply", default=len(moves), type=int)
+            if not 0 <= ply <= len(moves):
+                return jsonify({"error": f"'ply' must be between 0 and {len(moves)}"}), 400
+
+            icons = self.game.icons
+            board = Bitboard(history["width"], history["height"], history["win_length"])
+            for column in moves[:ply]:
+                board.play(column)
+            last = (ply - 1) % 2
+            return jsonify({
+                "game_id": game_id,
+                "players": history["players"],
+                "width": history["width"],
+                "height": history["height"],
+                "win_length": history["win_length"],
+                "moves": moves,
+                "result": history["result"],
+                "ply": ply,
+                "active_player": icons[ply % 2],
+                "winner": icons[last] if ply and board.has_won(last) else None,
+                "board": board.to_array(icons).flatten().tolist(),
+            })
+
+
+        # 6. Lobby: pair waiting players into a new game
+        @self.app.route('/connect4/lobby', methods=['POST'])
+        def join_lobby():
+            player_id = read_player_id(request.get_json(silent=True) or {})
+            if player_id is None:
+                return jsonify({"error": "Missing or invalid 'player_id'"}), 400
+
+            game_id = self.games.join_lobby(player_id)
+            game = self.games.get_game(game_id) if game_id is not None else None
+            if game is None:
+                return jsonify({"game_id": None, "player_icon": None})
+            return jsonify({"game_id": game_id, "player_icon": game.register_player(player_id)})
+
+
+    def setup_metrics(self):
+        """
+        Instrument all requests and expose
+            /metrics            -> all metrics in Prometheus text format
+            /metrics/profiler   -> GET: sampled stacks (collapsed format), POST: switch the profiler on / off
+
+        Per request only a few locked increments are done (no I/O), so the metrics can stay on in production.
+        The win detection of the games of this server is timed as well (the registry hands the metrics to every game).
+        """
+        metrics = self.metrics
+        metrics.describe("connect4_http_request_duration_seconds", "histogram", "Duration of HTTP requests per endpoint")
+        metrics.describe("connect4_http_responses_total", "counter", "HTTP responses per endpoint and status code")
+        metrics.describe("connect4_http_requests_in_flight", "gauge", "HTTP requests being handled right now")
+        metrics.describe("connect4_check_move_seconds", "histogram", "Duration of Connect4.check_move (incl. waiting for the game lock)")
+        metrics.describe("connect4_win_detection_seconds", "histogram", "Duration of the win detection after a move")
+        metrics.describe("connect4_moves_total", "counter", "Moves processed by check_move")
+        metrics.describe("connect4_games_active", "gauge", "Games held in memory")
+        metrics.describe("connect4_profiler_enabled", "gauge", "1 if the sampling profiler is running")
+        metrics.describe("connect4_suggest_batch_size", "histogram", "Boards evaluated together by /connect4/suggest")
+        metrics.describe("connect4_suggestions_total", "counter", "Suggestions served from a batch or from the cache")
+        metrics.set_gauge("connect4_http_requests_in_flight", 0)
+        metrics.set_gauge("connect4_games_active", lambda: len(self.games))
+        metrics.set_gauge("connect4_profiler_enabled", lambda: int(self.profiler.enabled))
+
+        @self.app.before_request
+        def start_timer():
+            g.request_start = time.perf_counter()
+            metrics.inc("connect4_http_requests_in_flight")
+
+        @self.app.after_request
+        def remember_status(response):
+            g.response_status = response.status_code
+            return response
+
+        @self.app.teardown_request
+        def stop_timer(exception):
+            start = g.pop("request_start", None)
+            if start is None:
+                return
+            endpoint = request.endpoint or "unknown"
+            metrics.inc("connect4_http_requests_in_flight", amount=-1)
+            metrics.observe("connect4_http_request_duration_seconds", time.perf_counter() - start, (("endpoint", endpoint),))
+            metrics.inc("connect4_http_responses_total", (("endpoint", endpoint), ("code", str(g.get("response_status", 500)))))
+
+        @self.app.route('/metrics', methods=['GET'])
+        def get_metrics():
+            return self.app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+        @self.app.route('/metrics/profiler', methods=['GET'])
+        def get_profile():
+            limit = request.args.get("limit", type=int)
+            return self.app.response_class(self.profiler.collapsed(limit), mimetype="text/plain")
+
+        @self.app.route('/metrics/profiler', methods=['POST'])
+        def switch_profiler():
+            data = request.get_json(silent=True) or {}
+            interval = data.get("interval")
+            if interval is not None and not (isinstance(interval, (int, float)) and interval > 0):
+                return jsonify({"error": "'interval' must be a positive number of seconds"}), 400
+            if data.get("reset"):
+                self.profiler.reset()
+            if data.get("enabled") is True:
+                self.profiler.start(interval)
+            elif data.get("enabled") is False:
+                self.profiler.stop()
+            return jsonify({"enabled": self.profiler.enabled, "interval": self.profiler.interval,
+                            "samples": self.profiler.samples})
+
+    def close(self):
+        """ Write all queued journal events and the solved positions to disk (call on shutdown) """
+        if self.journal is not None:
+            self.journal.close()
+        for solver in self.solvers.values():
+            if solver.path is not None:
+                solver.save()
+
+    def create_production_server(self, host='0.0.0.0', port=5000, workers=32, connection_limit=1000):
+        """
+        Create a production WSGI server (waitress) for the app
+            - one process with `workers` threads -> all games live in the same registry
+              (no shared state store or sticky routing needed)
+            - every waiting long-poll request holds one thread: choose `workers` larger
+              than the number of clients waiting at the same time
+            - idle keep-alive connections of pooling clients count against `connection_limit`
+
+        Parameters:
+            host (str):     Interface to listen on
+            port (int):     Port to listen on
+            workers (int):  Number of worker threads
+            connection_limit (int):     Maximum number of open client connections
+
+        Returns:
+            waitress server (call .run() to serve, .close() to stop)
+        """
+        try:
+            from waitress import create_server
+        except ImportError:
+            raise ImportError("Production mode requires 'waitress' (pip install Connect4[production])") from None
+
+        return create_server(self.app, host=host, port=port, threads=workers, connection_limit=connection_limit)
+
+    def run(self, debug=True, host='0.0.0.0', port=5000, production=False, workers=32):
+        """
+        Start the Server
+
+        Parameters:
+            debug (bool):       Flask debug mode (development server only)
+            host (str):         Interface to listen on
+            port (int):         Port to listen on
+            production (bool):  Serve with the multi-threaded production server instead of Flask's development server
+            workers (int):      Number of worker threads in production mode
+        """
         # Get and display the local IP address
         hostname = socket.gethostname()
         local_ip = socket.gethostbyname(hostname)
         print(f"Server is running on {local_ip}:{port}")
 
-        # Start the Flask app
-        self.app.run(debug=debug, host=host, port=port)
+        try:
+            if not production:
+                # Start the Flask app (no reloader: it would open the journal twice)
+                self.app.run(debug=debug, host=host, port=port, threaded=True, use_reloader=self.journal is None)
+                return
+
+            server = self.create_production_server(host=host, port=port, workers=workers)
+            if threading.current_thread() is threading.main_thread():
+                # waitress stops accepting and drains its worker threads on SystemExit / KeyboardInterrupt
+                signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            print(f"Production mode with {workers} workers (Ctrl+C or SIGTERM for graceful shutdown)")
+            server.run()
+        finally:
+            self.close()
 
 
 
 # If you want to run the server directly:
 if __name__ == '__main__':
-    server = Connect4Server()  # Initialize the Connect4Server
-    server.run()               # Start the Flask app
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Connect 4 Server")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--production", action="store_true", help="serve with the production WSGI server")
+    parser.add_argument("--workers", type=int, default=32, help="worker threads in production mode")
+    parser.add_argument("--journal", default=None, help="SQLite file to journal all games to (recovered on restart)")
+    parser.add_argument("--no-metrics", action="store_true", help="do not collect metrics (no /metrics endpoint)")
+    parser.add_argument("--width", type=int, default=8, help="columns of the default game (and of new games)")
+    parser.add_argument("--height", type=int, default=7, help="rows of the default game (and of new games)")
+    parser.add_argument("--win-length", type=int, default=4, help="coins in a row needed for a win")
+    parser.add_argument("--solver-threshold", type=int, default=16, help="most empty cells /connect4/analyze solves")
+    parser.add_argument("--solver-cache", default=None, help="file of solved positions (loaded and saved on shutdown)")
+    parser.add_argument("--suggest-window", type=float, default=0.005, help="seconds /connect4/suggest batches requests")
+    args = parser.parse_args()
+
+    server = Connect4Server(journal_path=args.journal, metrics=not args.no_metrics, board_width=args.width,
+                            board_height=args.height, win_length=args.win_length,
+                            solver_threshold=args.solver_threshold, solver_path=args.solver_cache,
+                            suggest_window=args.suggest_window)  # Initialize the Connect4Server
+    server.run(port=args.port, production=args.production, workers=args.workers)   # Start the server
\ No newline at end of file
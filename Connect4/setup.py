@@ -14,6 +14,10 @@ setup(
         'numpy',                # Numpy for numerical operations
         'sense-hat'             # For the Raspi - Part
     ],
+    extras_require={
+        'production': ['waitress'],     # Multi-threaded WSGI server (Connect4Server.run(production=True))
+        'async': ['aiohttp'],           # Player_Remote_Async / Coordinator_Remote_Async
+    },
     python_requires='>=3.10, <4',
 )
 
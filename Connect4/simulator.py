@@ -0,0 +1,130 @@
+"""
+Headless Self-Play Simulator
+
+    Runs N games between two Player implementations (no visualization, no input)
+    with Coordinator_Local.play_headless, spread over a process pool.
+    The results are streamed to a JSON-lines file, one line per finished game:
+
+        {"game": 17, "x": "player2", "winner": "player1", "winner_icon": "O", "illegal": null,
+         "moves": [3, 4, ...], "move_times": [0.012, ...]}
+
+    The players swap colors every game so both get the first move equally often.
+
+Run with:  python simulator.py --games 1000 --player1 bot:0.01 --player2 random --out results.jsonl
+           (variant boards: --width 9 --height 7 --win-length 4)
+"""
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+
+from coordinator_local import Coordinator_Local
+from player_bot import Player_Bot, Player_Random
+
+
+PLAYER_TYPES = {
+    "bot": Player_Bot,
+    "random": Player_Random,
+}
+
+
+def parse_player(spec:str) -> tuple:
+    """
+    Parse a player spec of the command line
+
+        "random"        -> (Player_Random, {})
+        "bot:0.05"      -> (Player_Bot, {"time_budget": 0.05})
+
+    Returns:
+        tuple:  (Player class, kwargs)
+    """
+    name, _, budget = spec.partition(":")
+    if name not in PLAYER_TYPES:
+        raise argparse.ArgumentTypeError(f"unknown player '{name}' (choose from {', '.join(PLAYER_TYPES)})")
+    kwargs = {"time_budget": float(budget)} if budget else {}
+    return PLAYER_TYPES[name], kwargs
+
+
+def play_game(args:tuple) -> dict:
+    """
+    Play one headless game (runs in a worker process)
+
+    Parameters:
+        args (tuple):   (game number, player1 spec, player2 spec, geometry) - specs are (class, kwargs),
+                        geometry is (width, height, win_length)
+
+    Returns:
+        dict:   Result line of the game
+    """
+    number, player1, player2, geometry = args
+    swapped = number % 2 == 1
+    width, height, win_length = geometry
+    coordinator = Coordinator_Local(players=(player2, player1) if swapped else (player1, player2),
+                                    board_width=width, board_height=height, win_length=win_length)
+    result = coordinator.play_headless()
+
+    names = ("player2", "player1") if swapped else ("player1", "player2")
+    winner = None
+    if result["winner"] is not None:
+        winner = names[coordinator.game.icons.index(result["winner"])]
+    return {
+        "game": number,
+        "x": names[0],
+        "winner": winner,
+        "winner_icon": result["winner"],
+        "illegal": result["illegal"],
+        "moves": result["moves"],
+        "move_times": [round(seconds, 6) for seconds in result["move_times"]],
+    }
+
+
+def simulate(player1:tuple, player2:tuple, n_games:int, out_path:str, workers:int = None,
+             geometry:tuple = (8, 7, 4)) -> dict:
+    """
+    Run n_games games across a process pool and stream the results to out_path (JSON lines)
+
+    Parameters:
+        player1 (tuple):    (Player class, kwargs) of the first player
+        player2 (tuple):    (Player class, kwargs) of the second player
+        n_games (int):      Number of games
+        out_path (str):     JSON-lines output file
+        workers (int):      Worker processes (default: number of CPU cores)
+        geometry (tuple):   (width, height, win_length) of the board (default 8x7, 4 in a row)
+
+    Returns:
+        dict:   Summary: wins of each player, draws, games/sec
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = {"player1": 0, "player2": 0, "draws": 0}
+    jobs = ((number, player1, player2, geometry) for number in range(n_games))
+    chunksize = max(1, min(64, n_games // (workers * 8)))
+
+    start = time.perf_counter()
+    with Pool(workers) as pool, open(out_path, "w") as out:
+        for result in pool.imap_unordered(play_game, jobs, chunksize=chunksize):
+            out.write(json.dumps(result, separators=(",", ":")) + "\n")
+            summary[result["winner"] or "draws"] += 1
+    elapsed = time.perf_counter() - start
+
+    summary["seconds"] = elapsed
+    summary["games_per_sec"] = n_games / elapsed
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--player1", type=parse_player, default="bot:0.01", help="random | bot[:seconds per move]")
+    parser.add_argument("--player2", type=parse_player, default="random", help="random | bot[:seconds per move]")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--win-length", type=int, default=4)
+    parser.add_argument("--out", default="results.jsonl")
+    args = parser.parse_args()
+
+    summary = simulate(args.player1, args.player2, args.games, args.out, workers=args.workers,
+                       geometry=(args.width, args.height, args.win_length))
+    print(f"player1 wins: {summary['player1']}, player2 wins: {summary['player2']}, draws: {summary['draws']}")
+    print(f"{args.games} games in {summary['seconds']:.1f}s ({summary['games_per_sec']:.1f} games/sec) -> {args.out}")
@@ -0,0 +1,361 @@
+"""
+Endgame Solver: exact result (win / draw / loss) of positions with few empty cells
+
+    Negamax with alpha-beta over the values -1 / 0 / +1 (no heuristic, searched to the end of the game)
+        - a move that wins at once ends the search, a single threat of the opponent must be blocked
+          (two threats: lost), cells right below a threat of the opponent are never played
+        - moves are ordered by the number of threats they create (center first on equal count)
+        - solved positions are kept in a bounded LRU cache (SolutionCache), optionally saved
+          to and loaded from a file to be reused in the next run
+
+    Cache file layout (little endian):
+        header:     magic b"C4SV", version, width, height, win length, number of records (uint32)
+        records:    (key, lower bound int8, upper bound int8), least recently used first
+                    the key has (width * (height + 1) + 8) // 8 bytes
+
+Solve a position (columns played from the empty board) with:  python solver.py 3 3 4 4 ... --cache solutions.bin
+"""
+import argparse
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from bitboard import Bitboard
+from search import SearchTimeout, threat_cells
+
+
+MAGIC = b"C4SV"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBI")
+BOUNDS = struct.Struct("<bb")
+
+WIN, DRAW, LOSS = 1, 0, -1
+VALUE_NAMES = {WIN: "win", DRAW: "draw", LOSS: "loss"}
+
+
+class SolverBusy(Exception):
+    """ Raised by EndgameSolver.solve if another solve did not finish within the waiting time """
+
+
+@dataclass
+class SolveResult:
+    """
+    Result of a solved position
+
+    Attributes:
+        value (int):    WIN (1), DRAW (0) or LOSS (-1) for the player to move (with perfect play of both sides)
+        column (int):   A column which reaches this value (None if the board is full)
+        nodes (int):    Number of visited positions
+        seconds (float): Time used
+    """
+    value: int
+    column: int
+    nodes: int
+    seconds: float
+
+
+class SolutionCache:
+    """
+    Bounded cache of solved positions with least-recently-used eviction
+
+        Stores the bounds (lower, upper) of the value of a position: a search with a narrow
+        window only proves one side, an exact value has lower == upper.
+
+    Attributes:
+        capacity (int):     Maximum number of stored positions
+    """
+
+    __slots__ = ("capacity", "entries")
+
+    def __init__(self, capacity:int = 1 << 18) -> None:
+        """
+        Parameters:
+            capacity (int):     Maximum number of stored positions
+        """
+        self.capacity = capacity
+        self.entries:OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key:int) -> tuple:
+        """
+        Returns:
+            tuple:  (lower bound, upper bound) or None if the position is not stored
+        """
+        bounds = self.entries.get(key)
+        if bounds is not None:
+            self.entries.move_to_end(key)
+        return bounds
+
+    def store(self, key:int, lower:int, upper:int) -> None:
+        """ Store the bounds of a position (narrowed by bounds stored before), evicts the least recently used """
+        entries = self.entries
+        old = entries.get(key)
+        if old is not None:
+            lower, upper = max(lower, old[0]), min(upper, old[1])
+            entries.move_to_end(key)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        entries[key] = (lower, upper)
+
+
+class EndgameSolver:
+    """
+    Exact solver for positions with up to `threshold` empty cells
+
+        Thread safe: one position is solved at a time, all solves share the cache.
+
+    Attributes:
+        width (int):            Number of columns
+        height (int):           Number of rows
+        win_length (int):       Number of consecutive coins needed for a win
+        threshold (int):        Positions with more empty cells are not solved (see can_solve)
+        cache (SolutionCache):  Solved positions (kept between solves)
+        path (str):             Cache file (None: the cache is not persisted)
+        nodes (int):            Positions visited in the current solve
+        deadline (float):       time.perf_counter() value at which the current solve stops
+    """
+
+    def __init__(self, width:int = 8, height:int = 7, win_length:int = 4, threshold:int = 16,
+                 cache_size:int = 1 << 18, path:str = None) -> None:
+        """
+        Parameters:
+            width (int):        Number of columns
+            height (int):       Number of rows
+            win_length (int):   Number of consecutive coins needed for a win
+            threshold (int):    Maximum number of empty cells of a position to solve
+            cache_size (int):   Maximum number of solved positions kept in memory
+            path (str):         Cache file, loaded now if it exists (save() writes it)
+        """
+        self.width = width
+        self.height = height
+        self.win_length = win_length
+        self.threshold = threshold
+        self.cache = SolutionCache(cache_size)
+        self.path = path
+        self.nodes = 0
+        self.deadline = float("inf")
+        self._lock = threading.Lock()
+
+        stride = height + 1
+        center = (width - 1) / 2
+        self.order = sorted(range(width), key=lambda col: abs(col - center))
+        self.column_masks = [((1 << height) - 1) << (col * stride) for col in range(width)]
+        self.bottom_mask = sum(1 << (col * stride) for col in range(width))
+        self.board_mask = self.bottom_mask * ((1 << height) - 1)
+        self.key_size = (width * stride + 8) // 8
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def can_solve(self, board:Bitboard) -> bool:
+        """
+        Returns:
+            bool:   True if the board has this solver's geometry and at most `threshold` empty cells
+        """
+        return (
+            (board.width, board.height, board.win_length) == (self.width, self.height, self.win_length)
+            and board.width * board.height - len(board.moves) <= self.threshold
+        )
+
+    def solve(self, board:Bitboard, time_budget:float = None, wait:float = None) -> SolveResult:
+        """
+        Solve a position (the threshold is not checked, see can_solve)
+
+        Parameters:
+            board (Bitboard):       Position (not changed), nobody may have won yet
+            time_budget (float):    Seconds the solve may take (None: no limit)
+            wait (float):           Seconds to wait for a running solve of another thread (None: until it is done)
+
+        Returns:
+            SolveResult:    Value for the player to move and a column reaching it
+
+        Raises:
+            SearchTimeout:  If the time budget is used up (everything proven so far stays in the cache)
+            SolverBusy:     If another solve is still running after `wait` seconds
+        """
+        if not self._lock.acquire(timeout=-1 if wait is None else wait):
+            raise SolverBusy()
+        try:
+            start = time.perf_counter()
+            self.nodes = 0
+            self.deadline = float("inf") if time_budget is None else start + time_budget
+
+            current = board.boards[board.player]
+            mask = board.boards[0] | board.boards[1]
+            value, column = self._solve_root(current, mask)
+            return SolveResult(value, column, self.nodes, time.perf_counter() - start)
+        finally:
+            self._lock.release()
+
+    def save(self, path:str = None) -> int:
+        """
+        Write the cache to a file (replaced atomically: readers never see a half written file)
+
+        Parameters:
+            path (str):     Output file (default: the solver's path)
+
+        Returns:
+            int:    Number of written positions
+        """
+        path = path or self.path
+        with self._lock:
+            entries = list(self.cache.entries.items())
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.width, self.height, self.win_length, len(entries)))
+        for key, (lower, upper) in entries:
+            data += key.to_bytes(self.key_size, "little")
+            data += BOUNDS.pack(lower, upper)
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+        return len(entries)
+
+    def load(self, path:str) -> int:
+        """
+        Add the positions of a cache file (written by save) to the cache
+
+        Parameters:
+            path (str):     Cache file
+
+        Returns:
+            int:    Number of read positions
+
+        Raises:
+            ValueError:     If the file is no cache file of this board geometry
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, width, height, win_length, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a solution cache (version {VERSION})")
+        if (width, height, win_length) != (self.width, self.height, self.win_length):
+            raise ValueError(f"{path} holds solutions of a {width}x{height} board ({win_length} in a row)")
+
+        record = self.key_size + BOUNDS.size
+        with self._lock:
+            for offset in range(HEADER.size, HEADER.size + count * record, record):
+                key = int.from_bytes(data[offset:offset + self.key_size], "little")
+                self.cache.store(key, *BOUNDS.unpack_from(data, offset + self.key_size))
+        return count
+
+    """
+    Internal Methods
+        A position is (current, mask): coins of the player to move, coins of both players.
+        Its key current + mask + bottom row is unique (see opening_book.position_key).
+    """
+    def _solve_root(self, current:int, mask:int) -> tuple[int, int]:
+        """ Value and best column of the player to move (moves searched one by one with a narrowing window) """
+        possible = (mask + self.bottom_mask) & self.board_mask
+        if not possible:
+            return DRAW, None
+
+        free = self.board_mask ^ mask
+        wins = threat_cells(current, free, self.height, self.win_length) & possible
+        if wins:
+            return WIN, self._column_of(wins & -wins)
+
+        best_value, best_column = LOSS - 1, None
+        for move in self._ordered_moves(current, mask, possible):
+            value = -self._negamax(current ^ mask, mask | move, LOSS, -max(best_value, LOSS))
+            if value > best_value:
+                best_value, best_column = value, self._column_of(move)
+                if value == WIN:
+                    break
+        return best_value, best_column
+
+    def _negamax(self, current:int, mask:int, alpha:int, beta:int) -> int:
+        """ Value of the position for the player to move (exact if it is inside alpha..beta, else a bound) """
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        possible = (mask + self.bottom_mask) & self.board_mask
+        if not possible:
+            return DRAW
+
+        height, length = self.height, self.win_length
+        free = self.board_mask ^ mask
+        if threat_cells(current, free, height, length) & possible:
+            return WIN
+
+        threats = threat_cells(current ^ mask, free, height, length)
+        forced = possible & threats
+        if forced:
+            if forced & (forced - 1):
+                return LOSS                         # two threats cannot both be blocked
+            possible = forced
+        possible &= ~(threats >> 1)                 # do not play right below a threat of the opponent
+        if not possible:
+            return LOSS
+
+        key = current + mask + self.bottom_mask
+        bounds = self.cache.get(key)
+        if bounds is not None:
+            lower, upper = bounds
+            if lower >= beta or lower == upper:
+                return lower
+            if upper <= alpha:
+                return upper
+            alpha, beta = max(alpha, lower), min(beta, upper)
+
+        alpha_orig = alpha
+        best = LOSS - 1
+        for move in self._ordered_moves(current, mask, possible):
+            value = -self._negamax(current ^ mask, mask | move, -beta, -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best <= alpha_orig:
+            self.cache.store(key, LOSS, best)       # fail low: an upper bound
+        elif best >= beta:
+            self.cache.store(key, best, WIN)        # fail high: a lower bound
+        else:
+            self.cache.store(key, best, best)
+        return best
+
+    def _ordered_moves(self, current:int, mask:int, possible:int) -> list:
+        """ Move bits of `possible`, the moves creating the most threats first (center first on equal count) """
+        height, length, board_mask = self.height, self.win_length, self.board_mask
+        scored = []
+        for rank, column in enumerate(self.order):
+            move = possible & self.column_masks[column]
+            if move:
+                new_mask = mask | move
+                threats = threat_cells(current | move, board_mask ^ new_mask, height, length).bit_count()
+                scored.append((-threats, rank, move))
+        scored.sort()
+        return [move for _, _, move in scored]
+
+    def _column_of(self, move:int) -> int:
+        """ Column of a single move bit """
+        return (move.bit_length() - 1) // (self.height + 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("moves", type=int, nargs="*", help="columns played from the empty board")
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--win-length", type=int, default=4)
+    parser.add_argument("--cache", default=None, help="cache file (loaded if it exists, saved afterwards)")
+    args = parser.parse_args()
+
+    board = Bitboard(args.width, args.height, args.win_length)
+    for column in args.moves:
+        board.play(column)
+    solver = EndgameSolver(args.width, args.height, args.win_length, path=args.cache)
+    result = solver.solve(board)
+    print(f"{VALUE_NAMES[result.value]} for {'XO'[board.player]} (column {result.column}), "
+          f"{result.nodes:,} positions in {result.seconds:.2f}s")
+    if args.cache:
+        print(f"saved {solver.save():,} positions to {args.cache}")
@@ -0,0 +1,180 @@
+"""
+Stress test: concurrent check_move calls on shared games
+
+    Many threads fire random moves (random game, random player, random column) at the same
+    few games. A game which is over is replaced by a fresh one, so the moves keep competing
+    for running games. While the threads play, a checker thread keeps reading the games and
+    checks that every board it sees is consistent:
+        - turn_number == number of coins on the board
+        - 'X' has the same number of coins as 'O' or one more
+        - no floating coins (every coin lies on the bottom row or on another coin)
+    Afterwards every game (also the replaced ones) must have
+        - turn_number == number of accepted moves
+        - the same coin counts and no floating coins
+        - the winner (and only the winner) has 4 in a row
+
+Run with:  python stress_check_move.py --threads 64 --games 20 --moves 5000
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+import numpy as np
+
+from bitboard import Bitboard
+from game import Connect4
+
+
+class GameSlots:
+    """
+    The games the threads play on: a game which is over is replaced by a fresh one
+
+    Attributes:
+        slots (list):       (number, game, players) per slot (the running games)
+        games (list):       (game, players) of all games ever created, the number is the index
+    """
+
+    def __init__(self, n_slots:int) -> None:
+        self.games:list = []
+        self._lock = threading.Lock()
+        self.slots:list = [self._new_game() for _ in range(n_slots)]
+
+    def replace_if_over(self, index:int, number:int) -> None:
+        """ Replace the game of a slot by a fresh one if it is over (and was not replaced already) """
+        with self._lock:
+            current, game, _ = self.slots[index]
+            if current == number and is_over(game):
+                self.slots[index] = self._new_game()
+
+    def _new_game(self) -> tuple:
+        game = Connect4()
+        players = [uuid.uuid4(), uuid.uuid4()]
+        for player in players:
+            game.register_player(player)
+        self.games.append((game, players))
+        return len(self.games) - 1, game, players
+
+
+def is_over(game:Connect4) -> bool:
+    """ True if the game has a winner or the board is full """
+    status = game.get_status()
+    return status["winner"] is not None or status["turn_number"] == game.board_width * game.board_height
+
+
+def fire_moves(slots:GameSlots, n_moves:int, accepted:Counter, seed:int, start:threading.Barrier) -> None:
+    """ Send n_moves random moves, count the accepted ones per game (number of the game) """
+    rng = random.Random(seed)
+    local = Counter()
+    start.wait()
+    for _ in range(n_moves):
+        index = rng.randrange(len(slots.slots))
+        number, game, players = slots.slots[index]
+        if game.check_move(rng.randrange(game.board_width), rng.choice(players)):
+            local[number] += 1
+        elif is_over(game):
+            slots.replace_if_over(index, number)
+    accepted.update(local)
+
+
+def watch_games(slots:GameSlots, stop:threading.Event, problems:list, checks:list) -> None:
+    """ Check the running games over and over until `stop` is set (problems are appended as text) """
+    while not stop.is_set():
+        for number, game, _ in list(slots.slots):
+            before = game.get_status()["turn_number"]
+            board = game.get_board()
+            after = game.get_status()["turn_number"]
+            if before != after:
+                continue                            # a move came in between: board and status do not belong together
+            problems.extend(f"game {number} at turn {before}: {problem}" for problem in check_board(board, before))
+            checks[0] += 1
+
+
+def check_board(board:np.ndarray, turn_number:int) -> list:
+    """ Returns a list of problems of a board seen at `turn_number` (empty if consistent) """
+    problems = []
+    n_x, n_o = int((board == "X").sum()), int((board == "O").sum())
+    if n_x + n_o != turn_number or n_x - n_o not in (0, 1):
+        problems.append(f"coins X={n_x} O={n_o} at turn_number {turn_number}")
+
+    height, width = board.shape
+    for col in range(width):
+        column = board[::-1, col]                   # bottom row first
+        filled = [cell != "" for cell in column]
+        if filled != sorted(filled, reverse=True):
+            problems.append(f"floating coin in column {col}")
+    return problems
+
+
+def check_consistency(game:Connect4, n_accepted:int) -> list:
+    """ Returns a list of problems of the game (empty if consistent) """
+    board = game.get_board()
+    status = game.get_status()
+    problems = check_board(board, status["turn_number"])
+    if status["turn_number"] != n_accepted:
+        problems.append(f"turn_number {status['turn_number']} != accepted moves {n_accepted}")
+
+    height, width = board.shape
+    bitboard = Bitboard(width, height)
+    for player, icon in enumerate(game.icons):
+        for row in range(height):
+            for col in range(width):
+                if board[row, col] == icon:
+                    bitboard.boards[player] |= 1 << (col * (height + 1) + height - 1 - row)
+        if bitboard.has_won(player) != (status["winner"] == icon):
+            problems.append(f"winner is {status['winner']} but 4 in a row of {icon} is {bitboard.has_won(player)}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--moves", type=int, default=5000, help="moves per thread")
+    args = parser.parse_args()
+
+    sys.setswitchinterval(1e-6)         # switch threads as often as possible to provoke races
+    crashes = []
+    threading.excepthook = lambda hook: crashes.append(f"{hook.thread.name}: {hook.exc_type.__name__}: {hook.exc_value}")
+
+    slots = GameSlots(args.games)
+    per_thread = [Counter() for _ in range(args.threads)]
+    start = threading.Barrier(args.threads)
+    threads = [
+        threading.Thread(target=fire_moves, args=(slots, args.moves, per_thread[i], i, start))
+        for i in range(args.threads)
+    ]
+    stop, live_problems, checks = threading.Event(), [], [0]
+    watcher = threading.Thread(target=watch_games, args=(slots, stop, live_problems, checks))
+    began = time.perf_counter()
+    watcher.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    stop.set()
+    watcher.join()
+
+    for problem in crashes + live_problems:
+        print(problem)
+    accepted = sum(per_thread, Counter())
+    failures = len(crashes) + len(live_problems)
+    for number, (game, _) in enumerate(slots.games):
+        for problem in check_consistency(game, accepted[number]):
+            failures += 1
+            print(f"game {number}: {problem}")
+
+    total = args.threads * args.moves
+    print(f"{total} check_move calls from {args.threads} threads on {args.games} running games in {elapsed:.2f}s "
+          f"({total / elapsed:,.0f} calls/sec), {sum(accepted.values())} accepted, {len(slots.games)} games played, "
+          f"{checks[0]} boards checked during the run")
+    print("consistent" if failures == 0 else f"{failures} problems found")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
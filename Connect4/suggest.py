@@ -0,0 +1,211 @@
+"""
+Move Suggestions for many clients at once (hint buttons of CLI / SenseHat players)
+
+    Concurrent requests are collected over a short window and all their boards are evaluated
+    together with BatchConnect4: one vectorized pass per ply for all boards, instead of one
+    search per request. Every column of every board is scored by
+        - an immediate win (best)
+        - a reply of the opponent that wins at once (worst, only played if nothing else is left)
+        - otherwise: the result of random playouts from the position after the move
+    Suggestions are kept in a bounded cache shared by all requests (least recently used evicted),
+    so clients asking for the same position (e.g. polling hint buttons) cost nothing.
+
+Benchmark: bench_suggest.py
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from batch_game import BatchConnect4
+from bitboard import Bitboard
+
+
+@dataclass
+class Suggestion:
+    """
+    Suggested move of a position
+
+    Attributes:
+        column (int):       Suggested column
+        scores (list):      Score per column for the player to move (None if the column is full):
+                            1.0 wins at once, playouts won (draw = half) otherwise, negative if the
+                            opponent can win at once afterwards
+        batch_size (int):   Number of boards evaluated together with this one (0 if taken from the cache)
+    """
+    column: int
+    scores: list
+    batch_size: int
+
+
+@dataclass
+class _Request:
+    """ One waiting request of a batch """
+    board: Bitboard
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Suggestion = None
+    error: Exception = None                         # raised by the evaluation of the batch (result is None then)
+
+
+class SuggestionBatcher:
+    """
+    Collects concurrent suggestion requests and evaluates them in batches
+
+        No thread of its own: the first request of a window waits `window` seconds (or until
+        `max_batch` requests are there), takes all waiting requests and evaluates them; the
+        others wait for their result. Thread safe.
+
+    Attributes:
+        window (float):     Seconds a batch collects requests (None: every request is evaluated on its own)
+        max_batch (int):    A batch is evaluated as soon as it has this many boards
+        playouts (int):     Random playouts per column
+        cache_size (int):   Maximum number of cached suggestions
+        batches (int):      Number of evaluated batches
+        hits (int):         Requests answered from the cache
+    """
+
+    def __init__(self, window:float = 0.005, max_batch:int = 256, playouts:int = 32, cache_size:int = 1 << 16,
+                 seed:int = None) -> None:
+        """
+        Parameters:
+            window (float):     Seconds a batch collects requests (None: no batching)
+            max_batch (int):    Number of boards at which a batch stops collecting early
+            playouts (int):     Random playouts per column (more: better suggestions, slower batches)
+            cache_size (int):   Maximum number of cached suggestions
+            seed (int):         Seed of the playouts (None for a random seed)
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.playouts = playouts
+        self.cache_size = cache_size
+        self.batches = 0
+        self.hits = 0
+
+        self._cache:OrderedDict = OrderedDict()     # (width, height, win_length, X bits, O bits) -> Suggestion
+        self._pending:list = []
+        self._lock = threading.Lock()
+        self._batch_ready = threading.Condition(self._lock)
+        self._seeds = np.random.SeedSequence(seed)
+
+    def suggest(self, board:Bitboard) -> Suggestion:
+        """
+        Suggest a move for the player to move (blocks until the batch of the request is evaluated)
+
+        Parameters:
+            board (Bitboard):   Position (not changed), nobody may have won yet and it must not be full
+
+        Returns:
+            Suggestion:     Suggested column and the scores of all columns
+
+        Raises:
+            Exception:      The error of the evaluation if it failed (raised in every request of the batch)
+        """
+        key = (board.width, board.height, board.win_length, board.boards[0], board.boards[1])
+        request = _Request(board)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return Suggestion(cached.column, cached.scores, 0)
+            if self.window is None:
+                batch = [request]
+            else:
+                self._pending.append(request)
+                if len(self._pending) >= self.max_batch:
+                    self._batch_ready.notify_all()
+                if len(self._pending) > 1:
+                    batch = None                    # the leader of this window evaluates it
+                else:
+                    deadline = time.perf_counter() + self.window
+                    while len(self._pending) < self.max_batch:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        self._batch_ready.wait(remaining)
+                    batch, self._pending = self._pending, []
+            if batch is not None:
+                self.batches += 1
+                seed = self._seeds.spawn(1)[0]
+
+        if batch is None:
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+            return request.result
+        return self._evaluate_now(batch, seed)
+
+    """
+    Internal Methods
+    """
+    def _evaluate_now(self, batch:list, seed:np.random.SeedSequence) -> Suggestion:
+        """ Evaluate a batch and wake up its requests, returns the result of the first request """
+        try:
+            self._evaluate(batch, np.random.default_rng(seed))
+        except Exception as error:
+            for waiting in batch:
+                if waiting.result is None:
+                    waiting.error = error
+            raise
+        finally:
+            for waiting in batch:                   # nobody waits forever, even if the evaluation failed
+                waiting.done.set()
+        return batch[0].result
+
+    def _evaluate(self, batch:list, rng:np.random.Generator) -> None:
+        """ Evaluate a batch of requests (grouped by board size) and store the results in the requests and the cache """
+        groups = {}
+        for request in batch:
+            board = request.board
+            groups.setdefault((board.width, board.height, board.win_length), []).append(request)
+
+        for requests in groups.values():
+            scores = self._score_columns([request.board for request in requests], rng)
+            width = requests[0].board.width
+            center = (width - 1) / 2
+            order = sorted(range(width), key=lambda col: abs(col - center))
+            with self._lock:
+                for request, row in zip(requests, scores):
+                    legal = [col for col in order if not np.isnan(row[col])]
+                    column = max(legal, key=lambda col: row[col])       # ties: the column closest to the center
+                    column_scores = [None if np.isnan(score) else round(float(score), 4) for score in row]
+                    request.result = Suggestion(column, column_scores, len(batch))
+
+                    board = request.board
+                    self._cache[(board.width, board.height, board.win_length, board.boards[0], board.boards[1])] = \
+                        Suggestion(column, column_scores, 0)
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+
+    def _score_columns(self, boards:list, rng:np.random.Generator) -> np.ndarray:
+        """
+        Score every column of every board (vectorized over all boards and columns)
+
+        Returns:
+            np.ndarray:     (len(boards), width) scores for the player to move, NaN for full columns
+        """
+        width = boards[0].width
+        columns = np.tile(np.arange(width), len(boards))
+        movers = np.repeat([board.player for board in boards], width)
+
+        # every board once per column, then play that column
+        children = BatchConnect4.from_bitboards(boards, repeat=width)
+        legal = children.play(columns)
+        wins = legal & (children.winner == movers)
+
+        # replies: can the opponent win at once after the move?
+        replies = children.repeat(width)
+        replies.play(np.tile(np.arange(width), children.size))
+        loses = (replies.winner == (1 - np.repeat(movers, width))).reshape(children.size, width).any(axis=1)
+
+        # random playouts from the position after the move
+        playouts = children.repeat(self.playouts)
+        playouts.play_out(rng)
+        winner = playouts.winner.reshape(children.size, self.playouts)
+        outcome = np.where(winner < 0, 0.5, (winner == movers[:, None]).astype(float)).mean(axis=1)
+
+        scores = np.where(wins, 1.0, np.where(loses & ~wins, outcome - 1.0, outcome))
+        scores = np.where(legal, scores, np.nan)
+        return scores.reshape(len(boards), width)
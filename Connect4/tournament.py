@@ -0,0 +1,401 @@
+"""
+Round-Robin Tournament of Bots (e.g. the SW14 bot competition)
+
+    Every entry plays every other entry `--games` times with each color (color swaps).
+    The games run concurrently in a process pool, either
+        - in-process (default): both bots play in the worker with Coordinator_Local.play_headless
+        - against a multi-game server (--server URL, or --server local to start one here):
+          the worker creates a game on the server and both bots play it as remote clients
+          through the REST API (every bot keeps a local copy of the game to think on)
+    A move slower than --time-limit or an illegal move loses the game (forfeit): the game is
+    stopped as soon as the time is up, on the server the forfeiting side resigns.
+
+    The result is a standings table (points, wins / draws / losses, forfeits, Elo);
+    with --out every game is also written to a JSON-lines file.
+
+Run with:  python tournament.py bot:0.05 bot:0.02 random --games 2 --time-limit 0.5 [--server local] [--out games.jsonl]
+           (entries can be named: strong=bot:0.1)
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+
+from coordinator_local import Coordinator_Local, make_move_within
+from game import Connect4
+from simulator import parse_player
+
+
+@dataclass
+class Entry:
+    """
+    Participant of a tournament
+
+    Attributes:
+        name (str):     Name in the standings
+        player (type):  Player_Local subclass which chooses the moves (e.g. Player_Bot)
+        kwargs (dict):  Keyword arguments of the player (the game is always the first argument)
+    """
+    name: str
+    player: type
+    kwargs: dict = field(default_factory=dict)
+
+
+def parse_entry(spec:str) -> Entry:
+    """
+    Parse an entry of the command line
+
+        "bot:0.05"          -> Entry("bot:0.05", Player_Bot, {"time_budget": 0.05})
+        "strong=bot:0.1"    -> Entry("strong", Player_Bot, {"time_budget": 0.1})
+
+    Returns:
+        Entry:  Participant
+    """
+    name, _, player_spec = spec.rpartition("=")
+    player, kwargs = parse_player(player_spec)
+    return Entry(name or player_spec, player, kwargs)
+
+
+def schedule(n_entries:int, games:int = 1) -> list:
+    """
+    Full round-robin with color swaps: every pair plays `games` games with each color
+
+        The games are ordered round by round (circle method): consecutive games are
+        played by different entries, so concurrent games spread over all entries.
+
+    Parameters:
+        n_entries (int):    Number of entries
+        games (int):        Games per pair and color
+
+    Returns:
+        list:   (game number, index of 'X', index of 'O') per game
+    """
+    players = list(range(n_entries)) + ([None] if n_entries % 2 else [])
+    rounds = []
+    for _ in range(len(players) - 1):
+        half = len(players) // 2
+        rounds.append([(players[i], players[-1 - i]) for i in range(half)])
+        players = [players[0], players[-1]] + players[1:-1]
+
+    pairings = []
+    for repeat in range(games):
+        for swap in (False, True):
+            for pairs in rounds:
+                for first, second in pairs:
+                    if first is None or second is None:
+                        continue
+                    if (repeat % 2 == 1) != swap:
+                        first, second = second, first
+                    pairings.append((first, second))
+    return [(number, x, o) for number, (x, o) in enumerate(pairings)]
+
+
+def play_match(args:tuple) -> dict:
+    """
+    Play one game of the tournament (runs in a worker process)
+
+    Parameters:
+        args (tuple):   (game number, entry of 'X', entry of 'O', geometry, time limit, api_url)
+                        geometry is (width, height, win_length), api_url None plays in-process
+
+    Returns:
+        dict:   Result line of the game: "game", "x", "o", "result" ('X', 'O' or 'draw'),
+                "winner" (entry name or None), "forfeit" ("illegal", "timeout" or None), "moves", "move_times"
+    """
+    number, x_entry, o_entry, geometry, time_limit, api_url = args
+    if api_url is None:
+        width, height, win_length = geometry
+        coordinator = Coordinator_Local(players=((x_entry.player, x_entry.kwargs), (o_entry.player, o_entry.kwargs)),
+                                        board_width=width, board_height=height, win_length=win_length)
+        result = coordinator.play_headless(time_limit)
+    else:
+        result = play_remote(api_url, x_entry, o_entry, geometry, time_limit)
+
+    icon = result["winner"]
+    return {
+        "game": number,
+        "x": x_entry.name,
+        "o": o_entry.name,
+        "result": icon or "draw",
+        "winner": (x_entry.name, o_entry.name)[Connect4.icons.index(icon)] if icon else None,
+        "forfeit": "illegal" if result["illegal"] else "timeout" if result["timeout"] else None,
+        "moves": result["moves"],
+        "move_times": [round(seconds, 6) for seconds in result["move_times"]],
+    }
+
+
+def play_remote(api_url:str, x_entry:Entry, o_entry:Entry, geometry:tuple, time_limit:float = None) -> dict:
+    """
+    Play one game on a server: create it, then both entries play it as remote clients (one thread each)
+
+    Returns:
+        dict:   Same as Coordinator_Local.play_headless
+    """
+    import requests                                 # only the server mode needs the HTTP client
+
+    width, height, win_length = geometry
+    response = requests.post(f"{api_url.rstrip('/')}/connect4/games",
+                             json={"width": width, "height": height, "win_length": win_length})
+    response.raise_for_status()
+    game_id = response.json()["game_id"]
+
+    registered, stop = threading.Event(), threading.Event()
+    sides = [{"icon": icon, "move_times": [], "illegal": False, "timeout": False} for icon in Connect4.icons]
+    threads = [
+        threading.Thread(target=play_remote_side, args=(api_url, game_id, entry, side, registered, stop, time_limit))
+        for entry, side in zip((x_entry, o_entry), sides)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    replay = requests.get(f"{api_url.rstrip('/')}/connect4/games/{game_id}/replay").json()
+    winner = replay["result"] if replay["result"] in Connect4.icons else None
+    illegal = timeout = None
+    for index, side in enumerate(sides):
+        if side["illegal"] or side["timeout"]:
+            winner = Connect4.icons[1 - index]
+            illegal = side["icon"] if side["illegal"] else None
+            timeout = side["icon"] if side["timeout"] else None
+
+    x_times, o_times = sides[0]["move_times"], sides[1]["move_times"]
+    move_times = [seconds for pair in itertools.zip_longest(x_times, o_times) for seconds in pair if seconds is not None]
+    return {"winner": winner, "moves": replay["moves"], "move_times": move_times, "illegal": illegal, "timeout": timeout}
+
+
+def play_remote_side(api_url:str, game_id:str, entry:Entry, side:dict, registered:threading.Event,
+                     stop:threading.Event, time_limit:float = None) -> None:
+    """
+    One entry playing a game on the server (thread of play_remote)
+
+        The entry's player thinks on a local copy of the game: before every move the moves
+        of the opponent are fetched from the server (replay endpoint) and played there as well.
+        A side which forfeits resigns the game on the server.
+
+    Parameters:
+        side (dict):    "icon" the entry plays, filled with "move_times", "illegal" and "timeout"
+        registered (Event):     Set once 'X' is registered ('O' registers after it)
+        stop (Event):   Set when a side forfeits (the other side stops waiting)
+    """
+    from player_remote import Player_Remote
+
+    client = Player_Remote(api_url, game_id=game_id)
+    player = None
+    try:
+        if side["icon"] == Connect4.icons[0]:
+            client.register_in_game()
+            registered.set()
+        else:
+            registered.wait()
+            client.register_in_game()
+
+        mirror = Connect4(client.board_width, client.board_height, client.win_length)
+        player = entry.player(mirror, **entry.kwargs)
+        opponent = uuid.uuid4()
+        if client.icon == Connect4.icons[0]:
+            player.register_in_game()
+            mirror.register_player(opponent)
+        else:
+            mirror.register_player(opponent)
+            player.register_in_game()
+        ids = (player.id, opponent) if client.icon == Connect4.icons[0] else (opponent, player.id)
+
+        n_cells = client.board_width * client.board_height
+        status = client.get_game_status()
+        while status["winner"] is None and status["turn_number"] < n_cells and not stop.is_set():
+            if status["active_id"] != str(client.id):
+                status = client.wait_for_change(status["turn_number"], timeout=1.0)
+                continue
+
+            moves = client.session.get(f"{client.api_url}/connect4/games/{game_id}/replay").json()["moves"]
+            for column in moves[mirror.turn_number:]:
+                mirror.check_move(column, ids[mirror.turn_number % 2])
+
+            column, seconds, in_time = make_move_within(player, time_limit)
+            side["move_times"].append(seconds)
+            if not in_time or not client.send_move(column):
+                side["timeout" if not in_time else "illegal"] = True
+                client.resign()
+                stop.set()
+                break
+            status = client.get_game_status()
+    finally:
+        registered.set()                            # never leave 'O' waiting if 'X' failed
+        client.session.close()
+        if hasattr(player, "close"):
+            player.close()
+
+
+def elo_ratings(results:list, names:list, base:float = 1500.0, iterations:int = 1000) -> dict:
+    """
+    Elo ratings which explain all results best (maximum likelihood, independent of the order of the games)
+        A draw counts as half a win for each side. Every entry also gets one virtual draw
+        against a `base` rated opponent, so an entry which won (or lost) every game still
+        gets a finite rating.
+
+    Parameters:
+        results (list):     Result lines (see play_match)
+        names (list):       Names of all entries
+        base (float):       Rating of the virtual opponent (the average entry ends up close to it)
+        iterations (int):   Iterations of the fit (minorization-maximization of the Bradley-Terry model)
+
+    Returns:
+        dict:   name -> Elo rating
+    """
+    index = {name: i for i, name in enumerate(names)}
+    scores = [0.5] * len(names)                     # the virtual draw
+    games = [[0] * len(names) for _ in names]
+    for result in results:
+        x, o = index[result["x"]], index[result["o"]]
+        score = 1.0 if result["result"] == Connect4.icons[0] else 0.0 if result["result"] == Connect4.icons[1] else 0.5
+        scores[x] += score
+        scores[o] += 1.0 - score
+        games[x][o] += 1
+        games[o][x] += 1
+
+    strength = [1.0] * len(names)                   # 10 ** (rating / 400), the virtual opponent has 1.0
+    for _ in range(iterations):
+        strength = [
+            scores[i] / (1.0 / (strength[i] + 1.0) + sum(
+                count / (strength[i] + strength[j]) for j, count in enumerate(games[i]) if count
+            ))
+            for i in range(len(names))
+        ]
+    return {name: base + 400.0 * math.log10(strength[index[name]]) for name in names}
+
+
+def standings(results:list, names:list) -> list:
+    """
+    Standings table of a tournament (best first: points, then Elo)
+
+    Parameters:
+        results (list):     Result lines (see play_match)
+        names (list):       Names of all entries
+
+    Returns:
+        list:   One dict per entry: "name", "games", "wins", "draws", "losses", "points",
+                "forfeits", "avg_move_seconds", "elo"
+    """
+    rows = {name: {"name": name, "games": 0, "wins": 0, "draws": 0, "losses": 0, "points": 0.0, "forfeits": 0,
+                   "move_seconds": 0.0, "moves": 0} for name in names}
+    for result in results:
+        for index, name in enumerate((result["x"], result["o"])):
+            row = rows[name]
+            row["games"] += 1
+            own_times = result["move_times"][index::2]
+            row["move_seconds"] += sum(own_times)
+            row["moves"] += len(own_times)
+            if result["winner"] is None:
+                row["draws"] += 1
+                row["points"] += 0.5
+            elif result["result"] == Connect4.icons[index]:
+                row["wins"] += 1
+                row["points"] += 1.0
+            else:
+                row["losses"] += 1
+                row["forfeits"] += result["forfeit"] is not None
+
+    ratings = elo_ratings(results, names)
+    table = []
+    for row in rows.values():
+        moves, seconds = row.pop("moves"), row.pop("move_seconds")
+        row["avg_move_seconds"] = seconds / moves if moves else 0.0
+        row["elo"] = round(ratings[row["name"]])
+        table.append(row)
+    return sorted(table, key=lambda row: (-row["points"], -row["elo"]))
+
+
+def tournament(entries:list, games:int = 1, time_limit:float = None, workers:int = None, api_url:str = None,
+               geometry:tuple = (8, 7, 4), out_path:str = None) -> dict:
+    """
+    Run a full round-robin tournament across a process pool
+
+    Parameters:
+        entries (list):     Entries (names must be unique)
+        games (int):        Games per pair and color
+        time_limit (float): Seconds per move (None = no limit), a slower move loses the game
+        workers (int):      Games played at the same time (default: number of CPU cores)
+        api_url (str):      Server to play on (None: in-process)
+        geometry (tuple):   (width, height, win_length) of the board (default 8x7, 4 in a row)
+        out_path (str):     JSON-lines file for the result of every game (None: not written)
+
+    Returns:
+        dict:   "standings" (see standings), "games" (number of games), "seconds"
+
+    Raises:
+        ValueError:     If there are fewer than two entries or two entries have the same name
+    """
+    names = [entry.name for entry in entries]
+    if len(names) < 2 or len(set(names)) != len(names):
+        raise ValueError("A tournament needs at least two entries with unique names")
+
+    workers = workers or os.cpu_count() or 1
+    jobs = [(number, entries[x], entries[o], geometry, time_limit, api_url)
+            for number, x, o in schedule(len(entries), games)]
+
+    results = []
+    start = time.perf_counter()
+    with Pool(workers) as pool, open(out_path or os.devnull, "w") as out:
+        for result in pool.imap_unordered(play_match, jobs):
+            out.write(json.dumps(result, separators=(",", ":")) + "\n")
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    return {"standings": standings(results, names), "games": len(results), "seconds": elapsed}
+
+
+def print_standings(table:list) -> None:
+    """ Print the standings table """
+    width = max(len(row["name"]) for row in table) + 2
+    print(f"{'#':>3}  {'entry':<{width}}{'games':>6}{'W':>5}{'D':>5}{'L':>5}{'points':>8}{'forfeits':>10}"
+          f"{'avg move':>10}{'Elo':>7}")
+    for rank, row in enumerate(table, start=1):
+        print(f"{rank:>3}  {row['name']:<{width}}{row['games']:>6}{row['wins']:>5}{row['draws']:>5}{row['losses']:>5}"
+              f"{row['points']:>8.1f}{row['forfeits']:>10}{row['avg_move_seconds']:>9.3f}s{row['elo']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entries", type=parse_entry, nargs="+", help="[name=]random | [name=]bot[:seconds per move]")
+    parser.add_argument("--games", type=int, default=1, help="games per pair and color")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per move, a slower move loses")
+    parser.add_argument("--workers", type=int, default=None, help="games at the same time (default: all cores)")
+    parser.add_argument("--server", default=None, help="play on this server (URL), 'local' starts one")
+    parser.add_argument("--port", type=int, default=5057, help="port of the local server (--server local)")
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--win-length", type=int, default=4)
+    parser.add_argument("--out", default=None, help="JSON-lines file for the result of every game")
+    args = parser.parse_args()
+
+    names, copies = [entry.name for entry in args.entries], {}
+    for entry in args.entries:                      # the same spec twice: number the copies
+        if names.count(entry.name) > 1:
+            copies[entry.name] = copies.get(entry.name, 0) + 1
+            entry.name = f"{entry.name}#{copies[entry.name]}"
+
+    api_url, local_server = args.server, None
+    if api_url == "local":
+        from werkzeug.serving import make_server
+        from server import Connect4Server
+
+        local_server = make_server("127.0.0.1", args.port, Connect4Server(max_games=10_000, metrics=False).app, threaded=True)
+        threading.Thread(target=local_server.serve_forever, daemon=True).start()
+        api_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        summary = tournament(args.entries, games=args.games, time_limit=args.time_limit, workers=args.workers,
+                             api_url=api_url, geometry=(args.width, args.height, args.win_length), out_path=args.out)
+    finally:
+        if local_server is not None:
+            local_server.shutdown()
+
+    print_standings(summary["standings"])
+    print(f"{summary['games']} games in {summary['seconds']:.1f}s" + (f" -> {args.out}" if args.out else ""))